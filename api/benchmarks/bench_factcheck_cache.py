@@ -0,0 +1,67 @@
+"""
+Benchmark FactCheckCache housekeeping at scale.
+
+Compares the heap-based expiry against the previous full linear scan
+(one timedelta per entry) on a cache of N entries.
+
+Usage (from the api directory):
+    python benchmarks/bench_factcheck_cache.py [--entries 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from schemas import FactCheckItem, FactCheckResult
+from services.factcheck_service import FactCheckCache
+
+
+def _legacy_clear_expired(entries, ttl_minutes):
+    now = datetime.now()
+    expired = [k for k, (_, t) in entries.items() if now - t > timedelta(minutes=ttl_minutes)]
+    for key in expired:
+        del entries[key]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.entries
+
+    result = FactCheckResult(status="found", items=[FactCheckItem(claim="Example claim", similarity=0.7)])
+    cache = FactCheckCache(max_entries=n)
+
+    started = time.perf_counter()
+    for i in range(n):
+        # A tenth of the entries expire immediately
+        cache.set(f"key-{i}", result, ttl_s=0 if i % 10 == 0 else 3600)
+    fill_s = time.perf_counter() - started
+    print(f"set:            {fill_s / n * 1e6:8.2f} us/op ({n} entries)")
+
+    started = time.perf_counter()
+    for i in range(1, n, 7):
+        cache.get(f"key-{i}")
+    lookups = len(range(1, n, 7))
+    print(f"get:            {(time.perf_counter() - started) / lookups * 1e6:8.2f} us/op")
+
+    started = time.perf_counter()
+    removed = cache.clear_expired()
+    print(f"clear_expired:  {(time.perf_counter() - started) * 1e3:8.2f} ms (removed {removed})")
+
+    started = time.perf_counter()
+    cache.clear_expired()
+    print(f"clear_expired (nothing expired): {(time.perf_counter() - started) * 1e6:8.2f} us")
+
+    legacy = {f"key-{i}": (result, datetime.now()) for i in range(n)}
+    started = time.perf_counter()
+    _legacy_clear_expired(legacy, 360)
+    print(f"legacy linear scan (nothing expired): {(time.perf_counter() - started) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
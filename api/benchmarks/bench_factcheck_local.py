@@ -0,0 +1,68 @@
+"""
+Benchmark lookups in the local ClaimReview store.
+
+Builds a synthetic corpus of N claims over a Zipf-like vocabulary (a few
+very common words, a long tail of rare ones) and times searches for
+queries built like the planner's: a mix of common and rare terms.
+
+Usage (from the api directory):
+    python benchmarks/bench_factcheck_local.py [--claims 1000000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from schemas import FactCheckItem
+from providers.factcheck_local import ClaimReviewIndex
+
+
+def _vocabulary(size):
+    return [f"w{i}" for i in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--claims", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--vocab", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocab = _vocabulary(args.vocab)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+
+    index = ClaimReviewIndex()
+    started = time.perf_counter()
+    batch = 10_000
+    for start in range(0, args.claims, batch):
+        words = rng.choices(vocab, weights=weights, k=batch * 10)
+        for j in range(min(batch, args.claims - start)):
+            claim = " ".join(words[j * 10:(j + 1) * 10])
+            index.add(FactCheckItem.model_construct(
+                claim=claim, verdict="False", snippet=None, source="bench",
+                url=None, publishedAt=None, matchReason=None, similarity=None,
+            ))
+    print(f"ingest:  {(time.perf_counter() - started) / args.claims * 1e6:8.2f} us/claim ({args.claims} claims)")
+
+    queries = [" ".join(rng.choices(vocab[:50], k=2) + rng.choices(vocab[1000:], k=3)) for _ in range(args.queries)]
+    common_only = [" ".join(rng.choices(vocab[:20], k=4)) for _ in range(args.queries)]
+
+    for label, batch_queries in (("mixed terms", queries), ("common terms only", common_only)):
+        timings = []
+        for q in batch_queries:
+            t0 = time.perf_counter()
+            index.search(q, limit=5)
+            timings.append(time.perf_counter() - t0)
+        timings.sort()
+        p50 = timings[len(timings) // 2] * 1e3
+        p99 = timings[int(len(timings) * 0.99)] * 1e3
+        print(f"search ({label}): p50 {p50:6.3f} ms, p99 {p99:6.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
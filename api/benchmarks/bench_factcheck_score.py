@@ -0,0 +1,61 @@
+"""
+Benchmark batch scoring of fact-check candidates.
+
+Scores N synthetic candidate claims for one query with score_item in a
+loop and with score_items (NumPy overlaps when installed), and checks
+that both give identical scores.
+
+Usage (from the api directory):
+    python benchmarks/bench_factcheck_score.py [--items 500] [--rounds 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services import factcheck_score
+from services.claims import claim_miner
+
+HEADLINE = "Senate passes bill to ban TikTok nationwide"
+SUMMARY = "President Biden said he will sign the bill if it reaches his desk."
+WORDS = (
+    "Senate Senators ban banned TikTok app bill legislation Biden sign nationwide China Chinese "
+    "owner ByteDance sell vote passed Tuesday House Congress data privacy security the a of to on"
+).split()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    profile = claim_miner.build_profile(HEADLINE, SUMMARY)
+    claims = [" ".join(rng.choices(WORDS, k=rng.randint(6, 16))) for _ in range(args.items)]
+    dates = [None] * len(claims)
+    query = "ban TikTok"
+
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        single = [factcheck_score.score_item(query, c, "example.com", None, profile, "policy_action") for c in claims]
+    single_s = (time.perf_counter() - started) / args.rounds
+
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        batch = factcheck_score.score_items(query, claims, "example.com", dates, profile, "policy_action")
+    batch_s = (time.perf_counter() - started) / args.rounds
+
+    passing = sum(1 for s in batch if s >= 0)
+    print(f"numpy: {'yes' if factcheck_score.np is not None else 'no'}, {args.items} items, {passing} pass the gates")
+    print(f"score_item loop: {single_s * 1e3:8.2f} ms")
+    print(f"score_items:     {batch_s * 1e3:8.2f} ms")
+    print(f"identical: {single == batch}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark memoized tokenization across full fact-check runs.
+
+Runs find_best_factchecks end to end (claim mining, query planning,
+gating, scoring) for a set of headlines with the Fact Check API replaced
+by an in-process fake that returns overlapping candidate pages, once
+with the TextUtil memo switched off and once with it on.
+
+Usage (from the api directory):
+    python benchmarks/bench_textutil_memo.py [--rounds 20] [--page 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from schemas import FactCheckItem
+from services import factcheck_service
+from services.textutil import text_util
+
+HEADLINES = [
+    ("Senate passes bill to ban TikTok nationwide",
+     "The Senate voted on Tuesday to pass legislation that would ban TikTok unless its Chinese owner sells the app."),
+    ("Unemployment rate falls to 3.5 percent in March",
+     "The Labor Department said the unemployment rate fell to 3.5 percent as employers added 236,000 jobs."),
+    ("Climate change leads to more flooding in coastal cities",
+     "Scientists said rising sea levels linked to climate change are causing more frequent flooding in Miami."),
+    ("Trump said the election was rigged in Georgia",
+     "Former President Donald Trump claimed that widespread fraud changed the outcome of the vote in Georgia."),
+]
+
+WORDS = (
+    "Senate ban TikTok bill Biden sign unemployment rate percent March jobs climate change flooding coastal "
+    "cities Miami Trump said election rigged Georgia fraud vote claims false misleading viral post shows"
+).split()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--page", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = [" ".join(rng.choices(WORDS, k=rng.randint(8, 18))) for _ in range(200)]
+
+    async def fake_fetch(query, **kwargs):
+        # Stable per query, overlapping across queries like real result pages
+        r = random.Random(query)
+        return [FactCheckItem(claim=c, source=f"pub{n}", url=f"https://fc.example/{abs(hash(c))}")
+                for n, c in enumerate(r.sample(pool, args.page))]
+
+    async def run_all():
+        for headline, summary in HEADLINES:
+            factcheck_service._cache.clear()
+            await factcheck_service.find_best_factchecks(headline, summary=summary, max_age_months=9999)
+
+    patches = [
+        mock.patch.object(factcheck_service, "fetch_claims", side_effect=fake_fetch),
+        mock.patch.object(factcheck_service, "ingest_factchecks"),
+        mock.patch.object(factcheck_service, "search_local_claims", return_value=[]),
+        mock.patch.object(factcheck_service.settings, "fact_check_enabled", True),
+        mock.patch.object(factcheck_service.settings, "google_factcheck_api_key", "bench"),
+        mock.patch.object(factcheck_service.quota_manager, "remaining", return_value=None),
+    ]
+    for p in patches:
+        p.start()
+
+    logging.disable(logging.CRITICAL)
+
+    for enabled in (False, True):
+        text_util.memo_enabled = enabled
+        text_util.clear_memo()
+        asyncio.run(run_all())  # warm-up (regex compilation, imports)
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            asyncio.run(run_all())
+        elapsed = (time.perf_counter() - started) / (args.rounds * len(HEADLINES))
+        print(f"memo {'on ' if enabled else 'off'}: {elapsed * 1e3:7.2f} ms per find_best_factchecks")
+        if enabled:
+            for name, stats in text_util.memo_stats().items():
+                total = stats["hits"] + stats["misses"]
+                ratio = stats["hits"] / total if total else 0.0
+                print(f"  {name:9s} hits {stats['hits']:7d} misses {stats['misses']:6d} hit ratio {ratio:.2f}")
+
+
+if __name__ == "__main__":
+    main()
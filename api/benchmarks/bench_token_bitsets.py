@@ -0,0 +1,115 @@
+"""
+Benchmark string-set vs interned-bitset text similarity.
+
+Scores a pool of synthetic candidate claims against one query the way
+factcheck_score does (bigram and unigram Jaccard), once with frozensets
+of strings and once with a TokenVocabulary and bitsets. Reports the cost
+including per-candidate encoding, and of the comparisons alone on texts
+encoded up front. The one-off case compares two texts with no shared
+vocabulary, as TextUtil's Jaccard helpers do: a fresh vocabulary per pair
+against the memoized frozensets.
+
+Usage (from the api directory):
+    python benchmarks/bench_token_bitsets.py [--candidates 5000] [--rounds 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.textutil import TextFeatures, TokenVocabulary, bitset_jaccard, set_jaccard, text_util
+
+QUERY = "Senate passes bill to ban TikTok nationwide after Biden signs order"
+TOPIC_WORDS = (
+    "senate senators ban banned tiktok app bill legislation biden sign nationwide china chinese "
+    "owner bytedance sell vote passed tuesday house congress data privacy security"
+).split()
+
+
+def _candidates(n, seed=0):
+    rng = random.Random(seed)
+    words = TOPIC_WORDS * 3 + [f"word{i}" for i in range(2000)]
+    return [" ".join(rng.choices(words, k=rng.randint(8, 30))) for _ in range(n)]
+
+
+def _best_of(rounds, fn):
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = _candidates(args.candidates)
+    query = TextFeatures(QUERY)
+
+    def with_sets(features):
+        for f in features:
+            set_jaccard(query.bigrams, f.bigrams)
+            set_jaccard(query.token_set, f.token_set)
+
+    def with_bitsets(features, vocab):
+        q = query.encoded(vocab)
+        for f in features:
+            c = f.encoded(vocab, grow=False)
+            bitset_jaccard(q.bigram_bits, len(q.bigram_keys), c.bigram_bits, len(c.bigram_keys))
+            bitset_jaccard(q.token_bits, len(q.token_ids), c.token_bits, len(c.token_ids))
+
+    def fresh():
+        features = [TextFeatures(t) for t in texts]
+        for f in features:
+            f.tokens
+        return features
+
+    # Tokenization is memoized and shared by both paths; exclude it
+    fresh()
+    sets_total = _best_of(args.rounds, lambda: with_sets(fresh()))
+    bits_total = _best_of(args.rounds, lambda: with_bitsets(fresh(), TokenVocabulary()))
+
+    prepared = fresh()
+    vocab = TokenVocabulary()
+    with_sets(prepared)
+    with_bitsets(prepared, vocab)
+    sets_compare = _best_of(args.rounds, lambda: with_sets(prepared))
+    bits_compare = _best_of(args.rounds, lambda: with_bitsets(prepared, vocab))
+
+    # Repeat a pool that fits the memo caches, as repeated pairs in a request do
+    pairs = (texts[:1000] * (len(texts) // 1000 + 1))[:len(texts)]
+
+    def one_off_sets():
+        for text in pairs:
+            text_util.jaccard_similarity(QUERY, text)
+            text_util.ngram_jaccard_similarity(QUERY, text)
+
+    def one_off_bitsets():
+        query_tokens = text_util.tokenize(QUERY)
+        for text in pairs:
+            vocab = TokenVocabulary()
+            a = vocab.encode(query_tokens)
+            b = vocab.encode(text_util.tokenize(text), grow=False)
+            bitset_jaccard(a.token_bits, len(a.token_ids), b.token_bits, len(b.token_ids))
+            bitset_jaccard(a.bigram_bits, len(a.bigram_keys), b.bigram_bits, len(b.bigram_keys))
+
+    one_off_sets()
+    one_off_sets_ms = _best_of(args.rounds, one_off_sets)
+    one_off_bits_ms = _best_of(args.rounds, one_off_bitsets)
+
+    print(f"{args.candidates} candidates, best of {args.rounds}")
+    print(f"  build + compare: sets {sets_total:8.2f} ms   bitsets {bits_total:8.2f} ms")
+    print(f"  compare only:    sets {sets_compare:8.2f} ms   bitsets {bits_compare:8.2f} ms")
+    print(f"  one-off pairs:   sets {one_off_sets_ms:8.2f} ms   bitsets {one_off_bits_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
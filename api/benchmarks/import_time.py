@@ -0,0 +1,90 @@
+"""
+Report where the API's import (cold start) time goes, by module.
+
+Runs `python -X importtime` on `import main` in fresh interpreters and
+prints the slowest modules by cumulative time, the top-level packages
+they belong to, and the total wall time. With --prewarm the lazily
+imported dependencies (utils.lazy) are loaded too, to show what the first
+fetch/extraction pays for or what PREWARM_IMPORTS moves to startup.
+
+Usage (from the api directory):
+    python benchmarks/import_time.py [--top 25] [--runs 3] [--prewarm] [--json report.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# (module, depth, self_us, cumulative_us) per imported module
+ImportRow = Tuple[str, int, int, int]
+
+
+def _statement(prewarm: bool) -> str:
+    statement = "import time; started = time.perf_counter(); import main"
+    if prewarm:
+        statement += "; from utils.lazy import prewarm; prewarm()"
+    return statement + "; print(time.perf_counter() - started)"
+
+
+def measure(prewarm: bool = False) -> Tuple[float, List[ImportRow]]:
+    """Wall seconds and per-module -X importtime rows of one fresh interpreter."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _statement(prewarm)],
+        cwd=API_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return float(result.stdout.strip().splitlines()[-1]), rows
+
+
+def by_package(rows: List[ImportRow]) -> Dict[str, float]:
+    """Self time summed per top-level package, in milliseconds."""
+    totals: Dict[str, float] = defaultdict(float)
+    for name, _, self_us, _ in rows:
+        totals[name.split(".")[0]] += self_us / 1e3
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--runs", type=int, default=3, help="report the fastest of this many interpreters")
+    parser.add_argument("--prewarm", action="store_true", help="also load the lazily imported dependencies")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    wall_s, rows = min((measure(args.prewarm) for _ in range(args.runs)), key=lambda run: run[0])
+    packages = by_package(rows)
+    slowest = sorted(rows, key=lambda row: -row[3])[:args.top]
+
+    print(f"import main{' + prewarm' if args.prewarm else ''}: {wall_s * 1e3:.0f} ms wall, {len(rows)} modules\n")
+    print(f"{'module (cumulative)':<48} {'cumul ms':>9} {'self ms':>8}")
+    for name, depth, self_us, cumulative_us in slowest:
+        print(f"{('  ' * min(depth, 6) + name)[:48]:<48} {cumulative_us / 1e3:9.1f} {self_us / 1e3:8.1f}")
+    print(f"\n{'package (self time)':<48} {'ms':>9}")
+    for package, ms in list(packages.items())[:args.top]:
+        print(f"{package:<48} {ms:9.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "wall_ms": round(wall_s * 1e3, 1),
+                "packages_ms": {k: round(v, 1) for k, v in packages.items()},
+                "modules": [{"module": n, "self_ms": s / 1e3, "cumulative_ms": c / 1e3} for n, _, s, c in rows],
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Microbenchmark suite for the text and scoring hot paths, with a stored baseline.
+
+Times summarize_lead3, canonicalize_url, ClaimMiner (extract_core_claims,
+classify_claim, extract_targets), build_queries, passes_gates, score_item,
+extract_text on a fixed HTML corpus, and FactCheckCache set/get, each over
+a seeded pool of representative inputs. Every case is run `--repeats`
+times and reported as the fastest time per operation (as timeit does:
+slower repeats measure other load on the machine, not the code); the
+median is kept alongside so noisy runs are visible.
+
+Usage (from the api directory):
+    python benchmarks/suite.py [--filter score] [--repeats 7]
+    python benchmarks/suite.py --save              # write benchmarks/baseline.json
+    python benchmarks/suite.py --compare [--threshold 0.2]
+
+--compare exits with status 1 if any case is slower than the baseline by
+more than the threshold (a fraction; 0.2 = 20%). Baselines are only
+comparable on the same machine and Python version; both are recorded.
+The suite re-executes itself with PYTHONHASHSEED=0 so set ordering, and
+with it the work done per input, is the same on every run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from loadtest.stand_ins import TOPICS, build_corpus, render_article
+from schemas import FactCheckItem, FactCheckResult
+from services.claims import claim_miner
+from services.extract import extract_text
+from services.factcheck_filters import passes_gates
+from services.factcheck_query import build_queries
+from services.factcheck_score import score_item
+from services.factcheck_service import FactCheckCache
+from services.summarize import summarize_lead3
+from utils.normalize import canonicalize_url
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Headline shapes seen in production traffic, filled from the load-test topics
+HEADLINE_TEMPLATES = [
+    "{actor} moves to {action} {obj} {place}",
+    "{actor} votes to {action} {obj} {place} after months of debate",
+    "Why {actor} wants to {action} {obj}",
+    "{actor} says it will {action} {obj} {place}, officials said",
+    "Breaking: {actor} to {action} {obj} - Reuters",
+    "'We will {action} {obj},' {actor} says as critics warn of legal fight",
+]
+
+SEED = 11
+
+# A case returns (run, ops): run() performs `ops` operations once
+Case = Callable[[], Tuple[Callable[[], None], int]]
+
+
+def _headlines(n: int, seed: int = SEED) -> List[str]:
+    rng = random.Random(seed)
+    headlines = []
+    for _ in range(n):
+        actors, actions, objects, places = TOPICS[rng.choice(list(TOPICS))]
+        headlines.append(rng.choice(HEADLINE_TEMPLATES).format(
+            actor=rng.choice(actors), action=rng.choice(actions),
+            obj=rng.choice(objects), place=rng.choice(places),
+        ))
+    return headlines
+
+
+def _corpus():
+    articles, claims = build_corpus(articles=120, claims=1500, seed=SEED)
+    return articles, [c["text"] for c in claims]
+
+
+def case_summarize_lead3():
+    articles, _ = _corpus()
+    texts = [" ".join(a.paragraphs) for a in articles]
+
+    def run():
+        for text in texts:
+            summarize_lead3(text)
+    return run, len(texts)
+
+
+def case_canonicalize_url():
+    articles, _ = _corpus()
+    rng = random.Random(SEED)
+    urls = []
+    for a in articles:
+        urls.append(a.url)
+        urls.append(f"http://{a.host.upper()}{a.path}/?utm_source=twitter&utm_medium=social&id={rng.randint(1, 999)}#top")
+
+    def run():
+        for url in urls:
+            canonicalize_url(url)
+    return run, len(urls)
+
+
+def case_extract_core_claims():
+    articles, _ = _corpus()
+    pairs = [(a.title, a.paragraphs[0]) for a in articles]
+
+    def run():
+        for headline, summary in pairs:
+            claim_miner.extract_core_claims(headline, summary)
+    return run, len(pairs)
+
+
+def case_classify_claim():
+    headlines = _headlines(300)
+
+    def run():
+        for headline in headlines:
+            claim_miner.classify_claim(headline)
+    return run, len(headlines)
+
+
+def case_extract_targets():
+    pairs = [(h, claim_miner.classify_claim(h)) for h in _headlines(300)]
+
+    def run():
+        for headline, claim_type in pairs:
+            claim_miner.extract_targets(headline, claim_type)
+    return run, len(pairs)
+
+
+def case_build_queries():
+    articles, _ = _corpus()
+    inputs = [(a.title, a.host, a.paragraphs[0]) for a in articles]
+
+    def run():
+        for headline, domain, summary in inputs:
+            build_queries(headline, domain, summary)
+    return run, len(inputs)
+
+
+def _scoring_inputs():
+    # A few requests, each checked against the candidates its queries would return
+    _, claim_texts = _corpus()
+    profiles = [claim_miner.build_profile(h) for h in _headlines(8, seed=SEED + 1)]
+    rng = random.Random(SEED)
+    return [(p, rng.sample(claim_texts, 60)) for p in profiles]
+
+
+def case_passes_gates():
+    inputs = _scoring_inputs()
+
+    def run():
+        for profile, candidates in inputs:
+            for text in candidates:
+                passes_gates(text, profile)
+    return run, sum(len(c) for _, c in inputs)
+
+
+def case_score_item():
+    inputs = _scoring_inputs()
+    published = datetime.now(timezone.utc) - timedelta(days=30)
+
+    def run():
+        for profile, candidates in inputs:
+            query = profile.headline.lower()
+            for text in candidates:
+                score_item(query, text, "www.reuters.com", published, profile, "core")
+    return run, sum(len(c) for _, c in inputs)
+
+
+def case_extract_text():
+    articles, _ = _corpus()
+    pages = [(render_article(a), a.url) for a in articles[:40]]
+
+    def run():
+        for page, url in pages:
+            extract_text(page, url)
+    return run, len(pages)
+
+
+def case_factcheck_cache():
+    result = FactCheckResult(status="found", items=[
+        FactCheckItem(claim="Senate did ban TikTok nationwide", source="PolitiFact",
+                      url="https://fc.example/1", verdict="False", similarity=0.71),
+    ])
+    keys = [f"fc:{h}|www.reuters.com|18" for h in _headlines(2000)]
+    rng = random.Random(SEED)
+    reads = [rng.choice(keys) for _ in range(4000)]
+
+    def run():
+        # Bounded below the key count so eviction is part of the cost
+        cache = FactCheckCache(max_entries=1500)
+        for key in keys:
+            cache.set(key, result)
+        for key in reads:
+            cache.get(key)
+    return run, len(keys) + len(reads)
+
+
+CASES: Dict[str, Case] = {
+    "summarize_lead3": case_summarize_lead3,
+    "canonicalize_url": case_canonicalize_url,
+    "claims.extract_core_claims": case_extract_core_claims,
+    "claims.classify_claim": case_classify_claim,
+    "claims.extract_targets": case_extract_targets,
+    "build_queries": case_build_queries,
+    "passes_gates": case_passes_gates,
+    "score_item": case_score_item,
+    "extract_text": case_extract_text,
+    "factcheck_cache.set_get": case_factcheck_cache,
+}
+
+
+def measure(case: Case, repeats: int, min_time_s: float = 0.2) -> Dict[str, float]:
+    """Best and median per-operation time over `repeats` timed batches."""
+    run, ops = case()
+    run()  # warm-up: imports, regex compilation, memo caches
+
+    # Loop each batch enough times that it is not dominated by timer resolution
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            run()
+        if time.perf_counter() - started >= min_time_s or loops >= 1000:
+            break
+        loops *= 2
+
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(loops):
+            run()
+        samples.append((time.perf_counter() - started) / (loops * ops) * 1e6)
+    return {
+        "us_per_op": min(samples),
+        "median_us": statistics.median(samples),
+        "ops": ops * loops,
+    }
+
+
+def run_suite(repeats: int, name_filter: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, case in CASES.items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(case, repeats)
+        row = results[name]
+        print(f"{name:<28} {row['us_per_op']:10.2f} us/op   (median {row['median_us']:.2f})", flush=True)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict, threshold: float) -> List[str]:
+    """Names of cases slower than the baseline by more than `threshold`."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    print(f"\n{'case':<28} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, row in results.items():
+        base = base_results.get(name)
+        if base is None:
+            print(f"{name:<28} {'-':>10} {row['us_per_op']:10.2f}      new")
+            continue
+        change = row["us_per_op"] / base["us_per_op"] - 1.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<28} {base['us_per_op']:10.2f} {row['us_per_op']:10.2f} {change * 100:+7.1f}%{flag}")
+    return regressions
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "recorded": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+def main():
+    # Set iteration order decides how much work the claim miners and query
+    # builder do; pin string hashing so runs are comparable across processes
+    if os.environ.get("PYTHONHASHSEED") != "0":
+        os.environ["PYTHONHASHSEED"] = "0"
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filter", help="only run cases whose name contains this")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    mode.add_argument("--compare", action="store_true", help="compare against the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, as a fraction")
+    args = parser.parse_args()
+
+    results = run_suite(args.repeats, args.filter)
+
+    if args.save:
+        baseline = {"environment": environment(), "results": {}}
+        if args.filter and os.path.exists(args.baseline):
+            # Partial runs update their cases and keep the rest
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline["results"] = json.load(f).get("results", {})
+        baseline["results"].update({
+            name: {k: round(v, 3) for k, v in row.items()} for name, row in results.items()
+        })
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+    elif args.compare:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        recorded = baseline.get("environment", {})
+        if recorded.get("python") != platform.python_version() or recorded.get("machine") != platform.machine():
+            print(f"\nWarning: baseline recorded on Python {recorded.get('python')} / {recorded.get('machine')}")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold * 100:.0f}%: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nNo regressions above {args.threshold * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 def bool_env(key: str, default: bool = False) -> bool:
@@ -12,16 +12,124 @@ def bool_env(key: str, default: bool = False) -> bool:
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
-    news_provider: str = "newsapi"
+    news_provider: str = "newsapi"  # comma-separated priority list, e.g. "newsapi,local"
     news_api_base_url: str = "https://newsapi.org/v2"
     news_api_key: Optional[str] = None
     default_page_size: int = 10
     
+    # Extra NewsAPI-compatible providers as JSON: [{"name": ..., "base_url": ..., "api_key": ...}]
+    news_http_providers: List[Dict[str, str]] = []
+    news_hedge_after_ms: int = int(os.getenv("NEWS_HEDGE_AFTER_MS", "300"))
+    news_merge_grace_ms: int = int(os.getenv("NEWS_MERGE_GRACE_MS", "100"))
+    news_search_deadline_ms: int = int(os.getenv("NEWS_SEARCH_DEADLINE_MS", "3000"))
+    
+    # Local search index (used when no news API key is configured); ingested
+    # provider results evict the oldest articles beyond max_docs (0 = no limit)
+    local_search_corpus_path: Optional[str] = os.getenv("LOCAL_SEARCH_CORPUS_PATH")
+    local_search_ingest: bool = bool_env("LOCAL_SEARCH_INGEST", default=True)
+    local_search_max_docs: int = int(os.getenv("LOCAL_SEARCH_MAX_DOCS", "50000"))
+    
+    # Extraction cache and background warming of top search results
+    extract_cache_ttl_s: int = int(os.getenv("EXTRACT_CACHE_TTL_S", "60"))
+    # Fetch articles as {origin}/{host}{path} instead of from the publisher
+    # (the publisher stand-in in loadtest/); unset in production
+    extract_fetch_origin: Optional[str] = os.getenv("EXTRACT_FETCH_ORIGIN")
+    search_warm_top_n: int = int(os.getenv("SEARCH_WARM_TOP_N", "0"))
+    search_warm_concurrency: int = int(os.getenv("SEARCH_WARM_CONCURRENCY", "2"))
+    search_warm_daily_budget: int = int(os.getenv("SEARCH_WARM_DAILY_BUDGET", "500"))
+    
     # Fact-check settings
     fact_check_enabled: bool = bool_env("FACT_CHECK_ENABLED", default=True)
     google_factcheck_api_key: Optional[str] = os.getenv("GOOGLE_FACTCHECK_API_KEY")
     fact_check_cache_ttl_min: int = int(os.getenv("FACT_CHECK_CACHE_TTL_MIN", "360"))
+    fact_check_cache_max_entries: int = int(os.getenv("FACT_CHECK_CACHE_MAX_ENTRIES", "100000"))
+    fact_check_cache_max_bytes: int = int(os.getenv("FACT_CHECK_CACHE_MAX_BYTES", "0"))  # 0 = no byte limit
+    # Key results by canonical headline (lowercased, stopwords and source
+    # suffix removed, token-sorted) and let near-identical headlines reuse
+    # them above the similarity threshold (Jaccard; >= 1 turns reuse off)
+    fact_check_canonical_keys: bool = bool_env("FACT_CHECK_CANONICAL_KEYS", default=False)
+    fact_check_similar_threshold: float = float(os.getenv("FACT_CHECK_SIMILAR_THRESHOLD", "0.8"))
     factcheck_api_base: str = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+    factcheck_query_concurrency: int = int(os.getenv("FACTCHECK_QUERY_CONCURRENCY", "4"))
+    factcheck_query_cache_ttl_s: int = int(os.getenv("FACTCHECK_QUERY_CACHE_TTL_S", "3600"))
+    factcheck_query_cache_size: int = int(os.getenv("FACTCHECK_QUERY_CACHE_SIZE", "5000"))
+    factcheck_query_dedup_threshold: float = float(os.getenv("FACTCHECK_QUERY_DEDUP_THRESHOLD", "0.75"))
+    factcheck_claim_dedup_threshold: float = float(os.getenv("FACTCHECK_CLAIM_DEDUP_THRESHOLD", "0.8"))
+    factcheck_batch_max_items: int = int(os.getenv("FACTCHECK_BATCH_MAX_ITEMS", "50"))
+    factcheck_batch_concurrency: int = int(os.getenv("FACTCHECK_BATCH_CONCURRENCY", "8"))  # upstream queries per batch
+    
+    # Circuit breaker around the Fact Check API; "none" results caused by
+    # upstream failures are cached only briefly
+    factcheck_breaker_failure_threshold: int = int(os.getenv("FACTCHECK_BREAKER_FAILURE_THRESHOLD", "5"))
+    factcheck_breaker_reset_s: float = float(os.getenv("FACTCHECK_BREAKER_RESET_S", "30"))
+    fact_check_degraded_cache_ttl_s: int = int(os.getenv("FACT_CHECK_DEGRADED_CACHE_TTL_S", "60"))
+    
+    # Background fact-checks of trending headlines (interval 0 = off); headlines
+    # come from a local list (one per line, optionally "headline<TAB>url") or
+    # from searching the news providers for the warm queries
+    factcheck_warm_interval_s: int = int(os.getenv("FACTCHECK_WARM_INTERVAL_S", "0"))
+    factcheck_warm_headlines_path: Optional[str] = os.getenv("FACTCHECK_WARM_HEADLINES_PATH")
+    factcheck_warm_queries: str = os.getenv("FACTCHECK_WARM_QUERIES", "news")
+    factcheck_warm_top_n: int = int(os.getenv("FACTCHECK_WARM_TOP_N", "20"))
+    factcheck_warm_daily_budget: int = int(os.getenv("FACTCHECK_WARM_DAILY_BUDGET", "200"))  # upstream queries
+    
+    # Local ClaimReview store, queried before the Fact Check API; ingested API
+    # results expire with the query cache TTL and are capped at max_claims
+    factcheck_local_corpus_path: Optional[str] = os.getenv("FACTCHECK_LOCAL_CORPUS_PATH")
+    factcheck_local_ingest: bool = bool_env("FACTCHECK_LOCAL_INGEST", default=True)
+    factcheck_local_ingest_max_claims: int = int(os.getenv("FACTCHECK_LOCAL_INGEST_MAX_CLAIMS", "50000"))
+    
+    # Memoization of text normalization/tokenization
+    textutil_memo_enabled: bool = bool_env("TEXTUTIL_MEMO_ENABLED", default=True)
+    textutil_memo_size: int = int(os.getenv("TEXTUTIL_MEMO_SIZE", "4096"))
+    
+    # Upstream quotas, shared by all workers through a local SQLite file
+    quota_db_path: Optional[str] = os.getenv("QUOTA_DB_PATH")
+    newsapi_daily_budget: int = int(os.getenv("NEWSAPI_DAILY_BUDGET", "1000"))
+    newsapi_rate_per_s: float = float(os.getenv("NEWSAPI_RATE_PER_S", "5"))
+    newsapi_burst: int = int(os.getenv("NEWSAPI_BURST", "10"))
+    factcheck_daily_budget: int = int(os.getenv("FACTCHECK_DAILY_BUDGET", "10000"))
+    factcheck_rate_per_s: float = float(os.getenv("FACTCHECK_RATE_PER_S", "10"))
+    factcheck_burst: int = int(os.getenv("FACTCHECK_BURST", "20"))
+    
+    # Where the extraction, fact-check result and query caches live: "memory"
+    # (per process), "sqlite" (one file shared by the workers of a host; put
+    # it on /dev/shm, the default where it exists) or "redis" (any
+    # Redis-protocol server, shared across hosts). Shared values are stored
+    # as msgpack (JSON without it), zlib-compressed above the threshold
+    cache_backend: str = os.getenv("CACHE_BACKEND", "memory")
+    cache_sqlite_path: Optional[str] = os.getenv("CACHE_SQLITE_PATH")
+    cache_redis_url: str = os.getenv("CACHE_REDIS_URL", "redis://127.0.0.1:6379/0")
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "200000"))  # sqlite; redis uses maxmemory
+    cache_timeout_s: float = float(os.getenv("CACHE_TIMEOUT_S", "0.25"))
+    cache_compress_min_bytes: int = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "512"))
+
+    # Admission control: concurrent requests per endpoint class (0 = no limit),
+    # how many more may wait for a slot and for how long; the rest get a 503
+    # with Retry-After. Cache hits, /health and /metrics are never shed
+    admission_enabled: bool = bool_env("ADMISSION_ENABLED", default=True)
+    admission_analyze_concurrency: int = int(os.getenv("ADMISSION_ANALYZE_CONCURRENCY", "16"))
+    admission_analyze_queue: int = int(os.getenv("ADMISSION_ANALYZE_QUEUE", "64"))
+    admission_analyze_queue_timeout_ms: int = int(os.getenv("ADMISSION_ANALYZE_QUEUE_TIMEOUT_MS", "2000"))
+    admission_factcheck_concurrency: int = int(os.getenv("ADMISSION_FACTCHECK_CONCURRENCY", "32"))
+    admission_factcheck_queue: int = int(os.getenv("ADMISSION_FACTCHECK_QUEUE", "128"))
+    admission_factcheck_queue_timeout_ms: int = int(os.getenv("ADMISSION_FACTCHECK_QUEUE_TIMEOUT_MS", "2000"))
+
+    # Heavy dependencies (trafilatura, aiohttp, httpx, ...) are imported on
+    # first use; "startup" imports them before serving, "background" in a
+    # thread right after startup, "off" leaves them to the first request
+    prewarm_imports: str = os.getenv("PREWARM_IMPORTS", "off")
+    
+    # Prometheus /metrics endpoint
+    metrics_enabled: bool = bool_env("METRICS_ENABLED", default=True)
+    
+    # Per-request tracing: a Server-Timing header on every response, and a
+    # sampled share of traces exported as OTLP/JSON to a file (one request
+    # per line) and/or an OTLP/HTTP collector, e.g. http://localhost:4318/v1/traces
+    server_timing_enabled: bool = bool_env("SERVER_TIMING_ENABLED", default=True)
+    trace_sample_rate: float = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+    trace_export_path: Optional[str] = os.getenv("TRACE_EXPORT_PATH")
+    trace_export_url: Optional[str] = os.getenv("TRACE_EXPORT_URL")
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,209 @@
+"""
+Local stand-in for a Redis-protocol cache server.
+
+Speaks enough RESP2 for services.cache_backend.RedisBackend (PING, AUTH,
+SELECT, GET, SET with EX/PX, DEL, EXISTS, SCAN, DBSIZE, FLUSHDB), keeping
+keys in memory with per-key expiry. Used by the tests and to load-test
+multi-worker deployments with CACHE_BACKEND=redis without a real server.
+
+Usage (from the api directory):
+    python loadtest/redis_stand_in.py [--port 6380]
+
+and start the API with CACHE_BACKEND=redis CACHE_REDIS_URL=redis://127.0.0.1:6380/0
+"""
+
+import argparse
+import fnmatch
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def setup(self):
+        super().setup()
+        self.server.connections.add(self.connection)
+
+    def finish(self):
+        self.server.connections.discard(self.connection)
+        super().finish()
+
+    def handle(self):
+        while True:
+            try:
+                args = self._read_command()
+            except (ConnectionError, ValueError):
+                return
+            if args is None:
+                return
+            self.server.store.commands += 1
+            self.wfile.write(self.server.store.execute(args))
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command, e.g. from telnet
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            header = self.rfile.readline()
+            if not header.startswith(b"$"):
+                raise ValueError("expected bulk string")
+            data = self.rfile.read(int(header[1:]) + 2)
+            args.append(data[:-2])
+        return args
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], store: "Store"):
+        super().__init__(address, _Handler)
+        self.store = store
+        self.connections = set()
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _array(values: List[bytes]) -> bytes:
+    return b"*%d\r\n" % len(values) + b"".join(values)
+
+
+class Store:
+    """Keys, values and expiry times, shared by all connections."""
+
+    def __init__(self, password: Optional[str] = None):
+        self.password = password
+        self.commands = 0
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    def execute(self, args: List[bytes]) -> bytes:
+        name = args[0].upper().decode("ascii", "replace")
+        command = getattr(self, f"_cmd_{name.lower()}", None)
+        if command is None:
+            return f"-ERR unknown command '{name}'\r\n".encode("utf-8")
+        with self._lock:
+            try:
+                return command(args[1:])
+            except (IndexError, ValueError):
+                return f"-ERR syntax error in '{name}'\r\n".encode("utf-8")
+
+    def _cmd_ping(self, args):
+        return b"+PONG\r\n"
+
+    def _cmd_auth(self, args):
+        if self.password is not None and args[-1].decode("utf-8") != self.password:
+            return b"-WRONGPASS invalid password\r\n"
+        return b"+OK\r\n"
+
+    def _cmd_select(self, args):
+        int(args[0])
+        return b"+OK\r\n"
+
+    def _cmd_get(self, args):
+        return _bulk(self._live(args[0]))
+
+    def _cmd_set(self, args):
+        key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+        expires_at = None
+        if b"PX" in options:
+            expires_at = time.monotonic() + int(args[2 + options.index(b"PX") + 1]) / 1000
+        elif b"EX" in options:
+            expires_at = time.monotonic() + int(args[2 + options.index(b"EX") + 1])
+        self._data[key] = (value, expires_at)
+        return b"+OK\r\n"
+
+    def _cmd_del(self, args):
+        removed = 0
+        for key in args:
+            if self._live(key) is not None:
+                del self._data[key]
+                removed += 1
+        return b":%d\r\n" % removed
+
+    def _cmd_exists(self, args):
+        return b":%d\r\n" % sum(self._live(key) is not None for key in args)
+
+    def _cmd_scan(self, args):
+        # Everything in one page; the cursor always comes back as 0
+        pattern = b"*"
+        if b"MATCH" in [a.upper() for a in args]:
+            pattern = args[[a.upper() for a in args].index(b"MATCH") + 1]
+        # fnmatch has no backslash escapes; drop them (namespaces are plain)
+        pattern_text = pattern.decode("utf-8").replace("\\", "")
+        keys = [k for k in list(self._data) if self._live(k) is not None
+                and fnmatch.fnmatchcase(k.decode("utf-8", "replace"), pattern_text)]
+        return _array([_bulk(b"0"), _array([_bulk(k) for k in keys])])
+
+    def _cmd_dbsize(self, args):
+        return b":%d\r\n" % sum(self._live(k) is not None for k in list(self._data))
+
+    def _cmd_flushdb(self, args):
+        self._data.clear()
+        return b"+OK\r\n"
+
+
+class RedisStandIn:
+    """The stand-in server on a background thread; port 0 picks a free port."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, password: Optional[str] = None):
+        self.store = Store(password)
+        self._server = _Server((host, port), self.store)
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    def close(self) -> None:
+        """Stop listening and drop open connections, as a server outage would."""
+        self._server.shutdown()
+        self._server.server_close()
+        for conn in list(self._server.connections):
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+                conn.close()
+            except OSError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    parser.add_argument("--password")
+    args = parser.parse_args()
+
+    stand_in = RedisStandIn(args.host, args.port, args.password)
+    print(f"Redis stand-in listening on {stand_in.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stand_in.close()
+
+
+if __name__ == "__main__":
+    main()
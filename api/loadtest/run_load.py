@@ -0,0 +1,154 @@
+"""
+Replay mixed user traffic against a running API and report latency per endpoint.
+
+Each simulated user loops through what the frontend does for a reader:
+search for a topic, open one or two results (GET /analyze/url), and
+fact-check each opened article's headline (POST /factcheck), with a short
+think time between steps. Users run concurrently for a fixed duration;
+the report has requests, errors, throughput and p50/p95/p99 latency per
+endpoint.
+
+Usage (from the api directory, with the API pointed at the stand-ins in
+loadtest/stand_ins.py):
+    python loadtest/run_load.py [--base-url http://127.0.0.1:8000] [--users 20]
+        [--duration 60] [--think-ms 200] [--json report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+QUERIES = [
+    "tiktok ban", "senate tiktok", "interest rates", "federal reserve", "unemployment benefits",
+    "gas cars ban", "coal plants", "covid vaccine children", "weight-loss drug", "election results georgia",
+    "mail-in ballots", "border wall", "asylum hearings", "minimum wage", "methane emissions",
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadStats:
+    """Latencies and errors per endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def report(self, elapsed_s: float) -> Dict[str, Dict[str, float]]:
+        report = {}
+        endpoints = sorted(self.latencies)
+        for endpoint in endpoints + ["all"]:
+            if endpoint == "all":
+                values = sorted(v for vs in self.latencies.values() for v in vs)
+                errors = sum(self.errors.values())
+            else:
+                values = sorted(self.latencies[endpoint])
+                errors = self.errors[endpoint]
+            report[endpoint] = {
+                "requests": len(values),
+                "errors": errors,
+                "rps": len(values) / elapsed_s if elapsed_s else 0.0,
+                "p50_ms": percentile(values, 50) * 1e3,
+                "p95_ms": percentile(values, 95) * 1e3,
+                "p99_ms": percentile(values, 99) * 1e3,
+            }
+        return report
+
+
+async def _timed(stats: LoadStats, endpoint: str, request) -> Optional[httpx.Response]:
+    started = time.perf_counter()
+    try:
+        response = await request
+    except httpx.HTTPError:
+        stats.record(endpoint, time.perf_counter() - started, ok=False)
+        return None
+    stats.record(endpoint, time.perf_counter() - started, ok=response.status_code < 400)
+    return response
+
+
+async def user_session(client: httpx.AsyncClient, stats: LoadStats, rng: random.Random,
+                       deadline: float, think_s: float) -> None:
+    async def think():
+        await asyncio.sleep(think_s * rng.uniform(0.5, 1.5))
+
+    while time.monotonic() < deadline:
+        response = await _timed(stats, "GET /search", client.get("/search", params={"q": rng.choice(QUERIES)}))
+        items = response.json().get("items", []) if response is not None and response.status_code == 200 else []
+        await think()
+
+        for item in rng.sample(items, min(len(items), rng.randint(1, 2))):
+            if time.monotonic() >= deadline:
+                return
+            response = await _timed(stats, "GET /analyze/url", client.get("/analyze/url", params={"url": item["url"]}))
+            if response is None or response.status_code != 200:
+                continue
+            analysis = response.json()
+            headline = analysis["extract"].get("headline") or item.get("title") or ""
+            summary = (analysis.get("summary") or {}).get("joined")
+            await think()
+
+            # Same payload as the analyze page
+            lowered = headline.lower()
+            await _timed(stats, "POST /factcheck", client.post("/factcheck", json={
+                "headline": headline,
+                "sourceDomain": urlparse(item["url"]).hostname,
+                "summary": summary,
+                "maxAgeMonths": 12 if "court" in lowered or "scotus" in lowered else 18,
+            }))
+            await think()
+
+
+async def run(base_url: str, users: int, duration_s: float, think_ms: float, seed: int = 1) -> Dict:
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=users * 2, max_keepalive_connections=users * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        started = time.monotonic()
+        deadline = started + duration_s
+        await asyncio.gather(*[
+            user_session(client, stats, random.Random(seed + n), deadline, think_ms / 1000)
+            for n in range(users)
+        ])
+        elapsed = time.monotonic() - started
+    return stats.report(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--think-ms", type=float, default=200.0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.base_url, args.users, args.duration, args.think_ms))
+    print(f"{'endpoint':<20} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, row in report.items():
+        print(f"{endpoint:<20} {row['requests']:>9} {row['errors']:>7} {row['rps']:>8.1f} "
+              f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Local stand-ins for every upstream the API talks to, for load testing.
+
+Serves, on three ports:
+  - a NewsAPI-compatible /v2/everything,
+  - a Google Fact Check Tools-compatible /v1alpha1/claims:search,
+  - a publisher-site server returning article pages shaped like real news
+    sites (navigation, ads, scripts, bylines, related links, paywalls),
+    addressed as /{host}{path}.
+
+All content comes from a seeded synthetic corpus, so runs are repeatable.
+Each server has its own latency distribution (log-normal around a median)
+plus error and hang rates, set as "median_ms,sigma,error_rate,hang_rate".
+
+Usage (from the api directory):
+    python loadtest/stand_ins.py [--port 9100] [--news 120,0.5,0.01,0]
+        [--factcheck 250,0.6,0.02,0.005] [--publisher 300,0.7,0.01,0.002]
+
+and start the API with the environment it prints, e.g.:
+    NEWS_API_BASE_URL=http://127.0.0.1:9100/v2 NEWS_API_KEY=loadtest ...
+    uvicorn main:app --port 8000
+"""
+
+import argparse
+import asyncio
+import html
+import os
+import random
+import re
+import sys
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+PUBLISHERS = [
+    ("www.reuters.com", "Reuters"),
+    ("apnews.com", "Associated Press"),
+    ("www.bbc.com", "BBC News"),
+    ("www.theguardian.com", "The Guardian"),
+    ("www.nytimes.com", "The New York Times"),
+    ("www.foxnews.com", "Fox News"),
+    ("www.npr.org", "NPR"),
+    ("www.washingtonpost.com", "The Washington Post"),
+]
+
+FACT_CHECKERS = ["PolitiFact", "FactCheck.org", "Snopes", "AFP Fact Check", "Reuters Fact Check", "Full Fact"]
+RATINGS = ["False", "Mostly False", "Half True", "Mostly True", "True", "Misleading", "Missing Context", "Unproven"]
+
+# (actors, actions, objects, places) per topic
+TOPICS = {
+    "tiktok": (["Senate", "House", "President Biden", "Commerce Department"], ["ban", "restrict", "force the sale of"],
+               ["TikTok", "ByteDance", "Chinese apps"], ["nationwide", "in Montana", "on government phones"]),
+    "economy": (["Federal Reserve", "Treasury", "Labor Department"], ["raise", "cut", "hold steady"],
+                ["interest rates", "unemployment benefits", "the minimum wage"], ["this quarter", "in March", "for 2025"]),
+    "climate": (["EPA", "California", "the European Union"], ["ban", "tax", "regulate"],
+                ["gas cars", "coal plants", "methane emissions"], ["by 2035", "statewide", "across the bloc"]),
+    "health": (["CDC", "FDA", "WHO"], ["approve", "recommend", "withdraw"],
+               ["the COVID vaccine", "a weight-loss drug", "measles boosters"], ["for children", "nationwide", "in Europe"]),
+    "elections": (["Supreme Court", "Georgia officials", "Congress"], ["overturn", "certify", "investigate"],
+                  ["the election results", "mail-in ballots", "voting machines"], ["in Georgia", "in Arizona", "nationwide"]),
+    "immigration": (["Border Patrol", "Texas", "the White House"], ["expand", "end", "fund"],
+                    ["the border wall", "asylum hearings", "work visas"], ["in Texas", "at the southern border", "this year"]),
+}
+
+FILLER = [
+    "Officials said the decision followed months of negotiations.",
+    "Critics argued the move could face legal challenges.",
+    "Supporters said the measure was long overdue.",
+    "The announcement drew mixed reactions from lawmakers of both parties.",
+    "Analysts expect the change to take effect within weeks.",
+    "A spokesperson declined to comment on the details.",
+    "The policy has been debated for several years.",
+    "Polls show the public remains divided on the issue.",
+]
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> set:
+    return set(_WORD_RE.findall(text.lower())) - {"the", "a", "of", "to", "in", "on", "for", "and"}
+
+
+@dataclass
+class Behavior:
+    median_ms: float = 100.0
+    sigma: float = 0.5           # log-normal spread; p99 ~ median * e^(2.33 sigma)
+    error_rate: float = 0.0      # answered with HTTP 503
+    hang_rate: float = 0.0       # never answered within the client's timeout
+
+    @classmethod
+    def parse(cls, spec: str) -> "Behavior":
+        values = [float(v) for v in spec.split(",") if v.strip()]
+        return cls(*values)
+
+    async def apply(self, rng: random.Random) -> Optional[web.Response]:
+        """Sleep for a sampled latency; returns an error response to send instead, if any."""
+        roll = rng.random()
+        if roll < self.hang_rate:
+            await asyncio.sleep(60)
+        await asyncio.sleep(self.median_ms / 1000 * rng.lognormvariate(0, self.sigma))
+        if roll < self.hang_rate + self.error_rate:
+            return web.json_response({"error": {"code": 503, "message": "Backend Error"}}, status=503)
+        return None
+
+
+@dataclass
+class Article:
+    host: str
+    publisher: str
+    path: str
+    title: str
+    author: str
+    published_at: datetime
+    paragraphs: List[str]
+    paywalled: bool
+
+    @property
+    def url(self) -> str:
+        return f"https://{self.host}{self.path}"
+
+
+def build_corpus(articles: int = 400, claims: int = 3000, seed: int = 7) -> Tuple[List[Article], List[Dict]]:
+    rng = random.Random(seed)
+    # Dates relative to today, so recency filters behave as in production
+    now = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    corpus = []
+    for i in range(articles):
+        topic = rng.choice(list(TOPICS))
+        actors, actions, objects, places = TOPICS[topic]
+        actor, action, obj, place = rng.choice(actors), rng.choice(actions), rng.choice(objects), rng.choice(places)
+        title = rng.choice([
+            f"{actor} moves to {action} {obj} {place}",
+            f"{actor} votes to {action} {obj} {place}",
+            f"Why {actor} wants to {action} {obj}",
+            f"{actor} says it will {action} {obj} {place}",
+        ])
+        host, publisher = rng.choice(PUBLISHERS)
+        slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+        paragraphs = [f"{actor} on {rng.choice(['Monday', 'Tuesday', 'Wednesday', 'Thursday'])} announced plans to "
+                      f"{action} {obj} {place}, in a decision likely to reshape the debate over {topic}."]
+        for _ in range(rng.randint(5, 14)):
+            paragraphs.append(" ".join(rng.sample(FILLER, 3)))
+        corpus.append(Article(
+            host=host, publisher=publisher, path=f"/{topic}/2025/{i:05d}-{slug}",
+            title=title, author=rng.choice(["Jane Doe", "John Smith", "Maria Garcia", "Wei Chen"]),
+            published_at=now - timedelta(hours=rng.randint(0, 24 * 30)),
+            paragraphs=paragraphs, paywalled=rng.random() < 0.1,
+        ))
+
+    claims_list = []
+    for i in range(claims):
+        topic = rng.choice(list(TOPICS))
+        actors, actions, objects, places = TOPICS[topic]
+        text = f"{rng.choice(actors)} {rng.choice(['will', 'did', 'plans to', 'voted to'])} " \
+               f"{rng.choice(actions)} {rng.choice(objects)} {rng.choice(places)}"
+        rating = rng.choice(RATINGS)
+        claims_list.append({
+            "text": text,
+            "claimant": rng.choice(["Social media posts", "A viral video", "A campaign ad", "A senator"]),
+            "claimDate": (now - timedelta(days=rng.randint(0, 720))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "claimReview": [{
+                "publisher": {"name": rng.choice(FACT_CHECKERS)},
+                "url": f"https://factcheck.example/{topic}/{i}",
+                "title": f"Fact check: {text}",
+                "textualRating": rating,
+                "languageCode": "en",
+            }],
+        })
+    return corpus, claims_list
+
+
+def render_article(article: Article) -> str:
+    """An article page with the clutter extraction has to get past."""
+    e = html.escape
+    nav = "".join(f'<li><a href="/{s}">{s.title()}</a></li>' for s in ("world", "politics", "business", "tech"))
+    body = "".join(f"<p>{e(p)}</p>" for p in (article.paragraphs[:2] if article.paywalled else article.paragraphs))
+    paywall = (
+        '<div class="paywall-overlay"><h2>Subscribe to continue reading</h2>'
+        '<p>You have reached your limit of free articles. Become a subscriber.</p></div>'
+    ) if article.paywalled else ""
+    related = "".join(f'<li><a href="/related/{n}">Related story {n}</a></li>' for n in range(5))
+    published = article.published_at.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{e(article.title)} | {e(article.publisher)}</title>
+<meta property="og:title" content="{e(article.title)}">
+<meta property="og:site_name" content="{e(article.publisher)}">
+<meta name="author" content="{e(article.author)}">
+<meta property="article:published_time" content="{published}">
+<link rel="canonical" href="{e(article.url)}">
+<script type="application/ld+json">{{"@type": "NewsArticle", "headline": "{e(article.title)}",
+ "datePublished": "{published}", "author": {{"@type": "Person", "name": "{e(article.author)}"}}}}</script>
+<script>window.dataLayer = window.dataLayer || []; function gtag(){{dataLayer.push(arguments);}}</script>
+<style>.ad{{min-height:250px}} .paywall-overlay{{position:fixed}}</style>
+</head>
+<body>
+<header><a class="logo" href="/">{e(article.publisher)}</a><nav><ul>{nav}</ul></nav>
+<div class="ad" id="ad-top">Advertisement</div></header>
+<main>
+<article>
+<h1>{e(article.title)}</h1>
+<div class="byline">By <span class="author">{e(article.author)}</span> <time datetime="{published}">{published}</time></div>
+<figure><img src="/img/lead.jpg" alt=""><figcaption>File photo.</figcaption></figure>
+{body}
+{paywall}
+</article>
+<aside><div class="ad" id="ad-side">Advertisement</div><h3>Most read</h3><ul>{related}</ul></aside>
+</main>
+<footer><p>&copy; 2025 {e(article.publisher)}. All rights reserved.</p><a href="/privacy">Privacy</a></footer>
+<script src="/static/app.js" async></script>
+</body>
+</html>"""
+
+
+class StandIns:
+    """The three stand-in apps over one shared corpus."""
+
+    def __init__(self, news: Behavior, factcheck: Behavior, publisher: Behavior, seed: int = 7):
+        self.articles, self.claims = build_corpus(seed=seed)
+        self.by_path = {f"/{a.host}{a.path}": a for a in self.articles}
+        self.article_words = [_words(a.title + " " + a.paragraphs[0]) for a in self.articles]
+        self.claim_words = [_words(c["text"]) for c in self.claims]
+        self.behaviors = {"news": news, "factcheck": factcheck, "publisher": publisher}
+        self.rng = random.Random(seed)
+        self.requests = {"news": 0, "factcheck": 0, "publisher": 0}
+
+    async def _prelude(self, name: str) -> Optional[web.Response]:
+        self.requests[name] += 1
+        return await self.behaviors[name].apply(self.rng)
+
+    @staticmethod
+    def _ranked(query: str, words: List[set], limit: int) -> List[int]:
+        query_words = _words(query)
+        scored = [(len(query_words & w), i) for i, w in enumerate(words)]
+        scored = [(s, i) for s, i in scored if s > 0]
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [i for _, i in scored[:limit]]
+
+    async def everything(self, request: web.Request) -> web.Response:
+        error = await self._prelude("news")
+        if error is not None:
+            return error
+        q = request.query.get("q", "")
+        page = max(1, int(request.query.get("page", "1")))
+        page_size = min(100, max(1, int(request.query.get("pageSize", "20"))))
+        matches = self._ranked(q, self.article_words, 500)
+        if not matches:
+            # Unknown topics still get results, like a real search engine
+            start = zlib.crc32(q.encode()) % len(self.articles)
+            matches = [(start + n) % len(self.articles) for n in range(50)]
+        window = matches[(page - 1) * page_size:page * page_size]
+        return web.json_response({
+            "status": "ok",
+            "totalResults": len(matches),
+            "articles": [{
+                "source": {"id": None, "name": self.articles[i].publisher},
+                "author": self.articles[i].author,
+                "title": self.articles[i].title,
+                "description": self.articles[i].paragraphs[0],
+                "url": self.articles[i].url,
+                "publishedAt": self.articles[i].published_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            } for i in window],
+        })
+
+    async def claims_search(self, request: web.Request) -> web.Response:
+        error = await self._prelude("factcheck")
+        if error is not None:
+            return error
+        page_size = min(10, max(1, int(request.query.get("pageSize", "5"))))
+        matches = self._ranked(request.query.get("query", ""), self.claim_words, page_size)
+        return web.json_response({"claims": [self.claims[i] for i in matches]} if matches else {})
+
+    async def article(self, request: web.Request) -> web.Response:
+        error = await self._prelude("publisher")
+        if error is not None:
+            return error
+        article = self.by_path.get(request.path)
+        if article is None:
+            return web.Response(status=404, text="<html><body><h1>Page not found</h1></body></html>",
+                                content_type="text/html")
+        return web.Response(text=render_article(article), content_type="text/html")
+
+    def apps(self) -> Dict[str, web.Application]:
+        news = web.Application()
+        news.router.add_get("/v2/everything", self.everything)
+        factcheck = web.Application()
+        factcheck.router.add_get("/v1alpha1/claims:search", self.claims_search)
+        publisher = web.Application()
+        publisher.router.add_get("/{tail:.*}", self.article)
+        return {"news": news, "factcheck": factcheck, "publisher": publisher}
+
+
+def api_environment(host: str, port: int) -> Dict[str, str]:
+    """Settings that point the API at stand-ins started on port, port+1, port+2."""
+    return {
+        "NEWS_PROVIDER": "newsapi",
+        "NEWS_API_KEY": "loadtest",
+        "NEWS_API_BASE_URL": f"http://{host}:{port}/v2",
+        "GOOGLE_FACTCHECK_API_KEY": "loadtest",
+        "FACTCHECK_API_BASE": f"http://{host}:{port + 1}/v1alpha1/claims:search",
+        "EXTRACT_FETCH_ORIGIN": f"http://{host}:{port + 2}",
+        # The stand-ins have no quotas; keep the API's own limits out of the way
+        "NEWSAPI_RATE_PER_S": "100000",
+        "NEWSAPI_BURST": "100000",
+        "NEWSAPI_DAILY_BUDGET": "0",
+        "FACTCHECK_RATE_PER_S": "100000",
+        "FACTCHECK_BURST": "100000",
+        "FACTCHECK_DAILY_BUDGET": "0",
+    }
+
+
+async def serve(stand_ins: StandIns, host: str, port: int) -> List[web.AppRunner]:
+    runners = []
+    for offset, app in enumerate(stand_ins.apps().values()):
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port + offset).start()
+        runners.append(runner)
+    return runners
+
+
+async def _main(args) -> None:
+    stand_ins = StandIns(Behavior.parse(args.news), Behavior.parse(args.factcheck), Behavior.parse(args.publisher))
+    await serve(stand_ins, args.host, args.port)
+    print(f"Stand-ins listening on {args.host}:{args.port}-{args.port + 2}. API environment:")
+    for key, value in api_environment(args.host, args.port).items():
+        print(f"  export {key}={value}")
+    while True:
+        await asyncio.sleep(3600)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100, help="news; fact check and publisher use port+1, port+2")
+    parser.add_argument("--news", default="120,0.5,0.01,0")
+    parser.add_argument("--factcheck", default="250,0.6,0.02,0.005")
+    parser.add_argument("--publisher", default="300,0.7,0.01,0.002")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,74 @@
+import asyncio
 import logging
 import re
-from fastapi import FastAPI, Query, HTTPException, Body
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query, HTTPException, Body, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 from typing import Optional
 from urllib.parse import urlparse
 from pydantic import BaseModel
 
 from config import settings
-from providers.newsapi import search_news
-from data.mock_results import MOCK_ARTICLES
-from schemas import ExtractResult, SummaryResult, AnalyzeResult, FactCheckResult, FactCheckRequest
-from services.extract import extract_article
+from providers.factcheck_google import breaker as factcheck_breaker, query_cache as factcheck_query_cache
+from providers.registry import news_registry
+from providers.local_index import ingest_articles, ingest_body
+from schemas import (
+    ExtractResult, SummaryResult, AnalyzeResult, FactCheckResult, FactCheckRequest,
+    FactCheckBatchRequest, FactCheckBatchResult,
+)
+from services import factcheck_service
+from services.admission import Overloaded, analyze_admission, factcheck_admission
+from services.extract import cache_stats as extraction_cache_stats, extract_article, is_cached_async as is_extraction_cached
+from services.extract_warm import extraction_warmer, warm_search_results
+from services.factcheck_warm import factcheck_warmer, run_factcheck_warming
+from services.metrics import CONTENT_TYPE, http_in_flight, http_request_seconds, metrics, stage_seconds, stats_samples
+from services.quota import quota_manager
 from services.summarize import summarize_lead3
-from services.factcheck_service import find_best_factchecks
+from services.tracing import span, start_trace, trace_exporter
+from services.factcheck_service import (
+    find_best_factchecks, find_best_factchecks_batch, run_cache_housekeeping, similar_headlines,
+)
+from services.textutil import text_util
 from utils.normalize import canonicalize_url, infer_source_from_url
 from utils.analysis_id import make_analysis_id
+from utils.lazy import lazy_modules, prewarm
 
 class SummarizeRequest(BaseModel):
     text: str
     maxSentences: Optional[int] = 3
     maxChars: Optional[int] = 600
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.prewarm_imports == "startup":
+        _log_prewarm(await asyncio.to_thread(prewarm))
+
+    # Background jobs that must stay off the request path
+    background = [asyncio.create_task(run_cache_housekeeping())]
+    if settings.prewarm_imports == "background":
+        background.append(asyncio.create_task(_prewarm_in_background()))
+    if settings.factcheck_warm_interval_s > 0:
+        background.append(asyncio.create_task(run_factcheck_warming(settings.factcheck_warm_interval_s)))
+    yield
+    for task in background:
+        task.cancel()
+
+
+def _log_prewarm(timings):
+    if timings:
+        summary = ", ".join(f"{name} {seconds * 1e3:.0f} ms" for name, seconds in timings.items())
+        logging.getLogger(__name__).info(f"Prewarmed imports: {summary}")
+
+
+async def _prewarm_in_background():
+    _log_prewarm(await asyncio.to_thread(prewarm))
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Configure logging
 logging.basicConfig(
@@ -46,6 +93,95 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def instrument_request(request: Request, call_next):
+    started = time.perf_counter()
+    trace = start_trace(f"{request.method} {request.url.path}", request.headers.get("traceparent"))
+    with http_in_flight.track():
+        response = await call_next(request)
+    # Route templates, not raw paths, to keep label cardinality bounded
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    http_request_seconds.observe(time.perf_counter() - started, request.method, route, str(response.status_code))
+
+    # Streaming responses only cover the spans finished before the body starts
+    trace.finish(**{"http.route": route, "http.status_code": response.status_code})
+    if settings.server_timing_enabled:
+        response.headers["Server-Timing"] = trace.server_timing()
+    if trace.sampled:
+        trace_exporter.export(trace)
+    return response
+
+
+def _component_stats():
+    # Components that keep their own counters, read at scrape time
+    for name, help, stats in (
+        ("factcheck_query_cache", "Fact Check API query cache", factcheck_query_cache.stats()),
+        ("factcheck_result_cache", "Final fact-check result cache", factcheck_service._cache.stats()),
+        ("extraction_cache", "Article extraction cache", extraction_cache_stats()),
+        ("admission_analyze", "Admission control for article analysis/extraction", analyze_admission.stats()),
+        ("admission_factcheck", "Admission control for fact-checks", factcheck_admission.stats()),
+        ("similar_headlines", "Canonical and near-identical headline reuse", similar_headlines.stats()),
+        ("extraction_warmer", "Background extraction of top search results", extraction_warmer.stats()),
+        ("factcheck_warmer", "Background fact-checks of trending headlines", factcheck_warmer.stats()),
+    ):
+        yield f"thebiaslens_{name}", "gauge", help, stats_samples(stats)
+
+    breaker_stats = factcheck_breaker.stats()
+    breaker_labels = {"upstream": factcheck_breaker.name}
+    breaker_samples = stats_samples(breaker_stats, breaker_labels)
+    breaker_samples.append(("", {**breaker_labels, "stat": f"state_{breaker_stats['state']}"}, 1.0))
+    yield "thebiaslens_circuit_breaker", "gauge", "Upstream circuit breakers", breaker_samples
+
+    memo_samples = []
+    for memo, memo_stats in text_util.memo_stats().items():
+        memo_samples.extend(stats_samples(memo_stats, {"memo": memo}))
+    yield "thebiaslens_textutil_memo", "gauge", "Text normalization/tokenization memo caches", memo_samples
+
+    lazy_samples = [
+        ("", {"module": name}, info["load_ms"] / 1e3)
+        for name, info in lazy_modules().items() if info["loaded"]
+    ]
+    yield "thebiaslens_lazy_import_seconds", "gauge", "Import time of lazily loaded dependencies", lazy_samples
+
+    quota_samples = []
+    for key, usage in quota_manager.snapshot().items():
+        quota_samples.extend(stats_samples(usage, {"key": key}))
+    yield "thebiaslens_quota", "gauge", "Upstream quota usage", quota_samples
+
+
+metrics.register_collector(_component_stats)
+
+
+def _json_response(model: BaseModel) -> Response:
+    # Serialize here rather than in FastAPI so the stage can be timed
+    with stage_seconds.time("serialize"):
+        content = model.model_dump_json()
+    return Response(content=content, media_type="application/json")
+
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Too many {exc.endpoint} requests in progress, retry later"},
+        headers={"Retry-After": str(exc.retry_after_s)},
+    )
+
+
+async def _extract_admitted(canonical_url: str):
+    # Cached extractions cost no fetch or parse and are never shed
+    async with analyze_admission.admit(bypass=await is_extraction_cached(canonical_url)):
+        return await extract_article(canonical_url)
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/health")
 def health_check():
     return {
@@ -55,7 +191,8 @@ def health_check():
     }
 
 @app.get("/search")
-def search(
+async def search(
+    background_tasks: BackgroundTasks,
     q: str,
     cursor: int = Query(1, ge=1),
     pageSize: int = Query(default=None)
@@ -66,16 +203,13 @@ def search(
     if pageSize is None:
         pageSize = settings.default_page_size
     
-    # Use NewsAPI if key available, otherwise mock data
-    if settings.news_api_key:
-        return search_news(q, page=cursor, page_size=pageSize)
-    else:
-        query_lower = q.lower()
-        filtered_articles = [
-            article for article in MOCK_ARTICLES
-            if query_lower in article["title"].lower() or query_lower in article["source"].lower()
-        ]
-        return {"items": filtered_articles, "nextCursor": None}
+    # Query the configured providers (falls back to the local index without keys)
+    result = await news_registry.search(q, page=cursor, page_size=pageSize)
+    ingest_articles(result["items"])
+    
+    # Pre-extract the results users are most likely to open next
+    background_tasks.add_task(warm_search_results, result["items"])
+    return result
 
 
 @app.get("/extract", response_model=ExtractResult)
@@ -89,10 +223,11 @@ async def extract(url: str = Query(..., description="URL of the article to extra
         raise HTTPException(status_code=400, detail="Invalid URL format")
     
     canonical_url = canonicalize_url(url)
-    headline, body, word_count, status, author, published_at, paywalled, canonical_from_meta = await extract_article(canonical_url)
+    headline, body, word_count, status, author, published_at, paywalled, canonical_from_meta = await _extract_admitted(canonical_url)
+    ingest_body(canonical_url, body)
     source = infer_source_from_url(canonical_url)
     
-    return ExtractResult(
+    return _json_response(ExtractResult(
         url=canonical_url,
         canonicalUrl=canonical_from_meta or canonical_url,
         headline=headline,
@@ -103,7 +238,9 @@ async def extract(url: str = Query(..., description="URL of the article to extra
         wordCount=word_count,
         extractStatus=status,
         paywalled=paywalled,
-    )
+    ))
+
+
 @app.post("/summarize", response_model=SummaryResult)
 async def summarize(request: SummarizeRequest):
     text = request.text
@@ -118,11 +255,12 @@ async def summarize(request: SummarizeRequest):
         }
         return SummaryResult(**result)
     
-    summary = summarize_lead3(
-        text=text,
-        max_sentences=request.maxSentences,
-        max_chars=request.maxChars
-    )
+    with stage_seconds.time("summarize"), span("summarize"):
+        summary = summarize_lead3(
+            text=text,
+            max_sentences=request.maxSentences,
+            max_chars=request.maxChars
+        )
     
     return SummaryResult(**summary)
 
@@ -139,7 +277,8 @@ async def analyze_url(url: str = Query(..., description="URL of the article to a
     
     canonical_url = canonicalize_url(url)
     
-    headline, body, word_count, status, author, published_at, paywalled, canonical_from_meta = await extract_article(canonical_url)
+    headline, body, word_count, status, author, published_at, paywalled, canonical_from_meta = await _extract_admitted(canonical_url)
+    ingest_body(canonical_url, body)
     source = infer_source_from_url(canonical_url)
     
     extract_result = ExtractResult(
@@ -158,7 +297,8 @@ async def analyze_url(url: str = Query(..., description="URL of the article to a
     # Create summary if body is available
     summary_result = None
     if body:
-        summary_data = summarize_lead3(body)
+        with stage_seconds.time("summarize"), span("summarize"):
+            summary_data = summarize_lead3(body)
         summary_result = SummaryResult(**summary_data)
     
     # Compute analysis id and canonical
@@ -166,13 +306,13 @@ async def analyze_url(url: str = Query(..., description="URL of the article to a
     canonical_final = extract_result.canonicalUrl or canonical_url
 
     # Return combined result
-    return AnalyzeResult(
+    return _json_response(AnalyzeResult(
         id=analysis_id,
         canonicalUrl=canonical_final,
         extract=extract_result,
         summary=summary_result,
         bias=None
-    )
+    ))
 
 
 @app.get("/analyze/id/{analysis_id}", response_model=AnalyzeResult)
@@ -196,7 +336,8 @@ async def analyze_by_id(analysis_id: str, url: Optional[str] = Query(None, descr
         raise HTTPException(status_code=400, detail="Provided url does not match analysis id")
 
     # Proceed with the same analysis flow as /analyze/url
-    headline, body, word_count, status, author, published_at, paywalled, canonical_from_meta = await extract_article(canonical_url)
+    headline, body, word_count, status, author, published_at, paywalled, canonical_from_meta = await _extract_admitted(canonical_url)
+    ingest_body(canonical_url, body)
     source = infer_source_from_url(canonical_url)
     extract_result = ExtractResult(
         url=canonical_url,
@@ -212,29 +353,76 @@ async def analyze_by_id(analysis_id: str, url: Optional[str] = Query(None, descr
     )
     summary_result = None
     if body:
-        summary_data = summarize_lead3(body)
+        with stage_seconds.time("summarize"), span("summarize"):
+            summary_data = summarize_lead3(body)
         summary_result = SummaryResult(**summary_data)
     canonical_final = extract_result.canonicalUrl or canonical_url
-    return AnalyzeResult(
+    return _json_response(AnalyzeResult(
         id=analysis_id,
         canonicalUrl=canonical_final,
         extract=extract_result,
         summary=summary_result,
         bias=None,
-    )
+    ))
 
 
-@app.post("/factcheck", response_model=FactCheckResult)
-async def factcheck(payload: FactCheckRequest):
+def _factcheck_args(payload: FactCheckRequest) -> dict:
     # Clamp maxAgeMonths to allowed values
     max_age_months = payload.maxAgeMonths or 18
     if max_age_months not in [6, 12, 18, 24, 9999]:
         max_age_months = min([6, 12, 18, 24, 9999], key=lambda x: abs(x - max_age_months))
     
-    return await find_best_factchecks(
-        headline=payload.headline,
-        source_domain=payload.sourceDomain,
-        summary=payload.summary,
-        max_items=3,
-        max_age_months=max_age_months
-    )
+    return {
+        "headline": payload.headline,
+        "source_domain": payload.sourceDomain,
+        "summary": payload.summary,
+        "max_items": 3,
+        "max_age_months": max_age_months,
+    }
+
+
+@app.post("/factcheck", response_model=FactCheckResult)
+async def factcheck(payload: FactCheckRequest):
+    args = _factcheck_args(payload)
+    cached = await factcheck_service.is_cached_async(args["headline"], args["source_domain"], args["max_age_months"])
+    async with factcheck_admission.admit(bypass=cached):
+        result = await find_best_factchecks(**args)
+    return _json_response(result)
+
+
+@app.post("/factcheck/batch")
+async def factcheck_batch(payload: FactCheckBatchRequest):
+    """
+    Fact-check many headlines at once, sharing upstream queries between them.
+    
+    Streams one FactCheckBatchResult per line (NDJSON) as each headline
+    finishes, so results arrive out of order; `index` refers to the
+    request's items.
+    """
+    if len(payload.items) > settings.factcheck_batch_max_items:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.factcheck_batch_max_items} items per batch"
+        )
+    
+    items = [_factcheck_args(item) for item in payload.items]
+    # One slot per batch (its upstream queries are bounded separately),
+    # held until the stream ends; all-cached batches are never shed
+    all_cached = True
+    for args in items:
+        if not await factcheck_service.is_cached_async(args["headline"], args["source_domain"], args["max_age_months"]):
+            all_cached = False
+            break
+    admission = await factcheck_admission.admit(bypass=all_cached).acquire()
+    
+    async def stream():
+        try:
+            async for index, result in find_best_factchecks_batch(items):
+                with stage_seconds.time("serialize"):
+                    line = FactCheckBatchResult(index=index, result=result).model_dump_json()
+                yield line + "\n"
+        finally:
+            admission.release()
+    
+    # The background task covers streams closed before their first item
+    return StreamingResponse(stream(), media_type="application/x-ndjson", background=BackgroundTask(admission.release))
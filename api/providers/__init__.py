@@ -2,5 +2,6 @@
 News providers package.
 """
 from providers.newsapi import search_news
+from providers.registry import news_registry, NewsProviderRegistry, NewsProvider, HttpNewsProvider
 
-__all__ = ["search_news"]
\ No newline at end of file
+__all__ = ["search_news", "news_registry", "NewsProviderRegistry", "NewsProvider", "HttpNewsProvider"]
\ No newline at end of file
@@ -1,12 +1,43 @@
 import asyncio
-import aiohttp
+import logging
 import re
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import quote_plus
 
 from schemas import FactCheckItem
 from config import settings
+from services.cache_backend import BackendCache, CacheBackend, MemoryBackend, shared_backend
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.metrics import cache_lookups, factcheck_query_seconds
+from services.tracing import set_attributes, span
+from services.quota import quota_manager
+from utils.lazy import lazy_import
+
+logger = logging.getLogger(__name__)
+
+aiohttp = lazy_import("aiohttp")
+
+
+class FactCheckError(Exception):
+    """Raised when the Fact Check API could not answer a query."""
+
+
+class FactCheckTimeout(FactCheckError):
+    """The request timed out."""
+
+
+class FactCheckUnavailable(FactCheckError):
+    """Connection failure, 5xx or an unreadable response."""
+
+
+class FactCheckRateLimited(FactCheckError):
+    """HTTP 429 or the local quota is spent."""
+
+
+class FactCheckCircuitOpen(FactCheckError, CircuitOpenError):
+    """Refused without calling upstream because the circuit is open."""
 
 
 # Normalize verdict labels from various fact-checking organizations
@@ -53,6 +84,121 @@ def parse_published_date(date_str: Optional[str]) -> Optional[datetime]:
         return None
 
 
+class ClaimQueryCache:
+    """
+    Raw claim results per upstream query, shared across headlines.
+
+    Different headlines about the same story often produce identical
+    queries (entity aliases, topic queries), so results are cached by
+    normalized query text rather than by headline. Entries expire after a
+    TTL; in the default per-process backend the least recently used entry
+    is evicted beyond max_entries, a shared backend applies its own bound.
+    """
+
+    def __init__(self, ttl_s: int = 3600, max_entries: int = 5000, backend: Optional[CacheBackend] = None):
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._store = BackendCache(
+            "factcheck_query",
+            backend or MemoryBackend(max_entries=max_entries),
+            to_wire=lambda items: [item.model_dump(mode="json", exclude_none=True) for item in items],
+            from_wire=lambda data: [FactCheckItem.model_validate(item) for item in data],
+        )
+
+    @property
+    def hits(self) -> int:
+        return self._store.hits
+
+    @property
+    def misses(self) -> int:
+        return self._store.misses
+
+    @staticmethod
+    def make_key(query: str, language: str, page_size: int) -> Tuple[str, str, int]:
+        return (" ".join(query.lower().split()), language.lower(), page_size)
+
+    @staticmethod
+    def _store_key(key: Tuple[str, str, int]) -> str:
+        query, language, page_size = key
+        return f"{language}:{page_size}:{query}"
+
+    def get(self, key: Tuple[str, str, int]) -> Optional[List[FactCheckItem]]:
+        items = self._store.get(self._store_key(key))
+        if items is None:
+            return None
+        # Callers annotate items (matchReason, similarity), so hand out copies
+        return [item.model_copy() for item in items]
+
+    def set(self, key: Tuple[str, str, int], items: List[FactCheckItem]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._store.set(self._store_key(key), [item.model_copy() for item in items], self.ttl_s)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Call get/set from async code without blocking on a shared backend (see BackendCache.run)."""
+        return await self._store.run(fn, *args)
+
+    def stats(self) -> Dict[str, float]:
+        return self._store.stats()
+
+
+query_cache = ClaimQueryCache(
+    ttl_s=settings.factcheck_query_cache_ttl_s,
+    max_entries=settings.factcheck_query_cache_size,
+    backend=shared_backend(),
+)
+
+# Timeouts, connection errors and 5xx count as failures; any other HTTP
+# answer (including 4xx) shows the API is up
+breaker = CircuitBreaker(
+    "factcheck",
+    failure_threshold=settings.factcheck_breaker_failure_threshold,
+    reset_timeout_s=settings.factcheck_breaker_reset_s,
+)
+
+
+def parse_claims(data: Dict) -> List[FactCheckItem]:
+    """Map a claims:search response to FactCheckItems."""
+    claims = data.get("claims", [])
+    
+    items = []
+    for claim in claims:
+        claim_text = claim.get("text", "").strip()
+        if not claim_text:
+            continue
+        
+        # Get the best review (prefer first one)
+        reviews = claim.get("claimReview", [])
+        if not reviews:
+            continue
+        
+        review = reviews[0]  # Take first/best review
+        
+        # Extract review details
+        verdict = normalize_verdict(review.get("textualRating"))
+        snippet = review.get("textualRating", "").strip() or None
+        publisher = review.get("publisher", {})
+        source = publisher.get("name", "").strip() or None
+        review_url = review.get("url", "").strip() or None
+        
+        # Extract and parse publication date from claimDate or reviewDate
+        published_at = None
+        date_str = claim.get("claimDate") or review.get("datePublished")
+        if date_str:
+            published_at = parse_published_date(date_str)
+        
+        items.append(FactCheckItem(
+            claim=claim_text,
+            verdict=verdict,
+            snippet=snippet,
+            source=source,
+            url=review_url,
+            publishedAt=published_at
+        ))
+    
+    return items
+
+
 async def fetch_claims(
     query: str,
     *,
@@ -64,6 +210,11 @@ async def fetch_claims(
     """
     Fetch fact-check claims from Google Fact Check Tools API.
     
+    Successful responses are cached per normalized query (see
+    ClaimQueryCache), so repeated queries don't hit the API or the quota.
+    Calls go through a circuit breaker: while the API is failing, queries
+    are refused immediately instead of each waiting for a timeout.
+    
     Args:
         query: Search query for claims
         api_key: Google API key
@@ -72,11 +223,43 @@ async def fetch_claims(
         timeout_s: Request timeout in seconds (default: 4)
     
     Returns:
-        List of FactCheckItem objects, empty on error
+        List of FactCheckItem objects (empty if nothing matched)
+    
+    Raises:
+        FactCheckError: the API could not answer (see the subclasses)
     """
+    # The query (built from the headline) is only exported, never put in
+    # the desc that clients see in Server-Timing
+    with span("fetch_claims", query=query[:200]):
+        return await _fetch_claims(query, api_key, language, page_size, timeout_s)
+
+
+async def _fetch_claims(query: str, api_key: str, language: str, page_size: int, timeout_s: int) -> List[FactCheckItem]:
     if not query.strip() or not api_key:
         return []
     
+    cache_key = query_cache.make_key(query, language, page_size)
+    cached_items = await query_cache.run(query_cache.get, cache_key)
+    cache_lookups.inc("factcheck_query", "hit" if cached_items is not None else "miss")
+    set_attributes(cached=cached_items is not None)
+    if cached_items is not None:
+        return cached_items
+    
+    permit = breaker.allow()
+    if not permit:
+        raise FactCheckCircuitOpen("Fact Check API circuit is open")
+    
+    try:
+        # The shared quota store may block on another worker's write
+        acquired = await asyncio.to_thread(quota_manager.try_acquire, "factcheck")
+    except BaseException:
+        breaker.release(permit)
+        raise
+    if not acquired:
+        breaker.release(permit)
+        logger.warning("Fact-check quota exhausted, skipping query")
+        raise FactCheckRateLimited("Fact-check quota exhausted")
+    
     url = settings.factcheck_api_base
     params = {
         "query": query,
@@ -85,55 +268,50 @@ async def fetch_claims(
         "key": api_key
     }
     
+    outcome_recorded = False
+    outcome = "cancelled"
+    started = time.perf_counter()
     try:
         timeout = aiohttp.ClientTimeout(total=timeout_s)
         async with aiohttp.ClientSession(timeout=timeout) as session:
             async with session.get(url, params=params) as response:
+                if response.status >= 500:
+                    breaker.record_failure(permit)
+                    outcome_recorded = True
+                    raise FactCheckUnavailable(f"Fact Check API returned HTTP {response.status}")
                 if response.status != 200:
-                    return []
+                    breaker.record_success(permit)
+                    outcome_recorded = True
+                    if response.status == 429:
+                        await asyncio.to_thread(quota_manager.exhaust, "factcheck")
+                        raise FactCheckRateLimited("Fact Check API rate limit reached")
+                    raise FactCheckError(f"Fact Check API returned HTTP {response.status}")
                 
                 data = await response.json()
-                claims = data.get("claims", [])
-                
-                items = []
-                for claim in claims:
-                    claim_text = claim.get("text", "").strip()
-                    if not claim_text:
-                        continue
-                    
-                    # Get the best review (prefer first one)
-                    reviews = claim.get("claimReview", [])
-                    if not reviews:
-                        continue
-                    
-                    review = reviews[0]  # Take first/best review
-                    
-                    # Extract review details
-                    verdict = normalize_verdict(review.get("textualRating"))
-                    snippet = review.get("textualRating", "").strip() or None
-                    publisher = review.get("publisher", {})
-                    source = publisher.get("name", "").strip() or None
-                    review_url = review.get("url", "").strip() or None
-                    
-                    # Extract and parse publication date from claimDate or reviewDate
-                    published_at = None
-                    date_str = claim.get("claimDate") or review.get("datePublished")
-                    if date_str:
-                        published_at = parse_published_date(date_str)
-                    
-                    items.append(FactCheckItem(
-                        claim=claim_text,
-                        verdict=verdict,
-                        snippet=snippet,
-                        source=source,
-                        url=review_url,
-                        publishedAt=published_at
-                    ))
-                
+                items = parse_claims(data)
+                breaker.record_success(permit)
+                outcome_recorded = True
+                outcome = "ok"
+                await query_cache.run(query_cache.set, cache_key, items)
                 return items
                 
+    except FactCheckError as e:
+        outcome = "rate_limited" if isinstance(e, FactCheckRateLimited) else (
+            "unavailable" if isinstance(e, FactCheckUnavailable) else "error"
+        )
+        raise
     except asyncio.TimeoutError:
-        return []
-    except Exception:
-        # Log error in production, return empty for now
-        return []
\ No newline at end of file
+        breaker.record_failure(permit)
+        outcome_recorded = True
+        outcome = "timeout"
+        raise FactCheckTimeout(f"Fact Check API timed out after {timeout_s}s")
+    except (aiohttp.ClientError, ValueError, AttributeError) as e:
+        breaker.record_failure(permit)
+        outcome_recorded = True
+        outcome = "unavailable"
+        raise FactCheckUnavailable(f"Fact Check API request failed: {str(e)}")
+    finally:
+        factcheck_query_seconds.observe(time.perf_counter() - started, outcome)
+        if not outcome_recorded:
+            # Cancelled or otherwise abandoned before an answer
+            breaker.release(permit)
@@ -0,0 +1,304 @@
+import heapq
+import json
+import logging
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import settings
+from schemas import FactCheckItem
+from services.textutil import text_util
+from .factcheck_google import normalize_verdict, parse_claims, parse_published_date
+
+logger = logging.getLogger(__name__)
+
+# BM25 length normalisation (claims are short, term frequency is ignored)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Postings scanned per query, rarest terms first; terms that no longer fit
+# in the budget only add to the score of candidates already found
+MAX_POSTINGS_SCAN = 1_000
+
+# Removed claims are compacted away once they outnumber the live ones
+# (and there are at least this many)
+MIN_COMPACT_REMOVED = 1_024
+
+# (claim, verdict, snippet, source, url, publishedAt)
+ClaimRecord = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[object], Optional[datetime]]
+
+
+class ClaimReviewIndex:
+    """
+    In-memory inverted index over fact-checked claims.
+
+    Each claim is stored once as a compact tuple; postings are append-only
+    arrays of ascending claim ids, so a query scans the posting lists of its
+    rarest terms (up to a fixed budget) and checks the remaining terms by
+    binary search instead of walking them. Lookup cost is bounded by that
+    budget, not by the size of the corpus. Claims are keyed like fact-check results
+    (lowercased claim text + review URL); re-adding a claim replaces its
+    record.
+
+    Claims added with a TTL (ingested API results) expire like the query
+    cache entries they came from, and at most max_ingested of them are
+    kept, oldest dropped first; corpus claims (no TTL) stay. Removed claims
+    are skipped by searches and compacted out of the postings in bulk.
+    """
+
+    def __init__(self, max_postings_scan: int = MAX_POSTINGS_SCAN, max_ingested: int = 0):
+        self.max_postings_scan = max_postings_scan
+        self.max_ingested = max_ingested
+        self._lock = threading.RLock()
+        self._records: List[Optional[ClaimRecord]] = []
+        self._doc_len = array("H")
+        # Monotonic expiry time per claim, 0 for claims that never expire
+        self._expires = array("d")
+        self._key_to_id: Dict[Tuple[str, str], int] = {}
+        self._postings: Dict[str, array] = {}
+        self._total_len = 0
+        self._ingested = 0
+        self._removed = 0
+        # Lowest id that may still hold a live ingested claim
+        self._oldest = 0
+
+    def __len__(self) -> int:
+        return len(self._records) - self._removed
+
+    @staticmethod
+    def _analyze(text: str) -> Sequence[str]:
+        return text_util.tokenize(text, min_length=2)
+
+    def add(self, item: FactCheckItem, ttl_s: Optional[float] = None) -> None:
+        claim = (item.claim or "").strip()
+        if not claim:
+            return
+        key = (claim.lower(), str(item.url) if item.url else "")
+        record = (claim, item.verdict, item.snippet, item.source, item.url, item.publishedAt)
+        now = time.monotonic()
+        expires = now + ttl_s if ttl_s else 0.0
+
+        with self._lock:
+            doc_id = self._key_to_id.get(key)
+            if doc_id is not None:
+                # Same lowercased text, so the postings don't change; an
+                # ingested claim gets a fresh TTL, a corpus claim keeps none
+                self._records[doc_id] = record
+                if self._expires[doc_id]:
+                    self._expires[doc_id] = expires
+                    if not expires:
+                        self._ingested -= 1
+                return
+
+            terms = set(self._analyze(claim))
+            doc_id = len(self._records)
+            self._records.append(record)
+            self._doc_len.append(min(len(terms), 0xFFFF))
+            self._expires.append(expires)
+            self._key_to_id[key] = doc_id
+            self._total_len += len(terms)
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = array("I")
+                    self._postings[term] = postings
+                postings.append(doc_id)
+            if expires:
+                self._ingested += 1
+                self._evict(now)
+
+    def add_many(self, items: Iterable[FactCheckItem], ttl_s: Optional[float] = None) -> int:
+        count = 0
+        for item in items:
+            self.add(item, ttl_s=ttl_s)
+            count += 1
+        return count
+
+    def _evict(self, now: float) -> None:
+        """Drop expired ingested claims and the oldest ones beyond max_ingested."""
+        records, expires = self._records, self._expires
+        while self._oldest < len(records):
+            doc_id = self._oldest
+            if records[doc_id] is not None and expires[doc_id]:
+                over = self.max_ingested and self._ingested > self.max_ingested
+                if not over and expires[doc_id] > now:
+                    break
+                self._remove(doc_id)
+            self._oldest += 1
+        if self._removed >= MIN_COMPACT_REMOVED and self._removed > len(self):
+            self._compact()
+
+    def _remove(self, doc_id: int) -> None:
+        claim, _, _, _, url, _ = self._records[doc_id]
+        self._key_to_id.pop((claim.lower(), str(url) if url else ""), None)
+        self._records[doc_id] = None
+        self._total_len -= self._doc_len[doc_id]
+        if self._expires[doc_id]:
+            self._ingested -= 1
+        self._removed += 1
+
+    def _compact(self) -> None:
+        """Renumber live claims densely; ids keep their order, so postings stay sorted."""
+        remap: Dict[int, int] = {}
+        records: List[Optional[ClaimRecord]] = []
+        doc_len, expires = array("H"), array("d")
+        for doc_id, record in enumerate(self._records):
+            if record is not None:
+                remap[doc_id] = len(records)
+                records.append(record)
+                doc_len.append(self._doc_len[doc_id])
+                expires.append(self._expires[doc_id])
+        postings: Dict[str, array] = {}
+        for term, ids in self._postings.items():
+            kept = array("I", (remap[doc_id] for doc_id in ids if doc_id in remap))
+            if kept:
+                postings[term] = kept
+        self._records, self._doc_len, self._expires, self._postings = records, doc_len, expires, postings
+        self._key_to_id = {key: remap[doc_id] for key, doc_id in self._key_to_id.items()}
+        self._removed = 0
+        self._oldest = 0
+
+    def search(self, query: str, limit: int = 5) -> List[FactCheckItem]:
+        """Return up to `limit` claims ranked by BM25 over the query terms."""
+        terms = set(self._analyze(query))
+        now = time.monotonic()
+        with self._lock:
+            n_docs = len(self)
+            if not terms or not n_docs:
+                return []
+
+            matched = sorted(
+                ((term, self._postings[term]) for term in terms if term in self._postings),
+                key=lambda x: len(x[1]),
+            )
+            if not matched:
+                return []
+
+            avg_len = self._total_len / n_docs
+            doc_len = self._doc_len
+            records, expires = self._records, self._expires
+            scores: Dict[int, float] = {}
+
+            budget = self.max_postings_scan
+            for rank, (term, postings) in enumerate(matched):
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                if df <= budget or rank == 0:
+                    # The rarest term always seeds candidates; if even it is
+                    # too common, only its most recently added claims are used
+                    seeds = postings if df <= budget else postings[-budget:]
+                    budget -= len(seeds)
+                    for doc_id in seeds:
+                        scores[doc_id] = scores.get(doc_id, 0.0) + idf
+                else:
+                    for doc_id in scores:
+                        i = bisect_left(postings, doc_id)
+                        if i < df and postings[i] == doc_id:
+                            scores[doc_id] += idf
+
+            def bm25(entry: Tuple[int, float]) -> Tuple[float, int]:
+                doc_id, idf_sum = entry
+                norm = 1 - BM25_B + BM25_B * doc_len[doc_id] / avg_len if avg_len else 1.0
+                return (idf_sum * (BM25_K1 + 1) / (1 + BM25_K1 * norm), doc_id)
+
+            live = (
+                (doc_id, score) for doc_id, score in scores.items()
+                if records[doc_id] is not None and not (expires[doc_id] and expires[doc_id] <= now)
+            )
+            top = heapq.nlargest(limit, live, key=bm25)
+            return [_to_item(records[doc_id]) for doc_id, _ in top]
+
+
+def _to_item(record: ClaimRecord) -> FactCheckItem:
+    claim, verdict, snippet, source, url, published_at = record
+    # Fields were validated when the claim was ingested
+    return FactCheckItem.model_construct(
+        claim=claim, verdict=verdict, snippet=snippet, source=source, url=url,
+        publishedAt=published_at, matchReason=None, similarity=None,
+    )
+
+
+def parse_claim_record(record: Dict) -> List[FactCheckItem]:
+    """
+    Map one corpus record to FactCheckItems.
+
+    Accepts claims:search responses ({"claims": [...]}) and single claims
+    from them, schema.org ClaimReview objects, and FactCheckItem dicts.
+    """
+    if "claims" in record:
+        return parse_claims(record)
+    if "claimReview" in record:
+        return parse_claims({"claims": [record]})
+    if "claimReviewed" in record:
+        claim_text = (record.get("claimReviewed") or "").strip()
+        if not claim_text:
+            return []
+        rating = record.get("reviewRating") or {}
+        textual = (rating.get("alternateName") or rating.get("name") or "").strip()
+        author = record.get("author") or {}
+        if isinstance(author, list):
+            author = author[0] if author else {}
+        item_reviewed = record.get("itemReviewed") or {}
+        return [FactCheckItem(
+            claim=claim_text,
+            verdict=normalize_verdict(textual),
+            snippet=textual or None,
+            source=(author.get("name") or "").strip() or None,
+            url=(record.get("url") or "").strip() or None,
+            publishedAt=parse_published_date(item_reviewed.get("datePublished") or record.get("datePublished")),
+        )]
+    if "claim" in record:
+        return [FactCheckItem(**{k: v for k, v in record.items() if k in FactCheckItem.model_fields})]
+    return []
+
+
+def load_corpus(path: str) -> List[FactCheckItem]:
+    """Load ClaimReview records from a JSON document or a JSON Lines file."""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read().strip()
+    if not content:
+        return []
+    if content.startswith("["):
+        records = json.loads(content)
+    else:
+        try:
+            records = [json.loads(content)]
+        except ValueError:
+            records = [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    items: List[FactCheckItem] = []
+    for record in records:
+        try:
+            items.extend(parse_claim_record(record))
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Skipping malformed ClaimReview record: {str(e)}")
+    return items
+
+
+def _build_default_index() -> ClaimReviewIndex:
+    index = ClaimReviewIndex(max_ingested=settings.factcheck_local_ingest_max_claims)
+    if settings.factcheck_local_corpus_path:
+        try:
+            count = index.add_many(load_corpus(settings.factcheck_local_corpus_path))
+            logger.info(f"Loaded {count} fact-checked claims into the local store")
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load local fact-check corpus: {str(e)}")
+    return index
+
+
+# Shared store queried before the Google Fact Check API
+claim_index = _build_default_index()
+
+
+def ingest_factchecks(items: Iterable[FactCheckItem]) -> None:
+    """Add claims returned by the Fact Check API to the local store, for as long as the query cache keeps them."""
+    if settings.factcheck_local_ingest:
+        claim_index.add_many(items, ttl_s=settings.factcheck_query_cache_ttl_s)
+
+
+def search_local_claims(query: str, limit: int = 5) -> List[FactCheckItem]:
+    return claim_index.search(query, limit=limit)
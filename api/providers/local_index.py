@@ -0,0 +1,326 @@
+import heapq
+import json
+import logging
+import math
+import threading
+from bisect import bisect_left
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from config import settings
+from data.mock_results import MOCK_ARTICLES
+from services.textutil import text_util
+from utils.normalize import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters (standard Okapi defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Title/source terms count more than body terms
+TITLE_WEIGHT = 3
+BODY_WEIGHT = 1
+
+# Upper bound on how many vocabulary terms a single prefix may expand to
+MAX_PREFIX_EXPANSIONS = 50
+
+# Postings scanned per query, rarest terms first; terms that no longer fit
+# in the budget only add to the score of candidates already found
+MAX_POSTINGS_SCAN = 5_000
+
+
+class ArticleIndex:
+    """
+    In-memory inverted index over articles with BM25 ranking.
+
+    Postings are stored per term as {doc_id: weighted term frequency}, so a
+    query only touches the documents that contain its terms. The sorted
+    vocabulary supports prefix expansion of the last query term
+    (search-as-you-type); new terms are appended and the vocabulary is
+    re-sorted once, on the next prefix lookup. Articles can be added at any
+    time; re-adding an article with the same canonical URL replaces the
+    previous version. With max_docs the oldest articles are evicted once the
+    index is full.
+
+    A query scans postings rarest term first up to max_postings_scan; a term
+    too common to fit only adds to the score of articles already found (the
+    rarest term always seeds, from its most recently added articles), so
+    search cost is bounded and the total is a lower bound for broad queries.
+    """
+
+    def __init__(self, max_docs: int = 0, max_postings_scan: int = MAX_POSTINGS_SCAN):
+        self.max_docs = max_docs
+        self.max_postings_scan = max_postings_scan
+        self._lock = threading.RLock()
+        self._docs: List[Optional[Dict]] = []
+        self._doc_terms: List[Optional[Dict[str, int]]] = []
+        self._doc_len: List[int] = []
+        self._url_to_id: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._vocab: List[str] = []
+        self._vocab_sorted = True
+        # Emptied terms still in _vocab, dropped on the next re-sort
+        self._vocab_removed: Set[str] = set()
+        self._total_len = 0
+        self._live_docs = 0
+        # Lowest doc id that may still be live (eviction order)
+        self._oldest = 0
+
+    def __len__(self) -> int:
+        return self._live_docs
+
+    def _analyze(self, text: Optional[str]) -> Sequence[str]:
+        return text_util.tokenize(text or "", min_length=2)
+
+    def _weighted_terms(self, article: Dict, body: Optional[str]) -> Dict[str, int]:
+        terms: Dict[str, int] = {}
+        title_text = f"{article.get('title') or ''} {article.get('source') or ''}"
+        for token in self._analyze(title_text):
+            terms[token] = terms.get(token, 0) + TITLE_WEIGHT
+        for token in self._analyze(body):
+            terms[token] = terms.get(token, 0) + BODY_WEIGHT
+        return terms
+
+    def add(self, article: Dict, body: Optional[str] = None) -> None:
+        """Index a single article dict (url, source, publishedAt, title)."""
+        url = article.get("url")
+        if not url:
+            return
+        canonical = canonicalize_url(url)
+
+        with self._lock:
+            existing_id = self._url_to_id.get(canonical)
+            if existing_id is not None:
+                # Keep an already indexed body if the update doesn't carry one
+                if body is None and self._docs[existing_id] is not None:
+                    existing = self._docs[existing_id]
+                    if existing.get("_has_body") or all(existing.get(k) == v for k, v in article.items()):
+                        return
+                self._remove(existing_id)
+
+            doc = {k: v for k, v in article.items() if not k.startswith("_")}
+            doc["_has_body"] = bool(body)
+            terms = self._weighted_terms(article, body)
+            doc_len = sum(terms.values())
+
+            doc_id = len(self._docs)
+            self._docs.append(doc)
+            self._doc_terms.append(terms)
+            self._doc_len.append(doc_len)
+            self._url_to_id[canonical] = doc_id
+            self._total_len += doc_len
+            self._live_docs += 1
+
+            for term, tf in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = {}
+                    self._postings[term] = postings
+                    if term in self._vocab_removed:
+                        self._vocab_removed.discard(term)
+                    else:
+                        self._vocab.append(term)
+                        self._vocab_sorted = False
+                postings[doc_id] = tf
+
+            if self.max_docs:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop the oldest articles beyond max_docs, compacting ids once half are holes."""
+        while self._live_docs > self.max_docs and self._oldest < len(self._docs):
+            if self._docs[self._oldest] is not None:
+                self._remove(self._oldest)
+            self._oldest += 1
+        if len(self._docs) > 2 * self._live_docs + 1024:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Renumber live articles densely; ids stay in insertion order."""
+        remap: Dict[int, int] = {}
+        docs, doc_terms, doc_len = [], [], []
+        for doc_id, doc in enumerate(self._docs):
+            if doc is not None:
+                remap[doc_id] = len(docs)
+                docs.append(doc)
+                doc_terms.append(self._doc_terms[doc_id])
+                doc_len.append(self._doc_len[doc_id])
+        self._docs, self._doc_terms, self._doc_len = docs, doc_terms, doc_len
+        self._url_to_id = {url: remap[doc_id] for url, doc_id in self._url_to_id.items()}
+        self._postings = {
+            term: {remap[doc_id]: tf for doc_id, tf in postings.items()}
+            for term, postings in self._postings.items()
+        }
+        self._oldest = 0
+
+    def add_many(self, articles: Iterable[Dict]) -> None:
+        for article in articles:
+            self.add(article)
+
+    def update_body(self, url: str, body: Optional[str]) -> None:
+        """Re-index an already known article once its body has been extracted."""
+        if not body:
+            return
+        canonical = canonicalize_url(url)
+        with self._lock:
+            doc_id = self._url_to_id.get(canonical)
+            if doc_id is None or self._docs[doc_id] is None:
+                return
+            if self._docs[doc_id].get("_has_body"):
+                return
+            article = dict(self._docs[doc_id])
+        self.add(article, body=body)
+
+    def _remove(self, doc_id: int) -> None:
+        terms = self._doc_terms[doc_id]
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                self._vocab_removed.add(term)
+        self._url_to_id.pop(canonicalize_url(self._docs[doc_id]["url"]), None)
+        self._total_len -= self._doc_len[doc_id]
+        self._live_docs -= 1
+        self._docs[doc_id] = None
+        self._doc_terms[doc_id] = None
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if not self._vocab_sorted or self._vocab_removed:
+            if self._vocab_removed:
+                self._vocab = [t for t in self._vocab if t not in self._vocab_removed]
+                self._vocab_removed.clear()
+            # Mostly sorted already, so this is close to linear
+            self._vocab.sort()
+            self._vocab_sorted = True
+        start = bisect_left(self._vocab, prefix)
+        expansions = []
+        for i in range(start, min(start + MAX_PREFIX_EXPANSIONS, len(self._vocab))):
+            term = self._vocab[i]
+            if not term.startswith(prefix):
+                break
+            expansions.append(term)
+        return expansions
+
+    def _query_terms(self, q: str) -> List[Tuple[str, float]]:
+        """Map query text to (index term, weight) pairs."""
+        tokens = self._analyze(q)
+        if not tokens:
+            return []
+
+        weighted: Dict[str, float] = {}
+        for token in tokens[:-1]:
+            if token in self._postings:
+                weighted[token] = max(weighted.get(token, 0.0), 1.0)
+
+        # The last token may still be being typed: expand it as a prefix,
+        # exact matches keep full weight and completions get a slight discount
+        last = tokens[-1]
+        for term in self._expand_prefix(last):
+            weight = 1.0 if term == last else 0.8
+            weighted[term] = max(weighted.get(term, 0.0), weight)
+
+        return list(weighted.items())
+
+    def search(self, q: str, offset: int = 0, limit: int = 10) -> Tuple[List[Dict], int]:
+        """
+        Rank articles for a query with BM25.
+
+        Returns the requested page of article dicts and the total number of
+        matching articles.
+        """
+        with self._lock:
+            query_terms = self._query_terms(q)
+            if not query_terms or not self._live_docs:
+                return [], 0
+
+            n_docs = self._live_docs
+            avg_len = self._total_len / n_docs if n_docs else 0.0
+            doc_len = self._doc_len
+            scores: Dict[int, float] = {}
+
+            def contribution(doc_id: int, tf: int, weight: float, idf: float) -> float:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[doc_id] / avg_len)
+                return weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+            matched = sorted(
+                ((self._postings[term], weight) for term, weight in query_terms),
+                key=lambda x: len(x[0]),
+            )
+            budget = self.max_postings_scan
+            for rank, (postings, weight) in enumerate(matched):
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                if df <= budget or rank == 0:
+                    # Postings are in insertion order, so the tail holds the
+                    # most recently indexed articles
+                    seeds = postings.items() if df <= budget else islice(reversed(postings.items()), budget)
+                    budget -= min(df, budget)
+                    for doc_id, tf in seeds:
+                        scores[doc_id] = scores.get(doc_id, 0.0) + contribution(doc_id, tf, weight, idf)
+                else:
+                    for doc_id in scores:
+                        tf = postings.get(doc_id)
+                        if tf:
+                            scores[doc_id] += contribution(doc_id, tf, weight, idf)
+
+            # Ties favour the most recently indexed article
+            top = heapq.nlargest(offset + limit, scores.items(), key=lambda x: (x[1], x[0]))
+            page = []
+            for doc_id, _ in top[offset:offset + limit]:
+                doc = self._docs[doc_id]
+                page.append({k: v for k, v in doc.items() if not k.startswith("_")})
+            return page, len(scores)
+
+
+def _load_corpus(path: str) -> List[Dict]:
+    """Load articles from a JSON array or JSON Lines file."""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read().strip()
+    if not content:
+        return []
+    if content.startswith("["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def _build_default_index() -> ArticleIndex:
+    index = ArticleIndex(max_docs=settings.local_search_max_docs)
+    index.add_many(MOCK_ARTICLES)
+    if settings.local_search_corpus_path:
+        try:
+            index.add_many(_load_corpus(settings.local_search_corpus_path))
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load local search corpus: {str(e)}")
+    return index
+
+
+# Shared index used by /search when no external provider is configured
+local_index = _build_default_index()
+
+
+def ingest_articles(articles: Iterable[Dict]) -> None:
+    """Add articles (e.g. results returned by an external provider) to the local index."""
+    if settings.local_search_ingest:
+        local_index.add_many(articles)
+
+
+def ingest_body(url: str, body: Optional[str]) -> None:
+    """Attach an extracted article body to an already indexed article."""
+    if settings.local_search_ingest:
+        local_index.update_body(url, body)
+
+
+def search_local(q: str, page: int, page_size: int) -> Dict:
+    offset = (page - 1) * page_size
+    items, total = local_index.search(q, offset=offset, limit=page_size)
+    has_more = offset + len(items) < total
+    return {
+        "items": items,
+        "nextCursor": page + 1 if has_more else None
+    }
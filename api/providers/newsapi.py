@@ -1,8 +1,11 @@
-import requests
 from typing import Dict, List, Optional
 from fastapi import HTTPException
 
 from config import settings
+from services.quota import quota_manager
+from utils.lazy import lazy_import
+
+requests = lazy_import("requests")
 
 
 def search_news(q: str, page: int, page_size: int) -> Dict:
@@ -12,6 +15,13 @@ def search_news(q: str, page: int, page_size: int) -> Dict:
             detail="NEWS_API_KEY not configured"
         )
     
+    if not quota_manager.try_acquire("newsapi"):
+        raise HTTPException(
+            status_code=503,
+            detail="News provider quota exhausted",
+            headers={"Retry-After": str(quota_manager.retry_after_s("newsapi"))},
+        )
+    
     # Prepare request parameters
     params = {
         "q": q,
@@ -32,6 +42,13 @@ def search_news(q: str, page: int, page_size: int) -> Dict:
         
         # Handle HTTP errors
         if response.status_code != 200:
+            if response.status_code == 429:
+                quota_manager.exhaust("newsapi")
+                raise HTTPException(
+                    status_code=503,
+                    detail="News provider quota exhausted",
+                    headers={"Retry-After": str(quota_manager.retry_after_s("newsapi"))},
+                )
             if response.status_code >= 500:
                 raise HTTPException(
                     status_code=502,
@@ -45,7 +62,15 @@ def search_news(q: str, page: int, page_size: int) -> Dict:
         
         # Handle API-level errors
         if data.get("status") != "ok":
-            if data.get("code") in ["rateLimited", "maximumResultsReached"]:
+            if data.get("code") == "rateLimited":
+                # Upstream says we're out: stop spending calls for the rest of the day
+                quota_manager.exhaust("newsapi")
+                raise HTTPException(
+                    status_code=503,
+                    detail="News provider quota exhausted",
+                    headers={"Retry-After": str(quota_manager.retry_after_s("newsapi"))},
+                )
+            if data.get("code") == "maximumResultsReached":
                 return {"items": [], "nextCursor": None}
             else:
                 raise HTTPException(
@@ -53,31 +78,10 @@ def search_news(q: str, page: int, page_size: int) -> Dict:
                     detail="News provider returned an error"
                 )
         
-        # Extract articles
-        articles = data.get("articles", [])
-        total_results = data.get("totalResults", 0)
-        
-        # Map articles to our format
-        items = []
-        for article in articles:
-            items.append({
-                "url": article.get("url", ""),
-                "source": article.get("source", {}).get("name") or "Unknown",
-                "publishedAt": article.get("publishedAt", ""),
-                "title": article.get("title") or ""
-            })
-        
-        # Determine if there are more pages
-        # NewsAPI uses 1-based pagination
-        current_page_items = len(items)
-        has_more = (page * page_size) < total_results and current_page_items == page_size
-        next_cursor = page + 1 if has_more else None
-        
-        return {
-            "items": items,
-            "nextCursor": next_cursor
-        }
+        return parse_everything_response(data, page, page_size)
         
+    except HTTPException:
+        raise
     except requests.exceptions.RequestException:
         # Network or connection errors
         raise HTTPException(
@@ -86,4 +90,32 @@ def search_news(q: str, page: int, page_size: int) -> Dict:
         )
     except Exception:
         # Any other unexpected errors
-        return {"items": [], "nextCursor": None}
\ No newline at end of file
+        return {"items": [], "nextCursor": None}
+
+
+def parse_everything_response(data: Dict, page: int, page_size: int) -> Dict:
+    """Map a NewsAPI-style /everything payload to our search response shape."""
+    # Extract articles
+    articles = data.get("articles", [])
+    total_results = data.get("totalResults", 0)
+    
+    # Map articles to our format
+    items = []
+    for article in articles:
+        items.append({
+            "url": article.get("url", ""),
+            "source": article.get("source", {}).get("name") or "Unknown",
+            "publishedAt": article.get("publishedAt", ""),
+            "title": article.get("title") or ""
+        })
+    
+    # Determine if there are more pages
+    # NewsAPI uses 1-based pagination
+    current_page_items = len(items)
+    has_more = (page * page_size) < total_results and current_page_items == page_size
+    next_cursor = page + 1 if has_more else None
+    
+    return {
+        "items": items,
+        "nextCursor": next_cursor
+    }
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from config import settings
+from providers.local_index import search_local
+from providers.newsapi import search_news, parse_everything_response
+from utils.lazy import lazy_import
+from utils.normalize import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+httpx = lazy_import("httpx")
+
+
+# Retry-After for a rate-limited upstream that did not say when to come back
+DEFAULT_RETRY_AFTER_S = 60
+
+
+class ProviderError(Exception):
+    """
+    Raised by a news provider when it cannot produce results.
+
+    retry_after_s is set when the provider is out of quota or rate limited,
+    i.e. when retrying later (rather than elsewhere) will help.
+    """
+
+    def __init__(self, message: str, retry_after_s: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+def _retry_after(value: Optional[str]) -> int:
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER_S
+
+
+class NewsProvider:
+    """Common interface for news search providers."""
+
+    name = "base"
+
+    async def search(self, q: str, page: int, page_size: int) -> Dict:
+        raise NotImplementedError
+
+
+class NewsApiProvider(NewsProvider):
+    """NewsAPI via the existing blocking client, run in a worker thread."""
+
+    name = "newsapi"
+
+    async def search(self, q: str, page: int, page_size: int) -> Dict:
+        try:
+            return await asyncio.to_thread(search_news, q, page, page_size)
+        except HTTPException as e:
+            retry_after = _retry_after((e.headers or {}).get("Retry-After")) if e.status_code == 503 else None
+            raise ProviderError(e.detail, retry_after_s=retry_after)
+
+
+class LocalIndexProvider(NewsProvider):
+    """The in-process BM25 index (providers.local_index)."""
+
+    name = "local"
+
+    async def search(self, q: str, page: int, page_size: int) -> Dict:
+        # Scoring holds the index lock; keep it off the event loop
+        return await asyncio.to_thread(search_local, q, page=page, page_size=page_size)
+
+
+class HttpNewsProvider(NewsProvider):
+    """Any HTTP endpoint that speaks the NewsAPI /everything format."""
+
+    def __init__(self, name: str, base_url: str, api_key: Optional[str] = None, timeout_s: float = 10.0):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout_s = timeout_s
+
+    async def search(self, q: str, page: int, page_size: int) -> Dict:
+        params = {
+            "q": q,
+            "page": page,
+            "pageSize": page_size,
+            "sortBy": "publishedAt",
+            "language": "en",
+        }
+        if self.api_key:
+            params["apiKey"] = self.api_key
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout_s) as client:
+                response = await client.get(f"{self.base_url}/everything", params=params)
+        except httpx.HTTPError as e:
+            raise ProviderError(f"{self.name} unavailable: {str(e)}")
+
+        if response.status_code == 429:
+            raise ProviderError(f"{self.name} rate limited",
+                                retry_after_s=_retry_after(response.headers.get("Retry-After")))
+        if response.status_code != 200:
+            raise ProviderError(f"{self.name} returned HTTP {response.status_code}")
+        data = response.json()
+        if data.get("code") == "rateLimited":
+            raise ProviderError(f"{self.name} rate limited", retry_after_s=DEFAULT_RETRY_AFTER_S)
+        if data.get("status", "ok") != "ok":
+            raise ProviderError(f"{self.name} returned {data.get('code') or 'an error'}")
+        return parse_everything_response(data, page, page_size)
+
+
+def merge_results(results: List[Dict], page_size: int) -> Dict:
+    """Merge provider results in priority order, deduplicated by canonical URL."""
+    seen = set()
+    items = []
+    next_cursor = None
+    for result in results:
+        for item in result.get("items", []):
+            url = item.get("url")
+            if not url:
+                continue
+            key = canonicalize_url(url)
+            if key in seen:
+                continue
+            seen.add(key)
+            items.append(item)
+        if next_cursor is None:
+            next_cursor = result.get("nextCursor")
+    return {"items": items[:page_size], "nextCursor": next_cursor}
+
+
+class NewsProviderRegistry:
+    """
+    Queries several news providers for one search and merges their results.
+
+    Providers are tried in priority order. The next provider is started when
+    the previous one fails or after `hedge_after_ms` without an answer
+    (0 queries all of them at once). After the first successful answer,
+    slower providers get `merge_grace_ms` to contribute; whatever has not
+    answered by then, or by the overall `deadline_ms`, is cancelled. A slow
+    upstream therefore costs coverage, not latency. If every provider is
+    out of quota the search fails with 503 and the earliest Retry-After.
+    """
+
+    def __init__(
+        self,
+        providers: Optional[List[NewsProvider]] = None,
+        hedge_after_ms: int = 300,
+        merge_grace_ms: int = 100,
+        deadline_ms: int = 3000,
+    ):
+        self.providers: List[NewsProvider] = list(providers or [])
+        self.hedge_after_ms = hedge_after_ms
+        self.merge_grace_ms = merge_grace_ms
+        self.deadline_ms = deadline_ms
+
+    def register(self, provider: NewsProvider) -> None:
+        self.providers.append(provider)
+
+    async def search(self, q: str, page: int, page_size: int) -> Dict:
+        if not self.providers:
+            return {"items": [], "nextCursor": None}
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + self.deadline_ms / 1000
+        tasks: Dict[asyncio.Task, int] = {}
+        results: Dict[int, Dict] = {}
+        errors: List[BaseException] = []
+        next_index = 0
+        next_launch_at = start
+        first_success_at: Optional[float] = None
+
+        def launch() -> None:
+            nonlocal next_index, next_launch_at
+            provider = self.providers[next_index]
+            tasks[asyncio.create_task(provider.search(q, page, page_size))] = next_index
+            next_index += 1
+            next_launch_at = loop.time() + self.hedge_after_ms / 1000
+
+        try:
+            while True:
+                # Hedge: start the next provider once the previous one is overdue
+                while (next_index < len(self.providers) and first_success_at is None
+                       and loop.time() >= next_launch_at):
+                    launch()
+                now = loop.time()
+
+                pending = [t for t in tasks if not t.done()]
+                if not pending and (next_index >= len(self.providers) or first_success_at is not None):
+                    break
+
+                wake_at = deadline
+                if first_success_at is not None:
+                    wake_at = min(wake_at, first_success_at + self.merge_grace_ms / 1000)
+                elif next_index < len(self.providers):
+                    wake_at = min(wake_at, next_launch_at)
+                if now >= wake_at and (first_success_at is not None or now >= deadline):
+                    break
+
+                if pending:
+                    done, _ = await asyncio.wait(pending, timeout=max(0.0, wake_at - now),
+                                                 return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    done = set()
+                    await asyncio.sleep(max(0.0, wake_at - now))
+
+                for task in done:
+                    index = tasks[task]
+                    name = self.providers[index].name
+                    if task.exception() is None:
+                        results[index] = task.result()
+                        if first_success_at is None:
+                            first_success_at = loop.time()
+                    else:
+                        errors.append(task.exception())
+                        logger.warning(f"News provider {name} failed: {task.exception()}")
+                        # Fall back immediately instead of waiting for the hedge delay
+                        next_launch_at = loop.time()
+        finally:
+            for task, index in tasks.items():
+                if not task.done():
+                    logger.info(f"News provider {self.providers[index].name} too slow, dropped")
+                    task.cancel()
+                elif index not in results and not task.cancelled():
+                    task.exception()  # mark retrieved
+
+        if not results:
+            retry_after = [getattr(e, "retry_after_s", None) for e in errors]
+            if errors and len(errors) == len(tasks) and None not in retry_after:
+                # Every provider is out of quota: tell the client when to come back
+                raise HTTPException(status_code=503, detail="News provider quota exhausted",
+                                    headers={"Retry-After": str(min(retry_after))})
+            if errors:
+                raise HTTPException(status_code=502, detail="News provider is currently unavailable")
+            raise HTTPException(status_code=504, detail="News providers timed out")
+
+        ordered = [results[i] for i in sorted(results)]
+        elapsed_ms = (loop.time() - start) * 1000
+        logger.info(f"Search merged {len(ordered)}/{len(tasks)} providers in {elapsed_ms:.0f}ms")
+        return merge_results(ordered, page_size)
+
+
+def build_registry() -> NewsProviderRegistry:
+    """Build the provider list from settings (news_provider is a comma-separated priority list)."""
+    registry = NewsProviderRegistry(
+        hedge_after_ms=settings.news_hedge_after_ms,
+        merge_grace_ms=settings.news_merge_grace_ms,
+        deadline_ms=settings.news_search_deadline_ms,
+    )
+    http_providers = {p["name"]: p for p in settings.news_http_providers if p.get("name")}
+
+    for name in [n.strip() for n in settings.news_provider.split(",") if n.strip()]:
+        if name == "newsapi":
+            if settings.news_api_key:
+                registry.register(NewsApiProvider())
+        elif name == "local":
+            registry.register(LocalIndexProvider())
+        elif name in http_providers:
+            p = http_providers[name]
+            registry.register(HttpNewsProvider(name, p["base_url"], p.get("api_key")))
+        else:
+            logger.warning(f"Unknown news provider '{name}' ignored")
+
+    # Without any configured upstream, serve from the local index
+    if not registry.providers:
+        registry.register(LocalIndexProvider())
+    return registry
+
+
+news_registry = build_registry()
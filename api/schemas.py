@@ -68,6 +68,15 @@ class FactCheckResult(BaseModel):
     items: List[FactCheckItem] = []
 
 
+class FactCheckBatchRequest(BaseModel):
+    items: List[FactCheckRequest]
+
+
+class FactCheckBatchResult(BaseModel):
+    index: int  # position in FactCheckBatchRequest.items
+    result: FactCheckResult
+
+
 class AnalyzeResult(BaseModel):
     id: str
     canonicalUrl: str
@@ -0,0 +1,199 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from config import settings
+from .metrics import metrics
+from .tracing import set_attributes, span
+
+admission_shed = metrics.counter(
+    "thebiaslens_admission_shed_total",
+    "Requests rejected with 503 by admission control, by endpoint class and reason",
+    ("endpoint", "reason"),
+)
+admission_queue_seconds = metrics.histogram(
+    "thebiaslens_admission_queue_seconds",
+    "Time admitted requests waited for a slot, by endpoint class",
+    ("endpoint",),
+)
+
+# Bounds for the Retry-After estimate, in seconds
+MIN_RETRY_AFTER_S = 1
+MAX_RETRY_AFTER_S = 30
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed; answered with 503 and Retry-After."""
+
+    def __init__(self, endpoint: str, reason: str, retry_after_s: int):
+        super().__init__(f"{endpoint} overloaded ({reason})")
+        self.endpoint = endpoint
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    """
+    Concurrency limit with a bounded wait queue for one class of endpoints.
+
+    Up to max_concurrency requests run at once; up to max_queue more wait
+    in FIFO order, each for at most queue_timeout_s. Anything beyond that
+    is shed immediately (queue_full) or when its wait runs out
+    (queue_timeout), raising Overloaded so the client gets a fast 503
+    instead of a slow timeout. A finished request hands its slot straight
+    to the oldest waiter. Retry-After is estimated from the recent service
+    time and the queue ahead. max_concurrency <= 0 turns the limit off.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout_s: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Exponentially weighted mean time a request holds a slot
+        self._service_s = 0.5
+        self.admitted = 0
+        self.bypassed = 0
+        self.shed = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after_s(self) -> int:
+        """Seconds until the queue ahead of a new request would likely have drained."""
+        if self.max_concurrency <= 0:
+            return MIN_RETRY_AFTER_S
+        backlog = (self.queued + 1) / self.max_concurrency
+        return max(MIN_RETRY_AFTER_S, min(MAX_RETRY_AFTER_S, math.ceil(backlog * self._service_s)))
+
+    def _shed(self, reason: str) -> Overloaded:
+        self.shed += 1
+        admission_shed.inc(self.name, reason)
+        set_attributes(shed=reason)
+        return Overloaded(self.name, reason, self.retry_after_s())
+
+    async def acquire(self) -> None:
+        """Wait for a slot; raises Overloaded when the request should be shed."""
+        if self.max_concurrency <= 0 or (self.in_flight < self.max_concurrency and not self._waiters):
+            self.in_flight += 1
+            self.admitted += 1
+            admission_queue_seconds.observe(0.0, self.name)
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._shed("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            with span("admission_queue", desc=self.name):
+                await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot arrived as the wait ended; pass it on
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._shed("queue_timeout") from None
+        self.admitted += 1
+        admission_queue_seconds.observe(time.perf_counter() - started, self.name)
+
+    def try_acquire(self) -> bool:
+        """Take a free slot without queueing (background work); False if none is free."""
+        if self.max_concurrency > 0 and (self.in_flight >= self.max_concurrency or self._waiters):
+            return False
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self, held_s: Optional[float] = None) -> None:
+        if held_s is not None:
+            self._service_s += 0.2 * (held_s - self._service_s)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot over; in_flight stays the same
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def admit(self, bypass: bool = False) -> "Admission":
+        """
+        Context manager holding a slot for the enclosed block.
+
+        With bypass (cache hits and other requests that need no upstream
+        or parsing work) the request runs at once and takes no slot.
+        """
+        return Admission(self, bypass)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "bypassed": self.bypassed,
+            "shed": self.shed,
+            "service_s": round(self._service_s, 4),
+        }
+
+
+class Admission:
+    """A held (or bypassed) slot; release() is idempotent for streaming responses."""
+    __slots__ = ("controller", "bypass", "_started", "_held")
+
+    def __init__(self, controller: AdmissionController, bypass: bool):
+        self.controller = controller
+        self.bypass = bypass
+        self._held = False
+
+    async def __aenter__(self) -> "Admission":
+        return await self.acquire()
+
+    async def acquire(self) -> "Admission":
+        """Take the slot (raising Overloaded if shed); for use without `async with`."""
+        if self.bypass:
+            self.controller.bypassed += 1
+            return self
+        await self.controller.acquire()
+        self._held = True
+        self._started = time.perf_counter()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def release(self) -> None:
+        if self._held:
+            self._held = False
+            self.controller.release(time.perf_counter() - self._started)
+
+
+def _controller(name: str, concurrency: int, queue: int, timeout_ms: int) -> AdmissionController:
+    if not settings.admission_enabled:
+        concurrency = 0
+    return AdmissionController(name, concurrency, queue, timeout_ms / 1000)
+
+
+# Article fetch + parse: /analyze/url, /analyze/id/{id} and /extract
+analyze_admission = _controller(
+    "analyze",
+    settings.admission_analyze_concurrency,
+    settings.admission_analyze_queue,
+    settings.admission_analyze_queue_timeout_ms,
+)
+# Upstream fact-check queries and scoring: /factcheck and /factcheck/batch
+factcheck_admission = _controller(
+    "factcheck",
+    settings.admission_factcheck_concurrency,
+    settings.admission_factcheck_queue,
+    settings.admission_factcheck_queue_timeout_ms,
+)
@@ -0,0 +1,690 @@
+import asyncio
+import heapq
+import json
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import unquote, urlparse
+
+from config import settings
+from utils.lazy import is_available, lazy_import
+
+logger = logging.getLogger(__name__)
+
+# Optional; values fall back to JSON when msgpack is not installed
+msgpack = lazy_import("msgpack") if is_available("msgpack") else None
+
+# First byte of a serialized value: body format, plus a flag for zlib
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+FLAG_COMPRESSED = 0x80
+
+# Suffix of the marker key that flags a warmed entry in shared backends
+WARM_SUFFIX = "#warm"
+
+# Idle connections kept per Redis backend (one is in use per calling thread)
+REDIS_MAX_IDLE_CONNECTIONS = 8
+
+T = TypeVar("T")
+
+
+def encode_value(value: Any, compress_min_bytes: Optional[int] = None) -> bytes:
+    """Serialize a msgpack/JSON-compatible value, compressed above compress_min_bytes."""
+    if msgpack is not None:
+        fmt, body = FORMAT_MSGPACK, msgpack.packb(value, use_bin_type=True)
+    else:
+        fmt, body = FORMAT_JSON, json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    threshold = settings.cache_compress_min_bytes if compress_min_bytes is None else compress_min_bytes
+    if threshold > 0 and len(body) >= threshold:
+        compressed = zlib.compress(body, 6)
+        if len(compressed) < len(body):
+            fmt, body = fmt | FLAG_COMPRESSED, compressed
+    return bytes((fmt,)) + body
+
+
+def decode_value(data: bytes) -> Any:
+    """Inverse of encode_value; raises ValueError for payloads this process cannot read."""
+    if not data:
+        raise ValueError("empty cache payload")
+    fmt, body = data[0], data[1:]
+    if fmt & FLAG_COMPRESSED:
+        body = zlib.decompress(body)
+    fmt &= ~FLAG_COMPRESSED
+    if fmt == FORMAT_JSON:
+        return json.loads(body)
+    if fmt == FORMAT_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack payload but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    raise ValueError(f"unknown cache payload format {fmt:#x}")
+
+
+class CacheBackend:
+    """
+    Key/value store with per-entry TTLs behind the API's caches.
+
+    `shared` backends are visible to every worker (and possibly every
+    host) and store bytes; BackendCache serializes values for them and
+    prefixes keys with the cache's namespace. Backends never raise on
+    lookups or writes: an unreachable store counts an error, logs, and
+    behaves like an empty cache, so a cache outage only costs hit rate.
+    `blocking` backends wait on a file or socket, so async code reaches
+    them through BackendCache.run.
+    """
+    name = "base"
+    shared = False
+    blocking = False
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl_s: float, size: int = 0) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        """Remove key; True if it existed (exactly one concurrent caller sees True)."""
+        raise NotImplementedError
+
+    def contains(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def clear(self, prefix: str = "") -> None:
+        raise NotImplementedError
+
+    def count(self, prefix: str = "") -> Optional[int]:
+        """Live entries under prefix, or None where counting is too expensive."""
+        return None
+
+    def clear_expired(self, max_items: Optional[int] = None) -> int:
+        return 0
+
+    def stats(self) -> Dict[str, float]:
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Per-process TTL + LRU store of Python objects (no serialization).
+
+    Entries live in an OrderedDict kept in LRU order; expiry times are also
+    pushed onto a min-heap so expired entries can be dropped in
+    O(k log n) for k expired keys instead of scanning the whole dict.
+    Heap records are not removed when a key is overwritten or evicted;
+    they are recognised as stale (expiry mismatch) when they surface.
+    Size is bounded by max_entries (0 = unbounded) and, optionally, by the
+    caller-reported sizes of the stored values (max_bytes).
+    """
+    name = "memory"
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._expiry: List[Tuple[float, str]] = []
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[1]:
+            self._delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: str, value: Any, ttl_s: float, size: int = 0) -> None:
+        now = time.monotonic()
+        expires_at = now + ttl_s
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[2]
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+        heapq.heappush(self._expiry, (expires_at, key))
+
+        # Amortized housekeeping: a couple of expired entries per write
+        if self._expiry[0][0] <= now:
+            self.clear_expired(max_items=2)
+        if (0 < self.max_entries < len(self._entries)) or (0 < self.max_bytes < self._bytes):
+            self._evict()
+        if len(self._expiry) > 2 * len(self._entries) + 1024:
+            self._rebuild_heap()
+
+    def delete(self, key: str) -> bool:
+        if key not in self._entries:
+            return False
+        self._delete(key)
+        return True
+
+    def contains(self, key: str) -> bool:
+        """True if key has an unexpired entry (no LRU side effects)."""
+        entry = self._entries.get(key)
+        return entry is not None and time.monotonic() < entry[1]
+
+    def clear(self, prefix: str = "") -> None:
+        if prefix:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._delete(key)
+            return
+        self._entries.clear()
+        self._expiry = []
+        self._bytes = 0
+
+    def count(self, prefix: str = "") -> Optional[int]:
+        if prefix:
+            return sum(1 for k in self._entries if k.startswith(prefix))
+        return len(self._entries)
+
+    def _delete(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries > 0 and len(self._entries) > self.max_entries)
+            or (self.max_bytes > 0 and self._bytes > self.max_bytes)
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def _rebuild_heap(self) -> None:
+        self._expiry = [(expires_at, key) for key, (_, expires_at, _) in self._entries.items()]
+        heapq.heapify(self._expiry)
+
+    def clear_expired(self, max_items: Optional[int] = None) -> int:
+        """Drop expired entries (at most max_items); returns how many were removed."""
+        now = time.monotonic()
+        removed = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            if max_items is not None and removed >= max_items:
+                break
+            expires_at, key = heapq.heappop(self._expiry)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self._delete(key)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, float]:
+        return {"entries": len(self._entries), "bytes": self._bytes}
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Cache shared by the workers of one host through a SQLite file.
+
+    Put the file on a memory-backed filesystem (/dev/shm, the default where
+    it exists) and this is effectively shared memory with SQLite doing the
+    locking. WAL mode lets readers proceed while one worker writes.
+    Expiry uses wall-clock time, since workers do not share a monotonic
+    clock. Expired rows are deleted lazily and, every `trim_every`
+    writes, in bulk, along with the oldest rows beyond max_entries
+    (insertion order, not LRU, to keep reads free of writes).
+    """
+    name = "sqlite"
+    shared = True
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int = 0, trim_every: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+        self.trim_every = trim_every
+        self.errors = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)")
+
+    def _execute(self, sql: str, params: tuple = (), default: Any = None) -> Any:
+        try:
+            with self._lock:
+                cursor = self._conn.execute(sql, params)
+                if sql.startswith("SELECT"):
+                    return cursor.fetchone()
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"Cache store {self.path} error: {str(e)}")
+            return default
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._execute("SELECT value FROM cache WHERE key = ? AND expires > ?", (key, time.time()))
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl_s: float, size: int = 0) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl_s),
+        )
+        self._writes += 1
+        if self._writes % self.trim_every == 0:
+            self._trim()
+
+    def delete(self, key: str) -> bool:
+        return bool(self._execute("DELETE FROM cache WHERE key = ?", (key,), default=0))
+
+    def contains(self, key: str) -> bool:
+        return self._execute("SELECT 1 FROM cache WHERE key = ? AND expires > ?", (key, time.time())) is not None
+
+    def clear(self, prefix: str = "") -> None:
+        if prefix:
+            self._execute("DELETE FROM cache WHERE key >= ? AND key < ?", (prefix, _prefix_end(prefix)))
+        else:
+            self._execute("DELETE FROM cache")
+
+    def count(self, prefix: str = "") -> Optional[int]:
+        if prefix:
+            row = self._execute(
+                "SELECT COUNT(*) FROM cache WHERE key >= ? AND key < ? AND expires > ?",
+                (prefix, _prefix_end(prefix), time.time()),
+            )
+        else:
+            row = self._execute("SELECT COUNT(*) FROM cache WHERE expires > ?", (time.time(),))
+        return row[0] if row else None
+
+    def clear_expired(self, max_items: Optional[int] = None) -> int:
+        if max_items is None:
+            return self._execute("DELETE FROM cache WHERE expires <= ?", (time.time(),), default=0)
+        return self._execute(
+            "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache WHERE expires <= ? LIMIT ?)",
+            (time.time(), max_items), default=0,
+        )
+
+    def _trim(self) -> None:
+        self.clear_expired()
+        if self.max_entries <= 0:
+            return
+        row = self._execute("SELECT COUNT(*) FROM cache")
+        excess = (row[0] if row else 0) - self.max_entries
+        if excess > 0:
+            # INSERT OR REPLACE gives rewritten keys a new, highest rowid
+            self._execute(
+                "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache ORDER BY rowid LIMIT ?)",
+                (excess,),
+            )
+
+    def stats(self) -> Dict[str, float]:
+        return {"entries": self.count() or 0, "errors": self.errors}
+
+
+def _prefix_end(prefix: str) -> str:
+    # Smallest string greater than every string starting with prefix
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class _RedisConnection:
+    """One RESP2 connection, used by one thread at a time."""
+
+    def __init__(self, host: str, port: int, timeout_s: float):
+        self._sock = socket.create_connection((host, port), timeout=timeout_s)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+            self._sock.close()
+        except OSError:
+            pass
+
+    def roundtrip(self, *args: Any) -> Any:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by cache server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            raise RedisError(rest.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("connection closed by cache server")
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"unexpected reply from cache server: {line[:20]!r}")
+
+
+class RedisBackend(CacheBackend):
+    """
+    Cache shared by workers and hosts through a Redis-protocol server.
+
+    A minimal synchronous RESP2 client (GET, SET PX, DEL, EXISTS, SCAN) so
+    any Redis-compatible server works (Redis, Valkey, KeyDB, Dragonfly)
+    without a client library. Commands block on a socket for up to
+    `timeout_s`, so async code runs them in worker threads (see
+    BackendCache.run); each thread takes a connection from a small pool,
+    so concurrent lookups don't queue behind one socket. After a
+    connection failure the backend is skipped for `retry_after_s`, so an
+    outage costs one timeout, not one per lookup. Eviction beyond the
+    server's memory limit is the server's policy (e.g. allkeys-lru).
+    """
+    name = "redis"
+    shared = True
+    blocking = True
+
+    def __init__(self, url: str, timeout_s: float = 0.25, retry_after_s: float = 5.0,
+                 max_idle: int = REDIS_MAX_IDLE_CONNECTIONS):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", ""):
+            raise ValueError(f"unsupported cache URL scheme {parsed.scheme!r} (TLS is not supported)")
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout_s = timeout_s
+        self.retry_after_s = retry_after_s
+        self.max_idle = max_idle
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._idle: List[_RedisConnection] = []
+        self._down_until = 0.0
+
+    def _connect(self) -> _RedisConnection:
+        conn = _RedisConnection(self.host, self.port, self.timeout_s)
+        try:
+            if self.password:
+                conn.roundtrip("AUTH", self.password)
+            if self.db:
+                conn.roundtrip("SELECT", self.db)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _checkout(self) -> _RedisConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def _checkin(self, conn: _RedisConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def _mark_down(self) -> None:
+        # The other pooled connections are most likely broken as well
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._down_until = time.monotonic() + self.retry_after_s
+        for conn in idle:
+            conn.close()
+
+    def command(self, *args: Any, default: Any = None) -> Any:
+        """Run one command; `default` if the server is unreachable or answers with an error."""
+        if time.monotonic() < self._down_until:
+            return default
+        conn = None
+        try:
+            conn = self._checkout()
+            reply = conn.roundtrip(*args)
+        except RedisError as e:
+            self._error()
+            logger.warning(f"Cache server error for {args[0]}: {str(e)}")
+            if conn is not None:
+                self._checkin(conn)
+            return default
+        except (OSError, ValueError) as e:
+            self._error()
+            if conn is not None:
+                conn.close()
+            self._mark_down()
+            logger.warning(
+                f"Cache server {self.host}:{self.port} unavailable ({str(e)}), "
+                f"retrying in {self.retry_after_s:.0f}s"
+            )
+            return default
+        self._checkin(conn)
+        return reply
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.command("GET", key)
+
+    def set(self, key: str, value: bytes, ttl_s: float, size: int = 0) -> None:
+        self.command("SET", key, value, "PX", max(1, int(ttl_s * 1000)))
+
+    def delete(self, key: str) -> bool:
+        return bool(self.command("DEL", key, default=0))
+
+    def contains(self, key: str) -> bool:
+        return bool(self.command("EXISTS", key, default=0))
+
+    def clear(self, prefix: str = "") -> None:
+        if not prefix:
+            self.command("FLUSHDB")
+            return
+        pattern = "".join("\\" + c if c in "*?[]\\" else c for c in prefix) + "*"
+        cursor = "0"
+        while True:
+            reply = self.command("SCAN", cursor, "MATCH", pattern, "COUNT", 500)
+            if not reply:
+                return
+            cursor, keys = reply[0].decode("ascii"), reply[1]
+            if keys:
+                self.command("DEL", *keys)
+            if cursor == "0":
+                return
+
+    def count(self, prefix: str = "") -> Optional[int]:
+        # Counting one namespace means scanning the keyspace; only the total is cheap
+        return None if prefix else self.command("DBSIZE")
+
+    def stats(self) -> Dict[str, float]:
+        return {"errors": self.errors, "available": 0 if time.monotonic() < self._down_until else 1}
+
+
+class BackendCache:
+    """
+    One named cache (namespace) stored in a CacheBackend.
+
+    Values are converted with to_wire/from_wire (e.g. pydantic models to
+    plain dicts) and serialized only for shared backends; in-process
+    backends store the objects themselves. Entries stored by background
+    warming are flagged, and the first read of each one is counted in
+    warm_hits. In shared backends the flag is a separate marker key, so
+    the read is counted once across all workers (DEL succeeds only once).
+    """
+
+    def __init__(self, namespace: str, backend: CacheBackend,
+                 to_wire: Optional[Callable[[Any], Any]] = None,
+                 from_wire: Optional[Callable[[Any], Any]] = None):
+        self.namespace = namespace
+        self.backend = backend
+        self.to_wire = to_wire or (lambda value: value)
+        self.from_wire = from_wire or (lambda value: value)
+        self._shared = backend.shared
+        self._prefix = f"{namespace}:" if backend.shared else ""
+        self.hits = 0
+        self.misses = 0
+        self.warm_hits = 0
+        self.decode_errors = 0
+
+    def __len__(self) -> int:
+        return self.backend.count(self._prefix) or 0
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Call fn (a function that uses this cache) from async code.
+
+        For blocking backends it runs in a worker thread, so a slow or
+        unreachable cache server never stalls the event loop; in-process
+        backends are called directly.
+        """
+        if self.backend.blocking:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+
+    def _load(self, key: str) -> Optional[list]:
+        stored = self.backend.get(self._prefix + key)
+        if stored is None or not self._shared:
+            return stored
+        try:
+            payload = decode_value(stored)
+            return [self.from_wire(payload[0]), payload[1]]
+        except (ValueError, TypeError, KeyError, IndexError, zlib.error) as e:
+            self.decode_errors += 1
+            logger.warning(f"Dropping unreadable {self.namespace} cache entry: {str(e)}")
+            self.backend.delete(self._prefix + key)
+            return None
+
+    def get(self, key: str) -> Optional[Any]:
+        # In-process backends hold the payload list itself: skip _load
+        payload = self._load(key) if self._shared else self.backend.get(key)
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if payload[1]:
+            self._consume_warm(key, payload)
+        return payload[0]
+
+    def peek(self, key: str) -> Optional[Any]:
+        """The cached value without counting a lookup or a warm hit."""
+        payload = self._load(key)
+        return None if payload is None else payload[0]
+
+    def contains(self, key: str) -> bool:
+        return self.backend.contains(self._prefix + key)
+
+    def set(self, key: str, value: Any, ttl_s: float, warmed: bool = False, size: int = 0) -> None:
+        if not self._shared:
+            # A list so the warm flag can be cleared in place
+            self.backend.set(key, [value, warmed], ttl_s, size)
+            return
+        full_key = self._prefix + key
+        data = encode_value([self.to_wire(value), warmed])
+        self.backend.set(full_key, data, ttl_s, size=len(data))
+        if warmed:
+            self.backend.set(full_key + WARM_SUFFIX, b"1", ttl_s)
+
+    def consume_warm(self, key: str) -> None:
+        """Count a read of key that did not go through get() (e.g. a joined fetch)."""
+        if self.backend.shared:
+            self._consume_warm(key, None)
+            return
+        payload = self.backend.get(key)
+        if payload is not None and payload[1]:
+            self._consume_warm(key, payload)
+
+    def _consume_warm(self, key: str, payload: Optional[list]) -> None:
+        if self.backend.shared:
+            if self.backend.delete(self._prefix + key + WARM_SUFFIX):
+                self.warm_hits += 1
+            return
+        payload[1] = False
+        self.warm_hits += 1
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(self._prefix + key)
+
+    def clear(self) -> None:
+        self.backend.clear(self._prefix)
+
+    def clear_expired(self, max_items: Optional[int] = None) -> int:
+        return self.backend.clear_expired(max_items)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "warm_hits": self.warm_hits,
+        }
+        if self.backend.shared:
+            entries = self.backend.count(self._prefix)
+            if entries is not None:
+                stats["entries"] = entries
+            stats["decode_errors"] = self.decode_errors
+        else:
+            stats.update(self.backend.stats())
+        return stats
+
+
+def _default_sqlite_path() -> str:
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "thebiaslens-cache.sqlite3")
+
+
+_shared_backend: Optional[CacheBackend] = None
+_shared_lock = threading.Lock()
+
+
+def shared_backend() -> Optional[CacheBackend]:
+    """
+    The process-wide shared backend from settings.cache_backend.
+
+    None for "memory" (each cache keeps a private MemoryBackend) and when
+    the configured store cannot be opened, which is logged and falls back
+    to per-process caches rather than failing startup.
+    """
+    global _shared_backend
+    kind = settings.cache_backend.lower()
+    if kind == "memory":
+        return None
+    with _shared_lock:
+        if _shared_backend is None:
+            try:
+                if kind == "sqlite":
+                    _shared_backend = SQLiteBackend(
+                        settings.cache_sqlite_path or _default_sqlite_path(),
+                        max_entries=settings.cache_max_entries,
+                    )
+                elif kind == "redis":
+                    _shared_backend = RedisBackend(settings.cache_redis_url, timeout_s=settings.cache_timeout_s)
+                else:
+                    logger.error(f"Unknown CACHE_BACKEND {settings.cache_backend!r}, using per-process caches")
+                    return None
+            except (sqlite3.Error, OSError, ValueError) as e:
+                logger.error(f"Cache backend {kind} unavailable ({str(e)}), using per-process caches")
+                return None
+            logger.info(f"Using shared {kind} cache backend")
+        return _shared_backend
+
+
+def cache_backend(max_entries: int = 0, max_bytes: int = 0) -> CacheBackend:
+    """Backend for one cache: the shared one if configured, else a private in-process store."""
+    return shared_backend() or MemoryBackend(max_entries=max_entries, max_bytes=max_bytes)
@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class Permit(NamedTuple):
+    """Returned by `allow()` for one call; hand it back with that call's outcome."""
+    generation: int  # the breaker's generation when the call was allowed
+    probe: bool      # the call holds a half-open probe slot
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker for one upstream.
+
+    Closed: calls go through; `failure_threshold` consecutive failures
+    open the circuit. Open: calls are refused immediately (callers fail
+    fast instead of waiting out timeouts) until `reset_timeout_s` has
+    passed. Half-open: up to `half_open_max_calls` probe calls go
+    through; a success closes the circuit, a failure opens it again for
+    another `reset_timeout_s`.
+
+    Callers ask `allow()` before each call and get a Permit (or None if
+    refused), then report exactly one of `record_success(permit)`,
+    `record_failure(permit)` or, if the call was abandoned without an
+    answer (cancelled, skipped), `release(permit)`. Every state change
+    starts a new generation, and outcomes of calls allowed in an earlier
+    one are ignored: a slow call that started before the circuit opened
+    can't close it, or reopen it, by answering late.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_s = reset_timeout_s
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._generation = 0
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout_s:
+            self._state = HALF_OPEN
+            self._generation += 1
+            self._probes = 0
+            logger.info(f"Circuit {self.name} half-open, probing upstream")
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._generation += 1
+        self._opened_at = self._clock()
+        self._probes = 0
+        self.opened += 1
+        logger.warning(f"Circuit {self.name} open for {self.reset_timeout_s:.0f}s after {self._failures} failures")
+
+    def allow(self) -> Optional[Permit]:
+        """A Permit if a call may go upstream now (reserves a probe slot when half-open), else None."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return Permit(self._generation, probe=False)
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return Permit(self._generation, probe=True)
+            self.rejected += 1
+            return None
+
+    def _current(self, permit: Permit) -> bool:
+        # Only calls allowed since the last state change count
+        return permit.generation == self._generation
+
+    def record_success(self, permit: Permit) -> None:
+        with self._lock:
+            if not self._current(permit):
+                return
+            if self._state == HALF_OPEN:
+                logger.info(f"Circuit {self.name} closed, upstream recovered")
+                self._state = CLOSED
+                self._generation += 1
+                self._probes = 0
+            self._failures = 0
+
+    def record_failure(self, permit: Permit) -> None:
+        with self._lock:
+            if not self._current(permit):
+                return
+            self._failures += 1
+            if self._state == HALF_OPEN:
+                self._open()
+            elif self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def release(self, permit: Permit) -> None:
+        """Give back a half-open probe slot for a call that produced no verdict."""
+        with self._lock:
+            if permit.probe and self._current(permit) and self._probes > 0:
+                self._probes -= 1
+
+    def stats(self) -> Dict[str, Union[str, int]]:
+        with self._lock:
+            self._maybe_half_open()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
@@ -1,9 +1,79 @@
 import re
-from typing import List, Dict, Literal, Set, Optional
-from .textutil import text_util
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import List, Dict, Literal, Set, Optional, Tuple, Mapping, FrozenSet, Sequence
+from .textutil import text_util, TextFeatures, KeywordMatcher, TokenVocabulary
 
 ClaimType = Literal["policy", "statistics", "causal", "factoid"]
 
+
+@dataclass(frozen=True)
+class ClassifiedClaim:
+    """One mined claim with its type and gating targets."""
+    text: str
+    claim_type: ClaimType
+    targets: Mapping[str, FrozenSet[str]]
+    # Targets in the miner's original iteration order, for query planning
+    target_order: Mapping[str, Tuple[str, ...]]
+
+
+@dataclass
+class ClaimProfile:
+    """
+    Everything derived from the headline/summary for one fact-check request.
+
+    Built once by ClaimMiner.build_profile and shared by query building,
+    gating and scoring, so per-candidate work only touches the candidate
+    text. The derived fields are treated as read-only (targets and matchers
+    are immutable mappings), but the profile itself is not frozen: it also
+    carries per-request caches that grow while candidates are scored, i.e.
+    TextFeatures memoized per query string and the vocabulary that query
+    and candidate tokens are interned into. A profile therefore belongs to
+    one request and is not meant to be shared across requests or hashed.
+    """
+    headline: str
+    summary: Optional[str]
+    claims: Tuple[ClassifiedClaim, ...]
+    primary: ClassifiedClaim
+    relevant_entities: FrozenSet[str]
+    matchers: Mapping[str, KeywordMatcher]
+    _query_features: Dict[str, TextFeatures] = field(default_factory=dict, compare=False, repr=False)
+    vocab: TokenVocabulary = field(default_factory=TokenVocabulary, compare=False, repr=False)
+
+    @property
+    def claim_type(self) -> ClaimType:
+        return self.primary.claim_type
+
+    @property
+    def targets(self) -> Mapping[str, FrozenSet[str]]:
+        return self.primary.targets
+
+    def contains_any(self, key: str, text_lower: str) -> bool:
+        """True if any primary target under `key` is a substring of text_lower."""
+        matcher = self.matchers.get(key)
+        return matcher is not None and matcher.search(text_lower)
+
+    def token_hits(self, key: str, tokens: Sequence[str]) -> List[int]:
+        """Indices of tokens containing any primary target under `key`."""
+        matcher = self.matchers.get(key)
+        return matcher.token_hits(tokens) if matcher is not None else []
+
+    def query_features(self, query: str) -> TextFeatures:
+        features = self._query_features.get(query)
+        if features is None:
+            features = TextFeatures(query)
+            self._query_features[query] = features
+        return features
+
+
+# Target keys whose members count as on-topic entities for the distractor penalty
+RELEVANT_ENTITY_KEYS = {
+    "policy": ("actors", "objects"),
+    "statistics": ("subjects",),
+    "causal": ("causes", "effects"),
+    "factoid": ("speakers",),
+}
+
 class ClaimMiner:
     
     def __init__(self):
@@ -30,6 +100,49 @@ class ClaimMiner:
             'linked to', 'leads to', 'results in', 'associated with', 'due to',
             'because of', 'caused by', 'resulting from', 'stems from', 'attributed to'
         ]
+        
+        self.stats_indicators = {'percent', '%', 'million', 'billion', 'thousand', 'cases', 'votes', 'dollars', 'rate'}
+        
+        self.policy_action_map = {
+            'approve': ['authorized', 'permits', 'allows', 'enables'],
+            'mandate': ['requires', 'orders', 'commands'],
+            'ban': ['prohibits', 'forbids', 'blocks'],
+            'announce': ['declares', 'states', 'reveals'],
+            'rule': ['decides', 'determines', 'judges']
+        }
+        self.domain_objects = ['mining', 'crypto', 'cryptocurrency', 'power', 'plants', 'facilities', 'operations']
+        self.government_indicators = {'president', 'congress', 'senate', 'house', 'court', 'administration', 'government', 'biden'}
+        
+        self.causal_split_phrases = self.causal_phrases + ['leads to', 'results in', 'causes', 'due to']
+        self.cause_indicators = ['climate', 'change', 'warming', 'temperature', 'emissions', 'pollution']
+        self.effect_indicators = ['flooding', 'drought', 'storms', 'damage', 'loss', 'increase', 'decrease']
+        
+        self.political_figures = ['biden', 'trump', 'harris', 'obama', 'clinton']
+        self.org_indicators = ['administration', 'government', 'congress', 'senate', 'house', 'court', 'bureau', 'department']
+        self.speech_verbs = {'said', 'claimed', 'stated', 'announced', 'declared', 'reported', 'told', 'mentioned'}
+        self.action_verbs = {'did', 'made', 'took', 'gave', 'signed', 'visited', 'met', 'attended'}
+        self.predicate_verbs = self.speech_verbs.union(self.action_verbs)
+        
+        # One compiled matcher per vocabulary: each claim is scanned once per
+        # vocabulary instead of once per word
+        self._stats_matcher = KeywordMatcher(self.stats_indicators)
+        self._policy_verb_matcher = KeywordMatcher(self.policy_verbs)
+        self._policy_noun_matcher = KeywordMatcher(self.policy_nouns)
+        self._causal_phrase_matcher = KeywordMatcher(self.causal_phrases)
+        self._policy_term_matcher = KeywordMatcher(
+            set(self.policy_verbs)
+            | set(self.policy_action_map)
+            | {v for variants in self.policy_action_map.values() for v in variants}
+            | set(self.domain_objects)
+            | self.government_indicators
+        )
+        self._government_matcher = KeywordMatcher(self.government_indicators)
+        self._causal_term_matcher = KeywordMatcher(
+            set(self.causal_split_phrases) | set(self.cause_indicators) | set(self.effect_indicators)
+        )
+        self._factoid_term_matcher = KeywordMatcher(
+            set(self.political_figures) | set(self.org_indicators) | self.predicate_verbs
+        )
     
     def extract_core_claims(self, headline: str, summary: Optional[str] = None, max_claims: int = 3) -> List[str]:
         claims = []
@@ -83,8 +196,7 @@ class ClaimMiner:
         numbers = text_util.extract_numbers_with_units(claim)
         if numbers:
             # Look for statistical indicators
-            stats_indicators = {'percent', '%', 'million', 'billion', 'thousand', 'cases', 'votes', 'dollars', 'rate'}
-            if any(indicator in claim_lower for indicator in stats_indicators):
+            if self._stats_matcher.search(claim_lower):
                 return "statistics"
         
         # Check for policy (specific verbs or nouns, including partial matches)
@@ -92,15 +204,15 @@ class ClaimMiner:
         policy_noun_match = bool(claim_tokens_set.intersection(self.policy_nouns))
         
         # Also check for policy verbs in the full text (handles word forms)
-        policy_verb_text_match = any(verb in claim_lower for verb in self.policy_verbs)
-        policy_noun_text_match = any(noun in claim_lower for noun in self.policy_nouns)
+        policy_verb_text_match = self._policy_verb_matcher.search(claim_lower)
+        policy_noun_text_match = self._policy_noun_matcher.search(claim_lower)
         
         if policy_verb_match or policy_noun_match or policy_verb_text_match or policy_noun_text_match:
             return "policy"
         
         # Check for causal relationships
         causal_token_match = bool(claim_tokens_set.intersection(self.causal_indicators))
-        causal_phrase_match = any(phrase in claim_lower for phrase in self.causal_phrases)
+        causal_phrase_match = self._causal_phrase_matcher.search(claim_lower)
         
         if causal_token_match or causal_phrase_match:
             return "causal"
@@ -140,6 +252,7 @@ class ClaimMiner:
         claim_tokens = text_util.tokenize(claim)
         entities = text_util.extract_entities(claim)
         claim_lower = claim.lower()
+        present = self._policy_term_matcher.present(claim_lower)
         
         # Actions: policy verbs found in claim (exact and partial matches)
         for token in claim_tokens:
@@ -148,20 +261,12 @@ class ClaimMiner:
         
         # Also check for verb forms in the claim text
         for verb in self.policy_verbs:
-            if verb in claim_lower:
+            if verb in present:
                 actions.add(verb)
         
         # Add semantic equivalents and common policy actions
-        policy_action_map = {
-            'approve': ['authorized', 'permits', 'allows', 'enables'],
-            'mandate': ['requires', 'orders', 'commands'],
-            'ban': ['prohibits', 'forbids', 'blocks'],
-            'announce': ['declares', 'states', 'reveals'],
-            'rule': ['decides', 'determines', 'judges']
-        }
-        
-        for base_action, variants in policy_action_map.items():
-            if base_action in claim_lower or any(variant in claim_lower for variant in variants):
+        for base_action, variants in self.policy_action_map.items():
+            if base_action in present or any(variant in present for variant in variants):
                 actions.add(base_action)
         
         # Objects: policy nouns, key entities, and domain-specific objects
@@ -170,26 +275,22 @@ class ClaimMiner:
                 objects.add(token)
         
         # Add domain-specific objects (mining, power, etc.)
-        domain_objects = ['mining', 'crypto', 'cryptocurrency', 'power', 'plants', 'facilities', 'operations']
-        for obj in domain_objects:
-            if obj in claim_lower:
+        for obj in self.domain_objects:
+            if obj in present:
                 objects.add(obj)
         
         # Add entities as potential objects
         objects.update(entities)
         
         # Actors: government entities and officials
-        government_indicators = {'president', 'congress', 'senate', 'house', 'court', 'administration', 'government', 'biden'}
-        
         # Check for government actors in entities
         for entity in entities:
-            entity_lower = entity.lower()
-            if any(indicator in entity_lower for indicator in government_indicators):
+            if self._government_matcher.search(entity.lower()):
                 actors.add(entity)
         
         # Check for government actors in claim text
-        for indicator in government_indicators:
-            if indicator in claim_lower:
+        for indicator in self.government_indicators:
+            if indicator in present:
                 actors.add(indicator)
         
         return {
@@ -244,13 +345,13 @@ class ClaimMiner:
         entities = text_util.extract_entities(claim)
         claim_tokens = text_util.tokenize(claim)
         claim_lower = claim.lower()
+        present = self._causal_term_matcher.present(claim_lower)
         
         # Look for causal structure with expanded phrases
         causal_split = None
-        extended_phrases = self.causal_phrases + ['leads to', 'results in', 'causes', 'due to']
         
-        for phrase in extended_phrases:
-            if phrase in claim_lower:
+        for phrase in self.causal_split_phrases:
+            if phrase in present:
                 parts = claim_lower.split(phrase, 1)
                 if len(parts) == 2:
                     causal_split = (parts[0].strip(), parts[1].strip())
@@ -265,17 +366,14 @@ class ClaimMiner:
             effects.update(effect_tokens[:5])
         else:
             # Enhanced fallback: look for domain-specific terms
-            cause_indicators = ['climate', 'change', 'warming', 'temperature', 'emissions', 'pollution']
-            effect_indicators = ['flooding', 'drought', 'storms', 'damage', 'loss', 'increase', 'decrease']
-            
             # Check for cause indicators
-            for indicator in cause_indicators:
-                if indicator in claim_lower:
+            for indicator in self.cause_indicators:
+                if indicator in present:
                     causes.add(indicator)
             
             # Check for effect indicators  
-            for indicator in effect_indicators:
-                if indicator in claim_lower:
+            for indicator in self.effect_indicators:
+                if indicator in present:
                     effects.add(indicator)
             
             # Fallback to entities if no specific indicators found
@@ -306,35 +404,30 @@ class ClaimMiner:
         
         entities = text_util.extract_entities(claim)
         claim_tokens = text_util.tokenize(claim)
-        claim_lower = claim.lower()
+        present = self._factoid_term_matcher.present(claim.lower())
         
         # Speakers: entities, people names, organizations
         speakers.update(entities)
         
         # Add common political figures
-        political_figures = ['biden', 'trump', 'harris', 'obama', 'clinton']
-        for figure in political_figures:
-            if figure in claim_lower:
+        for figure in self.political_figures:
+            if figure in present:
                 speakers.add(figure)
         
         # Add organizational entities
-        org_indicators = ['administration', 'government', 'congress', 'senate', 'house', 'court', 'bureau', 'department']
-        for org in org_indicators:
-            if org in claim_lower:
+        for org in self.org_indicators:
+            if org in present:
                 speakers.add(org)
         
         # Predicates: speech verbs, action verbs, and key terms
-        speech_verbs = {'said', 'claimed', 'stated', 'announced', 'declared', 'reported', 'told', 'mentioned'}
-        action_verbs = {'did', 'made', 'took', 'gave', 'signed', 'visited', 'met', 'attended'}
-        
         # Check for speech/action verbs in tokens
         for token in claim_tokens:
-            if token.lower() in speech_verbs.union(action_verbs):
+            if token.lower() in self.predicate_verbs:
                 predicates.add(token)
         
         # Check for speech verbs in text (handles word forms)
-        for verb in speech_verbs.union(action_verbs):
-            if verb in claim_lower:
+        for verb in self.predicate_verbs:
+            if verb in present:
                 predicates.add(verb)
         
         # Add key descriptive terms as predicates
@@ -346,6 +439,35 @@ class ClaimMiner:
             "predicates": predicates
         }
 
+    def classify(self, claim: str) -> ClassifiedClaim:
+        claim_type = self.classify_claim(claim)
+        targets = self.extract_targets(claim, claim_type)
+        return ClassifiedClaim(
+            text=claim,
+            claim_type=claim_type,
+            targets=MappingProxyType({k: frozenset(v) for k, v in targets.items()}),
+            target_order=MappingProxyType({k: tuple(v) for k, v in targets.items()}),
+        )
+    
+    def build_profile(self, headline: str, summary: Optional[str] = None, max_claims: int = 3) -> ClaimProfile:
+        """Mine, classify and compile everything needed for one fact-check request."""
+        core_claims = self.extract_core_claims(headline, summary, max_claims=max_claims)
+        claims = tuple(self.classify(claim) for claim in core_claims)
+        primary = claims[0] if claims else self.classify(headline)
+        
+        relevant_entities = set()
+        for key in RELEVANT_ENTITY_KEYS.get(primary.claim_type, ()):
+            relevant_entities.update(primary.targets.get(key, frozenset()))
+        
+        return ClaimProfile(
+            headline=headline,
+            summary=summary,
+            claims=claims,
+            primary=primary,
+            relevant_entities=frozenset(relevant_entities),
+            matchers=MappingProxyType({k: KeywordMatcher(v) for k, v in primary.targets.items()}),
+        )
+
 
 # Global instance
 claim_miner = ClaimMiner()
\ No newline at end of file
@@ -1,40 +1,62 @@
-import httpx
-import trafilatura
-from typing import Tuple, Optional, Dict, Any
-import time
+import asyncio
+from functools import partial
+from typing import Tuple, Optional, Dict
 from datetime import datetime
 from html import unescape
 import re
 import json
 
+from config import settings
+from utils.lazy import lazy_import
 from utils.normalize import canonicalize_url
-from urllib.parse import urljoin
+from .cache_backend import BackendCache, cache_backend
+from .metrics import cache_lookups, stage_seconds
+from .tracing import set_attributes, span
+from urllib.parse import urljoin, urlparse
 
-_cache: Dict[str, Dict[str, Any]] = {}
-_cache_ttl = 60
+# Loaded on the first fetch/extraction; together most of the API's import time
+httpx = lazy_import("httpx")
+trafilatura = lazy_import("trafilatura")
 
+# Extraction results by canonical URL, as tuples (see extract_article);
+# unbounded in the per-process backend, like the TTL-only dict it replaced
+_cache = BackendCache("extract", cache_backend(), from_wire=tuple)
+_cache_ttl = settings.extract_cache_ttl_s
 
-def _is_cache_valid(timestamp: float) -> bool:
-    return time.time() - timestamp < _cache_ttl
+# In-flight extractions, so concurrent requests for one URL share a fetch
+_inflight: Dict[str, "asyncio.Future"] = {}
+
+
+def get_warm_hits() -> int:
+    """Cache hits served from entries populated by background warming."""
+    return _cache.warm_hits
+
+
+def cache_stats() -> Dict[str, float]:
+    return _cache.stats()
+
+
+def is_cached(canonical_url: str) -> bool:
+    return _cache.contains(canonical_url)
+
+
+def cached_headline(canonical_url: str) -> Optional[str]:
+    """Headline of a cached extraction, without counting it as a read."""
+    entry = _cache.peek(canonical_url)
+    return entry[0] if entry is not None else None
+
+
+# For async code: a shared cache store is only reached from worker threads
+async def is_cached_async(canonical_url: str) -> bool:
+    return await _cache.run(is_cached, canonical_url)
+
+
+async def cached_headline_async(canonical_url: str) -> Optional[str]:
+    return await _cache.run(cached_headline, canonical_url)
 
 
 def _get_from_cache(canonical_url: str) -> Optional[Tuple[Optional[str], Optional[str], int, str, Optional[str], Optional[str], bool, Optional[str]]]:
-    if canonical_url in _cache:
-        entry = _cache[canonical_url]
-        if _is_cache_valid(entry['timestamp']):
-            return (
-                entry['headline'],
-                entry['body'],
-                entry['word_count'],
-                entry['status'],
-                entry.get('author'),
-                entry.get('published_at'),
-                entry.get('paywalled', False),
-                entry.get('canonical_from_meta'),
-            )
-        else:
-            del _cache[canonical_url]
-    return None
+    return _cache.get(canonical_url)
 
 
 def _set_cache(
@@ -47,21 +69,27 @@ def _set_cache(
     published_at: Optional[str],
     paywalled: bool,
     canonical_from_meta: Optional[str],
+    warmed: bool = False,
 ) -> None:
-    _cache[canonical_url] = {
-        'headline': headline,
-        'body': body,
-        'word_count': word_count,
-        'status': status,
-        'timestamp': time.time(),
-        'author': author,
-        'published_at': published_at,
-        'paywalled': paywalled,
-        'canonical_from_meta': canonical_from_meta,
-    }
+    _cache.set(
+        canonical_url,
+        (headline, body, word_count, status, author, published_at, paywalled, canonical_from_meta),
+        _cache_ttl,
+        warmed=warmed,
+    )
+
+
+def _fetch_url(url: str) -> str:
+    origin = settings.extract_fetch_origin
+    if not origin:
+        return url
+    parsed = urlparse(url)
+    query = f"?{parsed.query}" if parsed.query else ""
+    return f"{origin.rstrip('/')}/{parsed.netloc}{parsed.path or '/'}{query}"
 
 
 async def fetch_html(url: str) -> Optional[str]:
+    url = _fetch_url(url)
     try:
         async with httpx.AsyncClient(timeout=10.0) as client:
             headers = {
@@ -185,25 +213,85 @@ def _is_likely_paywalled(html: str, body: Optional[str], wc: int) -> bool:
     return any(c in hay for c in clues)
 
 
-async def extract_article(url: str) -> Tuple[Optional[str], Optional[str], int, str, Optional[str], Optional[str], bool, Optional[str]]:
+async def extract_article(url: str, warm: bool = False) -> Tuple[Optional[str], Optional[str], int, str, Optional[str], Optional[str], bool, Optional[str]]:
+    """
+    Fetch and extract an article, serving repeated requests from the cache.
+
+    With warm=True the result is only being precomputed (see
+    services.extract_warm); the cache entry is flagged so the first real
+    read of it is counted as a warm hit.
+    """
+    with span("extract_article", desc=urlparse(url).hostname):
+        return await _extract_article(url, warm)
+
+
+async def _extract_article(url: str, warm: bool) -> Tuple[Optional[str], Optional[str], int, str, Optional[str], Optional[str], bool, Optional[str]]:
     # Canonicalize URL for consistent caching
     canonical_url = canonicalize_url(url)
     
     # Check cache first
-    cached_result = _get_from_cache(canonical_url)
-    if cached_result:
-        return cached_result
-    
+    if warm:
+        cached_result = await _cache.run(_cache.peek, canonical_url)
+        if cached_result is not None:
+            return cached_result
+    else:
+        cached_result = await _cache.run(_get_from_cache, canonical_url)
+        cache_lookups.inc("extraction", "hit" if cached_result else "miss")
+        set_attributes(cache="hit" if cached_result else "miss")
+        if cached_result:
+            return cached_result
+
+    # Join an extraction of the same URL that is already running; it runs as
+    # its own task, so it finishes (and is cached) even if the request that
+    # started it is cancelled, and every waiter gets the result
+    task = _inflight.get(canonical_url)
+    if task is not None:
+        set_attributes(joined=True)
+        result = await asyncio.shield(task)
+        if not warm:
+            await _cache.run(_cache.consume_warm, canonical_url)
+        return result
+
+    task = asyncio.create_task(_extract_and_cache(canonical_url, warm))
+    _inflight[canonical_url] = task
+    task.add_done_callback(partial(_extraction_done, canonical_url))
+    return await asyncio.shield(task)
+
+
+async def _extract_and_cache(canonical_url: str, warm: bool) -> Tuple[Optional[str], Optional[str], int, str, Optional[str], Optional[str], bool, Optional[str]]:
+    result = await _extract_uncached(canonical_url)
+    await _cache.run(_set_cache, canonical_url, *result, warmed=warm)
+    return result
+
+
+def _extraction_done(canonical_url: str, task: "asyncio.Task") -> None:
+    if _inflight.get(canonical_url) is task:
+        del _inflight[canonical_url]
+    # Avoid "exception never retrieved" warnings when every waiter is gone
+    if not task.cancelled():
+        task.exception()
+
+
+async def _extract_uncached(canonical_url: str) -> Tuple[Optional[str], Optional[str], int, str, Optional[str], Optional[str], bool, Optional[str]]:
     # Fetch HTML
-    html = await fetch_html(canonical_url)
+    with stage_seconds.time("fetch"), span("fetch", desc=urlparse(canonical_url).hostname):
+        html = await fetch_html(canonical_url)
     if html is None:
-        result = (None, None, 0, 'error', None, None, False, None)
-        _set_cache(canonical_url, *result)
-        return result
+        return (None, None, 0, 'error', None, None, False, None)
     
-    # Extract text content
-    headline, body, word_count = extract_text(html, canonical_url)
+    # Parsing is CPU-bound; run it in a worker thread to keep the loop responsive
+    with stage_seconds.time("extract"), span("parse"):
+        headline, body, word_count = await asyncio.to_thread(extract_text, html, canonical_url)
+
+    with stage_seconds.time("metadata"), span("metadata"):
+        author, published_at, paywalled, canonical_from_meta, status = await asyncio.to_thread(
+            _extract_metadata, html, canonical_url, body, word_count
+        )
+    return (headline, body, word_count, status, author, published_at, paywalled, canonical_from_meta)
+
 
+def _extract_metadata(html: str, canonical_url: str, body: Optional[str], word_count: int) -> Tuple[Optional[str], Optional[str], bool, Optional[str], str]:
+    """Author, publish date, paywall flag, canonical URL and extraction status of a fetched page."""
     # Extract metadata for author and date if available
     author: Optional[str] = None
     published_at: Optional[str] = None
@@ -345,6 +433,4 @@ async def extract_article(url: str) -> Tuple[Optional[str], Optional[str], int,
     else:
         status = 'missing'  # No content extracted
     
-    result = (headline, body, word_count, status, author, published_at, paywalled, canonical_from_meta)
-    _set_cache(canonical_url, *result)
-    return result
\ No newline at end of file
+    return (author, published_at, paywalled, canonical_from_meta, status)
\ No newline at end of file
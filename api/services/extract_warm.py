@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set
+
+from config import settings
+from utils.normalize import canonicalize_url
+from . import extract, tracing
+from .admission import analyze_admission
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionWarmer:
+    """
+    Low-priority background extraction of likely-to-be-opened URLs.
+
+    URLs are queued (bounded) and drained by at most `concurrency` worker
+    tasks, which exit once the queue is empty. A daily budget caps how many
+    warm extractions are started. Each extraction takes a slot from the
+    analyze admission controller, but only a free one: while real requests
+    use or wait for every slot, queued URLs are dropped. Results land in the
+    regular extraction cache, flagged as warmed, so a follow-up /analyze/url
+    is a cache hit.
+    """
+
+    def __init__(self, concurrency: int = 2, daily_budget: int = 500, max_queue: int = 100):
+        self.concurrency = max(1, concurrency)
+        self.daily_budget = daily_budget
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[str] = set()
+        self._workers: Set[asyncio.Task] = set()
+        self._budget_day = date.today()
+        self._used_today = 0
+        self.warmed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def _remaining_budget(self) -> int:
+        today = date.today()
+        if today != self._budget_day:
+            self._budget_day = today
+            self._used_today = 0
+        return self.daily_budget - self._used_today
+
+    async def enqueue(self, urls: Iterable[str]) -> int:
+        """Queue URLs for warming; returns how many were accepted."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+
+        accepted = 0
+        for url in urls:
+            if not url:
+                continue
+            canonical_url = canonicalize_url(url)
+            if canonical_url in self._queued or await extract.is_cached_async(canonical_url):
+                continue
+            if self._remaining_budget() - self._queue.qsize() <= 0 or self._queue.full():
+                self.skipped += 1
+                continue
+            self._queue.put_nowait(canonical_url)
+            self._queued.add(canonical_url)
+            accepted += 1
+
+        while len(self._workers) < self.concurrency and not self._queue.empty():
+            task = asyncio.create_task(self._worker())
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
+
+        return accepted
+
+    async def _worker(self) -> None:
+        # Started from a request's context; warming is not part of that request
+        tracing.detach()
+        while not self._queue.empty():
+            url = self._queue.get_nowait()
+            try:
+                if self._remaining_budget() <= 0 or not analyze_admission.try_acquire():
+                    self.skipped += 1
+                    continue
+                self._used_today += 1
+                try:
+                    _, _, _, status, *_ = await extract.extract_article(url, warm=True)
+                finally:
+                    analyze_admission.release()
+                if status == 'error':
+                    self.failed += 1
+                else:
+                    self.warmed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Warm extraction failed for {url}: {str(e)}")
+            finally:
+                self._queued.discard(url)
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, float]:
+        warm_hits = extract.get_warm_hits()
+        return {
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "warm_hits": warm_hits,
+            "warm_hit_ratio": warm_hits / self.warmed if self.warmed else 0.0,
+            "budget_remaining": self._remaining_budget(),
+        }
+
+
+extraction_warmer = ExtractionWarmer(
+    concurrency=settings.search_warm_concurrency,
+    daily_budget=settings.search_warm_daily_budget,
+)
+
+
+async def warm_search_results(items: List[Dict]) -> None:
+    """Queue the top search results for background extraction."""
+    top_n = settings.search_warm_top_n
+    if top_n <= 0 or not items:
+        return
+    await extraction_warmer.enqueue(item.get("url") for item in items[:top_n])
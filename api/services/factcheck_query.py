@@ -1,7 +1,8 @@
 import re
 from typing import Dict, List, Optional
-from .claims import claim_miner
-from .textutil import text_util
+from config import settings
+from .claims import claim_miner, ClaimProfile
+from .textutil import text_util, overlap_coefficient
 
 def derive_core_claim(headline: str, summary: Optional[str] = None) -> str:
     core_claims = claim_miner.extract_core_claims(headline, summary, max_claims=1)
@@ -78,14 +79,21 @@ def expand_with_aliases(tokens: List[str]) -> List[str]:
     return list(set(filtered))[:6]
 
 
-def build_queries(headline: str, source_domain: Optional[str] = None, summary: Optional[str] = None) -> List[Dict[str, str]]:
+def build_queries(
+    headline: str,
+    source_domain: Optional[str] = None,
+    summary: Optional[str] = None,
+    profile: Optional[ClaimProfile] = None
+) -> List[Dict[str, str]]:
     
     queries = []
     
-    claims = claim_miner.extract_core_claims(headline, summary, max_claims=3)
-    for claim in claims:
-        claim_type = claim_miner.classify_claim(claim)
-        targets = claim_miner.extract_targets(claim, claim_type)
+    if profile is None:
+        profile = claim_miner.build_profile(headline, summary)
+    for classified in profile.claims:
+        claim = classified.text
+        claim_type = classified.claim_type
+        targets = classified.target_order
         
         if claim_type == "policy":
             queries.append({"reason": f"policy_exact", "q": f'"{claim[:70]}"'})
@@ -161,29 +169,29 @@ def build_queries(headline: str, source_domain: Optional[str] = None, summary: O
         aliases = expand_with_aliases([entity])
         for alias in aliases[:2]:
             queries.append({"reason": "entity_expanded", "q": alias})
+    return dedupe_queries(queries)[:10]
+
+
+def dedupe_queries(queries: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Drop queries that are too short, or whose words overlap an earlier
+    kept query's by more than FACTCHECK_QUERY_DEDUP_THRESHOLD (shared words
+    relative to the shorter query). A plan holds a few dozen queries, so
+    the exact pairwise check is cheap.
+    """
     valid_queries = []
-    seen_normalized = set()
+    seen_words = []
     
     for query_dict in queries:
         query = query_dict.get("q", "").strip()
         if not query or len(query) < 6 or len(query.split()) < 2:
             continue
         
-        normalized = query.replace('"', '').lower().strip()
-        is_duplicate = False
-        normalized_words = set(normalized.split())
-        
-        for seen in seen_normalized:
-            seen_words = set(seen.split())
-            if len(normalized_words) > 0 and len(seen_words) > 0:
-                overlap = len(normalized_words & seen_words)
-                similarity = overlap / min(len(normalized_words), len(seen_words))
-                if similarity > 0.75:
-                    is_duplicate = True
-                    break
-        
-        if not is_duplicate:
-            valid_queries.append(query_dict)
-            seen_normalized.add(normalized)
+        normalized_words = frozenset(query.replace('"', '').lower().split())
+        if any(overlap_coefficient(normalized_words, seen) > settings.factcheck_query_dedup_threshold
+               for seen in seen_words):
+            continue
+        valid_queries.append(query_dict)
+        seen_words.append(normalized_words)
     
-    return valid_queries[:10]
\ No newline at end of file
+    return valid_queries
@@ -1,128 +1,248 @@
 import re
 from datetime import datetime, timedelta
-from typing import Dict, Set, Optional
-from .textutil import text_util
+from typing import FrozenSet, List, Optional, Sequence
+from .textutil import TextFeatures, KeywordMatcher, TokenVocabulary, bitset_jaccard
+from .claims import ClaimProfile
 from .factcheck_filters import passes_gates
 
+from utils.lazy import is_available, lazy_import
+
+# Optional: batch scoring falls back to the per-item path. Imported on the
+# first large batch rather than at startup.
+np = lazy_import("numpy") if is_available("numpy") else None
+
+# Below this many candidates the per-item overlap is cheaper than building arrays
+BATCH_MIN_ITEMS = 16
+
+CLAIM_BASED_REASONS = {'core_claim', 'policy_exact', 'statistics_exact', 'causal_exact', 'factoid_exact'}
+
+CAUSAL_VERBS = ['cause', 'causes', 'caused', 'lead', 'leads', 'led', 'result', 'results', 'resulted']
+CAUSAL_PHRASES = ['leads to', 'results in', 'due to', 'because of', 'associated with', 'linked to']
+
+_CAUSAL_VERB_MATCHER = KeywordMatcher(CAUSAL_VERBS)
+_CAUSAL_PHRASE_MATCHER = KeywordMatcher(CAUSAL_PHRASES)
+
+SPEECH_PATTERNS = [
+    re.compile(r'\b(said|stated|claimed|announced|declared|reported|told|mentioned)\b'),
+    re.compile(r'\b(according\s+to|reported\s+by)\b'),
+]
+
+
 def score_item(
     query: str,
     claim_text: str,
     source_domain: Optional[str],
     published_at: Optional[datetime],
-    claim_type: str,
-    targets: Dict[str, Set[str]],
+    profile: ClaimProfile,
     reason: str
 ) -> float:
-    if not passes_gates(claim_text, claim_type, targets):
+    claim = TextFeatures(claim_text)
+    if not passes_gates(claim_text, profile, claim):
         return -1.0
-    
-    base_score = _calculate_ngram_overlap(query, claim_text)
+
+    base_score = _calculate_ngram_overlap(profile.query_features(query), claim, profile.vocab)
+    return _apply_bonuses(base_score, claim, source_domain, published_at, profile, reason)
+
+
+def score_items(
+    query: str,
+    claim_texts: Sequence[str],
+    source_domain: Optional[str],
+    published_ats: Sequence[Optional[datetime]],
+    profile: ClaimProfile,
+    reason: str
+) -> List[float]:
+    """
+    Score many candidates for one query; identical to score_item per claim.
+
+    The n-gram, entity and token overlaps of all candidates that pass the
+    gates are computed together with NumPy (when installed) from bitset
+    intersection counts and sparse entity incidence against the query.
+    """
+    claims = [TextFeatures(text) for text in claim_texts]
+    scores = [-1.0] * len(claims)
+    passing = [i for i, claim in enumerate(claims) if passes_gates(claim_texts[i], profile, claim)]
+    if not passing:
+        return scores
+
+    query_features = profile.query_features(query)
+    passing_claims = [claims[i] for i in passing]
+    if np is not None and len(passing) >= BATCH_MIN_ITEMS:
+        base_scores = _batch_ngram_overlap(query_features, passing_claims, profile.vocab).tolist()
+    else:
+        base_scores = [_calculate_ngram_overlap(query_features, claim, profile.vocab) for claim in passing_claims]
+
+    for i, base_score in zip(passing, base_scores):
+        scores[i] = _apply_bonuses(base_score, claims[i], source_domain, published_ats[i], profile, reason)
+    return scores
+
+
+def _apply_bonuses(
+    base_score: float,
+    claim: TextFeatures,
+    source_domain: Optional[str],
+    published_at: Optional[datetime],
+    profile: ClaimProfile,
+    reason: str
+) -> float:
+    claim_text = claim.text
     bonus = 0.0
-    
+
     if source_domain and _has_domain_token(claim_text, source_domain):
         bonus += 0.05
-    
+
     if published_at:
         months_ago = (datetime.now() - published_at.replace(tzinfo=None)).days / 30
         if months_ago <= 18:
             bonus += 0.08 * max(0, (18 - months_ago) / 18)
-    
-    claim_based_reasons = {'core_claim', 'policy_exact', 'statistics_exact', 'causal_exact', 'factoid_exact'}
-    if reason in claim_based_reasons:
+
+    if reason in CLAIM_BASED_REASONS:
         bonus += 0.10
-    
-    type_bonus = _calculate_type_bonus(claim_text, claim_type, targets, query)
+
+    type_bonus = _calculate_type_bonus(claim, profile)
     bonus += type_bonus
-    
-    distractor_penalty = _calculate_distractor_penalty(claim_text, claim_type, targets)
+
+    distractor_penalty = _calculate_distractor_penalty(claim, profile)
     bonus -= distractor_penalty
-    
+
     return max(0.0, min(1.0, base_score + bonus))
 
 
-def _calculate_ngram_overlap(query: str, claim_text: str) -> float:
-    bigram_score = text_util.ngram_jaccard_similarity(query, claim_text, n=2)
-    unigram_score = text_util.jaccard_similarity(query, claim_text)
-    
-    query_entities = set(ent.lower() for ent in text_util.extract_entities(query))
-    claim_entities = set(ent.lower() for ent in text_util.extract_entities(claim_text))
-    
+def _calculate_ngram_overlap(query: TextFeatures, claim: TextFeatures, vocab: TokenVocabulary) -> float:
+    q = query.encoded(vocab)
+    c = claim.encoded(vocab, grow=False)
+    bigram_score = bitset_jaccard(q.bigram_bits, len(q.bigram_keys), c.bigram_bits, len(c.bigram_keys))
+    unigram_score = bitset_jaccard(q.token_bits, len(q.token_ids), c.token_bits, len(c.token_ids))
+
+    query_entities = query.entities_lower
+    claim_entities = claim.entities_lower
+
     entity_overlap = 0.0
     if query_entities and claim_entities:
         entity_overlap = len(query_entities.intersection(claim_entities)) / len(query_entities.union(claim_entities))
-    
-    query_tokens = set(text_util.tokenize(query))
-    claim_tokens = set(text_util.tokenize(claim_text))
-    
+
     token_overlap = 0.0
-    if query_tokens and claim_tokens:
-        token_overlap = len(query_tokens.intersection(claim_tokens)) / len(query_tokens.union(claim_tokens))
-    
+    if q.token_ids and c.token_ids:
+        token_overlap = unigram_score
+
     base_score = (
         0.4 * bigram_score +
         0.3 * unigram_score +
         0.2 * entity_overlap +
         0.1 * token_overlap
     )
-    
+
     if entity_overlap > 0.3 or token_overlap > 0.4:
         base_score = max(base_score, 0.3)
-    
+
     return base_score
 
 
+def _batch_overlap(query_terms: FrozenSet[str], claim_terms: List[FrozenSet[str]]):
+    """Intersection and union sizes of one query term set with many claim term sets."""
+    n = len(claim_terms)
+    sizes = np.fromiter((len(terms) for terms in claim_terms), dtype=np.int64, count=n)
+    # Sparse claims x terms incidence in coordinate form: the row of every
+    # claim term, and whether that term also occurs in the query
+    rows = np.repeat(np.arange(n), sizes)
+    in_query = np.fromiter(
+        (term in query_terms for terms in claim_terms for term in terms), dtype=bool, count=int(sizes.sum())
+    )
+    intersection = np.bincount(rows[in_query], minlength=n)
+    union = len(query_terms) + sizes - intersection
+    return intersection, union, sizes
+
+
+def _batch_bitset_overlap(query_bits: int, query_size: int, claim_bits: List[int], claim_sizes: List[int]):
+    """Intersection and union sizes from bitsets, as _batch_overlap."""
+    n = len(claim_bits)
+    sizes = np.fromiter(claim_sizes, dtype=np.int64, count=n)
+    intersection = np.fromiter(((query_bits & bits).bit_count() for bits in claim_bits), dtype=np.int64, count=n)
+    union = query_size + sizes - intersection
+    return intersection, union, sizes
+
+
+def _batch_ratio(intersection, union):
+    return np.divide(intersection, union, out=np.zeros(len(union)), where=union > 0)
+
+
+def _batch_ngram_overlap(query: TextFeatures, claims: List[TextFeatures], vocab: TokenVocabulary):
+    """Vectorised _calculate_ngram_overlap over many claims (same floating-point operations)."""
+    q = query.encoded(vocab)
+    encoded = [c.encoded(vocab, grow=False) for c in claims]
+
+    inter, union, sizes = _batch_bitset_overlap(
+        q.bigram_bits, len(q.bigram_keys), [e.bigram_bits for e in encoded], [len(e.bigram_keys) for e in encoded]
+    )
+    # set_jaccard conventions: both empty -> 1.0, one empty -> 0.0
+    bigram_score = _batch_ratio(inter, union)
+    bigram_score[(sizes == 0) & (len(q.bigram_keys) == 0)] = 1.0
+
+    inter, union, sizes = _batch_bitset_overlap(
+        q.token_bits, len(q.token_ids), [e.token_bits for e in encoded], [len(e.token_ids) for e in encoded]
+    )
+    unigram_score = _batch_ratio(inter, union)
+    unigram_score[(sizes == 0) & (len(q.token_ids) == 0)] = 1.0
+    token_overlap = _batch_ratio(inter, union)
+    token_overlap[sizes == 0] = 0.0
+
+    inter, union, sizes = _batch_overlap(query.entities_lower, [c.entities_lower for c in claims])
+    entity_overlap = _batch_ratio(inter, union)
+    if not query.entities_lower:
+        entity_overlap[:] = 0.0
+    entity_overlap[sizes == 0] = 0.0
+
+    base_score = (
+        0.4 * bigram_score +
+        0.3 * unigram_score +
+        0.2 * entity_overlap +
+        0.1 * token_overlap
+    )
+    boosted = (entity_overlap > 0.3) | (token_overlap > 0.4)
+    return np.where(boosted, np.maximum(base_score, 0.3), base_score)
+
+
 def _has_domain_token(claim_text: str, source_domain: str) -> bool:
     if not source_domain:
         return False
-    
+
     # Extract meaningful tokens from domain
     domain_parts = source_domain.replace('.', ' ').replace('-', ' ').split()
     domain_tokens = [part for part in domain_parts if len(part) > 3]
-    
+
     claim_lower = claim_text.lower()
     return any(token.lower() in claim_lower for token in domain_tokens)
 
 
-def _calculate_type_bonus(claim_text: str, claim_type: str, targets: Dict[str, Set[str]], query: str) -> float:
+def _calculate_type_bonus(claim: TextFeatures, profile: ClaimProfile) -> float:
     bonus = 0.0
-    claim_lower = claim_text.lower()
-    
+    claim_type = profile.claim_type
+
     if claim_type == "policy":
-        bonus += _policy_bonus(claim_text, targets)
+        bonus += _policy_bonus(claim, profile)
     elif claim_type == "statistics":
-        bonus += _statistics_bonus(claim_text, targets)
+        bonus += _statistics_bonus(claim, profile)
     elif claim_type == "causal":
-        bonus += _causal_bonus(claim_text, targets)
+        bonus += _causal_bonus(claim, profile)
     elif claim_type == "factoid":
-        bonus += _factoid_bonus(claim_text, targets, query)
-    
+        bonus += _factoid_bonus(claim, profile)
+
     return bonus
 
 
-def _policy_bonus(claim_text: str, targets: Dict[str, Set[str]]) -> float:
+def _policy_bonus(claim: TextFeatures, profile: ClaimProfile) -> float:
     bonus = 0.0
-    claim_lower = claim_text.lower()
-    
+
     # Actor present bonus
-    actors = targets.get("actors", set())
-    if any(actor.lower() in claim_lower for actor in actors):
+    if profile.contains_any("actors", claim.lower):
         bonus += 0.08
-    
+
     # Action+object proximity bonus
-    actions = targets.get("actions", set())
-    objects = targets.get("objects", set())
-    
-    if actions and objects:
-        tokens = text_util.tokenize(claim_text)
-        action_positions = []
-        object_positions = []
-        
-        for i, token in enumerate(tokens):
-            if any(action.lower() in token.lower() for action in actions):
-                action_positions.append(i)
-            if any(obj.lower() in token.lower() for obj in objects):
-                object_positions.append(i)
-        
+    targets = profile.targets
+    if targets.get("actions") and targets.get("objects"):
+        action_positions = profile.token_hits("actions", claim.tokens)
+        object_positions = profile.token_hits("objects", claim.tokens)
+
         # Check proximity ≤ 4 tokens
         tight_proximity = False
         for action_pos in action_positions:
@@ -132,134 +252,101 @@ def _policy_bonus(claim_text: str, targets: Dict[str, Set[str]]) -> float:
                     break
             if tight_proximity:
                 break
-        
+
         if tight_proximity:
             bonus += 0.12
-    
+
     return bonus
 
 
-def _statistics_bonus(claim_text: str, targets: Dict[str, Set[str]]) -> float:
+def _statistics_bonus(claim: TextFeatures, profile: ClaimProfile) -> float:
     bonus = 0.0
-    
-    numbers = targets.get("numbers", set())
-    units = targets.get("units", set())
-    subjects = targets.get("subjects", set())
-    
-    claim_lower = claim_text.lower()
-    
+
+    numbers = profile.targets.get("numbers", frozenset())
+
     # All three present bonus
-    has_number = any(num in claim_text for num in numbers)
-    has_unit = any(unit.lower() in claim_lower for unit in units)
-    has_subject = any(subj.lower() in claim_lower for subj in subjects)
-    
+    has_number = profile.contains_any("numbers", claim.text)
+    has_unit = profile.contains_any("units", claim.lower)
+    has_subject = profile.contains_any("subjects", claim.lower)
+
     if has_number and has_unit and has_subject:
         bonus += 0.15
-    
+
     # Exact number match bonus
-    extracted_numbers = text_util.extract_numbers_with_units(claim_text)
-    extracted_nums = {item["number"] for item in extracted_numbers}
-    
+    extracted_nums = {item["number"] for item in claim.numbers}
+
     if numbers.intersection(extracted_nums):
         bonus += 0.10
-    
+
     return bonus
 
 
-def _causal_bonus(claim_text: str, targets: Dict[str, Set[str]]) -> float:
+def _causal_bonus(claim: TextFeatures, profile: ClaimProfile) -> float:
     bonus = 0.0
-    claim_lower = claim_text.lower()
-    
+    claim_lower = claim.lower
+
     # Explicit causal verbs
-    causal_verbs = ['cause', 'causes', 'caused', 'lead', 'leads', 'led', 'result', 'results', 'resulted']
-    if any(verb in claim_lower for verb in causal_verbs):
+    if _CAUSAL_VERB_MATCHER.search(claim_lower):
         bonus += 0.10
-    
+
     # Causal phrases
-    causal_phrases = ['leads to', 'results in', 'due to', 'because of', 'associated with', 'linked to']
-    if any(phrase in claim_lower for phrase in causal_phrases):
+    if _CAUSAL_PHRASE_MATCHER.search(claim_lower):
         bonus += 0.12
-    
+
     # Cause→effect order bonus
-    causes = targets.get("causes", set())
-    effects = targets.get("effects", set())
-    
-    if causes and effects:
-        tokens = text_util.tokenize(claim_text)
-        cause_positions = []
-        effect_positions = []
-        
-        for i, token in enumerate(tokens):
-            if any(cause.lower() in token.lower() for cause in causes):
-                cause_positions.append(i)
-            if any(effect.lower() in token.lower() for effect in effects):
-                effect_positions.append(i)
-        
+    targets = profile.targets
+    if targets.get("causes") and targets.get("effects"):
+        cause_positions = profile.token_hits("causes", claim.tokens)
+        effect_positions = profile.token_hits("effects", claim.tokens)
+
         # Check if any cause appears before any effect
         if cause_positions and effect_positions:
             min_cause = min(cause_positions)
             min_effect = min(effect_positions)
             if min_cause < min_effect:
                 bonus += 0.08
-    
+
     return bonus
 
 
-def _factoid_bonus(claim_text: str, targets: Dict[str, Set[str]], query: str) -> float:
+def _factoid_bonus(claim: TextFeatures, profile: ClaimProfile) -> float:
     bonus = 0.0
-    claim_lower = claim_text.lower()
-    
+    claim_lower = claim.lower
+
     # Speaker name bonus
-    speakers = targets.get("speakers", set())
-    if any(speaker.lower() in claim_lower for speaker in speakers):
+    if profile.contains_any("speakers", claim_lower):
         bonus += 0.10
-    
+
     # Quoted content bonus
-    if '"' in claim_text or "'" in claim_text:
+    if '"' in claim.text or "'" in claim.text:
         bonus += 0.08
-    
+
     # Reported speech patterns
-    speech_patterns = [
-        r'\b(said|stated|claimed|announced|declared|reported|told|mentioned)\b',
-        r'\b(according\s+to|reported\s+by)\b'
-    ]
-    
-    if any(re.search(pattern, claim_lower) for pattern in speech_patterns):
+    if any(pattern.search(claim_lower) for pattern in SPEECH_PATTERNS):
         bonus += 0.06
-    
+
     return bonus
 
 
-def _calculate_distractor_penalty(claim_text: str, claim_type: str, targets: Dict[str, Set[str]]) -> float:
+def _calculate_distractor_penalty(claim: TextFeatures, profile: ClaimProfile) -> float:
     penalty = 0.0
-    
-    entities = text_util.extract_entities(claim_text)
-    
+
+    entities = claim.entities
+
     if not entities:
         return penalty
-    
-    # Get relevant target entities for this claim type
-    relevant_entities = set()
-    if claim_type == "policy":
-        relevant_entities.update(targets.get("actors", set()))
-        relevant_entities.update(targets.get("objects", set()))
-    elif claim_type == "statistics":
-        relevant_entities.update(targets.get("subjects", set()))
-    elif claim_type == "causal":
-        relevant_entities.update(targets.get("causes", set()))
-        relevant_entities.update(targets.get("effects", set()))
-    elif claim_type == "factoid":
-        relevant_entities.update(targets.get("speakers", set()))
-    
+
+    relevant_entities = profile.relevant_entities
+
     # Count entities not in relevant targets
     distractor_count = 0
     for entity in entities:
         entity_lower = entity.lower()
-        if not any(target.lower() in entity_lower or entity_lower in target.lower() for target in relevant_entities):
+        if not any(target in entity_lower or entity_lower in target for target in relevant_entities):
             distractor_count += 1
-    
+
     # Apply penalty for distractors
     if distractor_count > 0:
         penalty = min(0.05 * distractor_count, 0.15)  # Cap at 0.15
-    
+
     return penalty
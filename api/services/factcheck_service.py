@@ -1,60 +1,414 @@
+import asyncio
 import hashlib
 import logging
+import re
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
 from config import settings
-from providers.factcheck_google import fetch_claims
+from providers.factcheck_google import (
+    FactCheckCircuitOpen, FactCheckError, FactCheckRateLimited, fetch_claims, query_cache,
+)
+from providers.factcheck_local import claim_index, ingest_factchecks, search_local_claims
+from services.cache_backend import BackendCache, CacheBackend, MemoryBackend, shared_backend
+from services.quota import quota_manager
 from schemas import FactCheckItem, FactCheckResult
 from .factcheck_query import build_queries
-from .claims import claim_miner
-from .textutil import text_util
-from .factcheck_filters import passes_gates
-from .factcheck_score import score_item
+from .claims import ClaimProfile, claim_miner
+from .textutil import text_util, NearDuplicateIndex
+from .factcheck_score import score_items
+from .metrics import cache_lookups, factcheck_early_stops, stage_seconds
+from .tracing import span
 
 DEFAULT_MAX_AGE_MONTHS = 18
+QUERY_PAGE_SIZE = 5
 logger = logging.getLogger(__name__)
 
-class FactCheckCache:
-    def __init__(self):
-        self._cache: Dict[str, Tuple[FactCheckResult, datetime]] = {}
-    
-    def get(self, key: str) -> Optional[FactCheckResult]:
-        if key not in self._cache:
-            return None
-        
-        result, timestamp = self._cache[key]
-        ttl_minutes = settings.fact_check_cache_ttl_min
-        if datetime.now() - timestamp > timedelta(minutes=ttl_minutes):
-            del self._cache[key]
-            return None
-        
-        return result
+class FactCheckCache(BackendCache):
+    """
+    TTL + LRU cache of final fact-check results.
+
+    Stored in a cache backend (services.cache_backend): by default a
+    private in-process MemoryBackend, bounded by max_entries and,
+    optionally, by the approximate serialized size of the stored results
+    (max_bytes); with a shared backend configured, in the store every
+    worker reads, as plain dicts. Entries stored by background warming are
+    flagged, and the first read of each one is counted in warm_hits.
+    """
     
-    def set(self, key: str, result: FactCheckResult) -> None:
-        self._cache[key] = (result, datetime.now())
+    def __init__(self, max_entries: int = 100_000, max_bytes: int = 0, backend: Optional[CacheBackend] = None):
+        super().__init__(
+            "factcheck",
+            backend or MemoryBackend(max_entries=max_entries, max_bytes=max_bytes),
+            to_wire=lambda result: result.model_dump(mode="json", exclude_defaults=True),
+            from_wire=FactCheckResult.model_validate,
+        )
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
     
-    def clear_expired(self) -> None:
-        now = datetime.now()
-        ttl_minutes = settings.fact_check_cache_ttl_min
-        expired_keys = [k for k, (_, t) in self._cache.items() if now - t > timedelta(minutes=ttl_minutes)]
-        for key in expired_keys:
-            del self._cache[key]
+    def set(self, key: str, result: FactCheckResult, ttl_s: Optional[float] = None, warmed: bool = False) -> None:
+        if ttl_s is None:
+            ttl_s = settings.fact_check_cache_ttl_min * 60
+        size = len(result.model_dump_json()) if self.max_bytes > 0 and not self._shared else 0
+        super().set(key, result, ttl_s, warmed=warmed, size=size)
+
+
+_cache = FactCheckCache(
+    max_entries=settings.fact_check_cache_max_entries,
+    max_bytes=settings.fact_check_cache_max_bytes,
+    backend=shared_backend(),
+)
+
+
+async def run_cache_housekeeping(interval_s: float = 30.0) -> None:
+    """Periodically drop expired fact-check cache entries, off the request path."""
+    while True:
+        await asyncio.sleep(interval_s)
+        removed = await _cache.run(_cache.clear_expired)
+        if removed:
+            logger.info(f"Fact-check cache housekeeping removed {removed} entries")
+
+
+async def _fetch_query(query: str, api_key: str, language: str) -> List[FactCheckItem]:
+    items = await fetch_claims(
+        query=query,
+        api_key=api_key,
+        language=language,
+        page_size=QUERY_PAGE_SIZE
+    )
+    ingest_factchecks(items)
+    return items
+
+
+class SharedClaimFetcher:
+    """
+    Upstream query executor shared by the headlines of one batch.
 
+    Headlines from one search page plan many identical queries; the first
+    request for a query starts a single upstream call and every later
+    request (concurrent or not) awaits the same task, so each distinct
+    query is fetched at most once per batch. Upstream concurrency is
+    bounded for the whole batch. A headline that stops early only stops
+    waiting: shared calls keep running for the other headlines until
+    close(). With max_queries set, queries beyond that many distinct ones
+    are refused (FactCheckRateLimited).
+    """
 
-_cache = FactCheckCache()
+    def __init__(self, api_key: str, language: str = "en", concurrency: int = 8, max_queries: Optional[int] = None):
+        self.api_key = api_key
+        self.language = language
+        self.max_queries = max_queries
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._tasks: Dict[Tuple[str, str, int], asyncio.Task] = {}
+        self.requested = 0
+
+    @property
+    def executed(self) -> int:
+        return len(self._tasks)
+
+    async def fetch(self, query: str) -> List[FactCheckItem]:
+        self.requested += 1
+        key = query_cache.make_key(query, self.language, QUERY_PAGE_SIZE)
+        task = self._tasks.get(key)
+        if task is None:
+            if self.max_queries is not None and len(self._tasks) >= self.max_queries:
+                raise FactCheckRateLimited("Query budget for this batch is spent")
+            task = asyncio.create_task(self._run(query))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._tasks[key] = task
+        items = await asyncio.shield(task)
+        # Each headline annotates its own copies (matchReason, similarity)
+        return [item.model_copy() for item in items]
+
+    async def _run(self, query: str) -> List[FactCheckItem]:
+        async with self._semaphore:
+            return await _fetch_query(query, self.api_key, self.language)
+
+    def close(self) -> None:
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+
+
+# Trailing " - Reuters", " | CNN", " — AP News" style publisher suffixes
+_SOURCE_SUFFIX_RE = re.compile(r'\s+[-\u2013\u2014|]\s+([^-\u2013\u2014|]+)$')
+_MAX_SUFFIX_WORDS = 4
+
+
+def canonical_headline_tokens(headline: str) -> FrozenSet[str]:
+    """Headline tokens without case, punctuation, stopwords, order or a publisher suffix."""
+    text = headline.strip()
+    m = _SOURCE_SUFFIX_RE.search(text)
+    if m and len(m.group(1).split()) <= _MAX_SUFFIX_WORDS and len(text[:m.start()].split()) >= 3:
+        text = text[:m.start()]
+    return text_util.extract_tokens_set(text, min_length=1)
 
 
 def _make_cache_key(headline: str, source_domain: Optional[str], max_age_months: int = DEFAULT_MAX_AGE_MONTHS) -> str:
+    if settings.fact_check_canonical_keys:
+        headline = " ".join(sorted(canonical_headline_tokens(headline)))
     key_text = f"{headline}|{source_domain or ''}|{max_age_months}"
     return hashlib.sha1(key_text.encode()).hexdigest()
 
 
+# The similar-headline index prunes keys that left the result cache once it
+# has doubled since the last pruning (and holds at least this many)
+SIMILAR_REBUILD_MIN_ENTRIES = 1024
+
+
+class SimilarHeadlineIndex:
+    """
+    Finds cached results of near-identical headlines.
+
+    Canonical headline token sets of cached results are indexed with
+    MinHash/LSH (NearDuplicateIndex), each tagged with its cache key and
+    scope (source domain and max age, which change the result). A lookup
+    returns the key of the oldest still-cached headline in the same scope
+    whose Jaccard similarity is above the threshold. Keys that left the
+    cache are skipped; once the index has doubled since it was last
+    rebuilt, or outgrows max_entries (the result cache's bound), it is
+    rebuilt from the keys that are still cached, keeping at most the
+    newest max_entries. Lookups against a shared cache store run in
+    worker threads, so the index is locked; liveness checks (cache
+    lookups) happen outside the lock.
+    """
+
+    def __init__(self, threshold: float = 0.8, max_entries: int = 0):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._index = NearDuplicateIndex(threshold=threshold)
+        self._keys: List[str] = []
+        self._entries: Dict[str, Tuple[FrozenSet[str], str, str]] = {}  # key -> (tokens, scope, headline)
+        self._schedule_rebuild(0)
+        self.lookups = 0
+        self.canonical_hits = 0
+        self.similar_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        self._index = NearDuplicateIndex(threshold=self.threshold)
+        self._keys = []
+        self._entries = {}
+        self._schedule_rebuild(0)
+
+    def _schedule_rebuild(self, live: int) -> None:
+        rebuild_at = max(2 * live, SIMILAR_REBUILD_MIN_ENTRIES)
+        if self.max_entries:
+            # Some slack above the bound, so a full index isn't rebuilt on every add
+            rebuild_at = min(rebuild_at, self.max_entries + max(1, self.max_entries // 10))
+        self._rebuild_at = rebuild_at
+
+    def headline_for(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        return entry[2] if entry else None
+
+    def find(self, tokens: FrozenSet[str], scope: str, is_live: Callable[[str], bool]) -> Optional[str]:
+        with self._lock:
+            candidates = []
+            for doc_id in self._index.find_all(tokens):
+                key = self._keys[doc_id]
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] == scope:
+                    candidates.append(key)
+        for key in candidates:
+            if is_live(key):
+                return key
+        return None
+
+    def add(self, key: str, tokens: FrozenSet[str], scope: str, headline: str, is_live: Callable[[str], bool]) -> None:
+        if not tokens:
+            return
+        with self._lock:
+            stale = key not in self._entries and len(self._entries) >= self._rebuild_at
+        if stale:
+            self._rebuild(is_live)
+        with self._lock:
+            if key not in self._entries:
+                self._keys.append(key)
+                self._index.add(tokens)
+            self._entries[key] = (tokens, scope, headline)
+
+    def _rebuild(self, is_live: Callable[[str], bool]) -> None:
+        with self._lock:
+            snapshot = list(self._entries)
+        dead = {key for key in snapshot if not is_live(key)}
+        with self._lock:
+            # Entries added meanwhile were not checked and are kept
+            live = [(key, entry) for key, entry in self._entries.items() if key not in dead]
+            if self.max_entries and len(live) > self.max_entries:
+                live = live[-self.max_entries:]
+            self._clear()
+            for key, entry in live:
+                self._keys.append(key)
+                self._index.add(entry[0])
+                self._entries[key] = entry
+            self._schedule_rebuild(len(live))
+
+    def stats(self) -> Dict[str, float]:
+        reused = self.canonical_hits + self.similar_hits
+        return {
+            "lookups": self.lookups,
+            "canonical_hits": self.canonical_hits,
+            "similar_hits": self.similar_hits,
+            "reuse_rate": reused / self.lookups if self.lookups else 0.0,
+            "indexed": len(self._entries),
+        }
+
+
+similar_headlines = SimilarHeadlineIndex(
+    threshold=settings.fact_check_similar_threshold,
+    max_entries=settings.fact_check_cache_max_entries,
+)
+
+
+def _scope(source_domain: Optional[str], max_age_months: int) -> str:
+    return f"{source_domain or ''}|{max_age_months}"
+
+
+def _similar_key(headline: str, source_domain: Optional[str], max_age_months: int) -> Optional[str]:
+    if not settings.fact_check_canonical_keys or settings.fact_check_similar_threshold >= 1:
+        return None
+    return similar_headlines.find(
+        canonical_headline_tokens(headline), _scope(source_domain, max_age_months), _cache.contains
+    )
+
+
+def _get_cached(headline: str, source_domain: Optional[str], max_age_months: int) -> Optional[FactCheckResult]:
+    """Cached result for this headline, its canonical form or (optionally) a near-identical headline."""
+    cache_key = _make_cache_key(headline, source_domain, max_age_months)
+    result = _cache.get(cache_key)
+    if not settings.fact_check_canonical_keys:
+        return result
+
+    similar_headlines.lookups += 1
+    if result is not None:
+        stored_headline = similar_headlines.headline_for(cache_key)
+        if stored_headline is not None and stored_headline != headline:
+            similar_headlines.canonical_hits += 1
+        return result
+
+    similar_key = _similar_key(headline, source_domain, max_age_months)
+    if similar_key is not None:
+        result = _cache.get(similar_key)
+        if result is not None:
+            similar_headlines.similar_hits += 1
+            logger.info(f"Reusing fact-check of '{similar_headlines.headline_for(similar_key)[:60]}'")
+    return result
+
+
+def _set_cached(
+    headline: str,
+    source_domain: Optional[str],
+    max_age_months: int,
+    result: FactCheckResult,
+    ttl_s: Optional[float] = None,
+    warmed: bool = False
+) -> None:
+    cache_key = _make_cache_key(headline, source_domain, max_age_months)
+    _cache.set(cache_key, result, ttl_s=ttl_s, warmed=warmed)
+    if settings.fact_check_canonical_keys:
+        similar_headlines.add(
+            cache_key, canonical_headline_tokens(headline), _scope(source_domain, max_age_months),
+            headline, _cache.contains
+        )
+
+
+def is_cached(headline: str, source_domain: Optional[str], max_age_months: int = DEFAULT_MAX_AGE_MONTHS) -> bool:
+    """True if find_best_factchecks would answer these arguments from the cache."""
+    effective_max_age = _get_intelligent_recency_default(headline, max_age_months)
+    if _cache.contains(_make_cache_key(headline, source_domain, effective_max_age)):
+        return True
+    return _similar_key(headline, source_domain, effective_max_age) is not None
+
+
+async def is_cached_async(headline: str, source_domain: Optional[str], max_age_months: int = DEFAULT_MAX_AGE_MONTHS) -> bool:
+    """is_cached for async code: runs in a worker thread when the cache is a shared store."""
+    return await _cache.run(is_cached, headline, source_domain, max_age_months)
+
+
+def _item_key(item: FactCheckItem) -> Tuple[str, str]:
+    return (item.claim.lower().strip(), str(item.url) if item.url else "")
+
+
+def _claim_shingles(claim: str) -> List[str]:
+    return text_util.normalize_text(claim).split()
+
+
+def _score_items(
+    items: List[FactCheckItem],
+    query: str,
+    reason: str,
+    source_domain: Optional[str],
+    profile: ClaimProfile,
+    near_dups: NearDuplicateIndex
+) -> List[FactCheckItem]:
+    """Score one query's items as a batch, skipping near-duplicates of claims already kept."""
+    shingles = [_claim_shingles(item.claim) for item in items]
+    fresh = []
+    for i, item in enumerate(items):
+        if near_dups.find(shingles[i]) is not None:
+            logger.info(f"Near-duplicate: '{item.claim[:60]}...'")
+        else:
+            fresh.append(i)
+    
+    scores = score_items(
+        query=query,
+        claim_texts=[items[i].claim for i in fresh],
+        source_domain=source_domain,
+        published_ats=[items[i].publishedAt for i in fresh],
+        profile=profile,
+        reason=reason
+    )
+    
+    scored_items = []
+    for i, score in zip(fresh, scores):
+        item = items[i]
+        item.matchReason = reason
+        
+        if score < 0:
+            logger.info(f"Gated out: '{item.claim[:60]}...'")
+            continue
+        
+        # Near-duplicates within the batch: the first one to pass the gates wins
+        if near_dups.find(shingles[i]) is not None:
+            logger.info(f"Near-duplicate: '{item.claim[:60]}...'")
+            continue
+        
+        item.similarity = round(score, 3)
+        near_dups.add(shingles[i])
+        scored_items.append(item)
+    return scored_items
+
+
+def _merge_items(collected_items: List[FactCheckItem], seen_keys: set, scored_items: List[FactCheckItem]) -> bool:
+    """Append unseen items; returns True once the collected items are good enough to stop."""
+    for item in scored_items:
+        key = _item_key(item)
+        if key not in seen_keys:
+            seen_keys.add(key)
+            collected_items.append(item)
+    
+    if len(collected_items) >= 3:
+        avg_score = sum(item.similarity or 0 for item in collected_items) / len(collected_items)
+        if avg_score >= 0.55:
+            logger.info(f"Early stop: {len(collected_items)} items, avg={avg_score:.3f}")
+            return True
+    return False
+
+
 def _deduplicate_items(items: List[FactCheckItem]) -> List[FactCheckItem]:
     seen = set()
     unique_items = []
     for item in items:
-        key = (item.claim.lower().strip(), str(item.url) if item.url else "")
+        key = _item_key(item)
         if key not in seen:
             seen.add(key)
             unique_items.append(item)
@@ -130,91 +484,141 @@ async def find_best_factchecks(
     summary: Optional[str] = None,
     max_items: int = 3,
     max_age_months: int = DEFAULT_MAX_AGE_MONTHS,
-    language: str = "en"
+    language: str = "en",
+    fetcher: Optional[SharedClaimFetcher] = None,
+    warm: bool = False
 ) -> FactCheckResult:
-    if not settings.fact_check_enabled or not settings.google_factcheck_api_key:
+    """
+    Find the best fact-checks for a headline (cached per headline, source
+    domain and effective max age).
+    
+    With warm=True the result is being precomputed (see
+    services.factcheck_warm): the cache is not read, and the stored entry
+    is flagged so the first real request for it counts as a warm hit.
+    """
+    api_key = settings.google_factcheck_api_key
+    if not settings.fact_check_enabled or (not api_key and not len(claim_index)):
         return FactCheckResult(status="none", items=[])
 
     # Apply intelligent recency default
     effective_max_age = _get_intelligent_recency_default(headline, max_age_months)
     
-    cache_key = _make_cache_key(headline, source_domain, effective_max_age)
-    cached_result = _cache.get(cache_key)
-    if cached_result:
-        return cached_result
-
-    _cache.clear_expired()
+    if not warm:
+        cached_result = await _cache.run(_get_cached, headline, source_domain, effective_max_age)
+        cache_lookups.inc("factcheck_result", "hit" if cached_result else "miss")
+        if cached_result:
+            return cached_result
     
-    queries = build_queries(headline, source_domain, summary)
+    # Mine, classify and compile the claim once for planning, gating and scoring
+    with stage_seconds.time("claim_profile"), span("claim_profile"):
+        profile = claim_miner.build_profile(headline, summary)
+    with stage_seconds.time("build_queries"), span("build_queries"):
+        queries = build_queries(headline, source_domain, summary, profile=profile)
     logger.info(f"Generated {len(queries)} queries for: '{headline[:80]}...'")
     
     collected_items: List[FactCheckItem] = []
-    api_key = settings.google_factcheck_api_key
-    
-    core_claims = claim_miner.extract_core_claims(headline, summary, max_claims=3)
-    primary_claim = core_claims[0] if core_claims else headline
-    claim_type = claim_miner.classify_claim(primary_claim)
-    claim_targets_dict = claim_miner.extract_targets(primary_claim, claim_type)
+    seen_keys = set()
+    near_dups = NearDuplicateIndex(threshold=settings.factcheck_claim_dedup_threshold)
     
     all_targets = set()
-    for target_set in claim_targets_dict.values():
+    for target_set in profile.targets.values():
         all_targets.update(target_set)
     
-    logger.info(f"Claim type: {claim_type}, targets: {len(all_targets)}")
+    logger.info(f"Claim type: {profile.claim_type}, targets: {len(all_targets)}")
+    
+    # Local ClaimReview store first; the API only fills the gaps: queries
+    # whose page is already filled locally are not sent upstream
+    stop = False
+    api_queries: List[Dict[str, str]] = []
+    for query_info in queries:
+        query = query_info.get("q", "")
+        local_items = search_local_claims(query, limit=QUERY_PAGE_SIZE) if query.strip() else []
+        with stage_seconds.time("score"), span("score", desc=f"local {len(local_items)}"):
+            scored_items = _score_items(local_items, query, query_info.get("reason", "unknown"), source_domain, profile, near_dups)
+        if len(scored_items) < QUERY_PAGE_SIZE:
+            api_queries.append(query_info)
+        if _merge_items(collected_items, seen_keys, scored_items):
+            factcheck_early_stops.inc("local")
+            stop = True
+            break
+    if collected_items:
+        logger.info(f"Local store: {len(collected_items)} items, {len(api_queries)} queries left for the API")
+    
+    if stop or not api_key:
+        api_queries = []
+    queries = api_queries
+    
+    # Late in the day, spend what's left of the budget on the best queries only
+    remaining_budget = await asyncio.to_thread(quota_manager.remaining, "factcheck") if queries else None
+    if remaining_budget is not None and remaining_budget < len(queries):
+        logger.warning(f"Fact-check budget low ({remaining_budget} left), capping queries")
+        queries = queries[:max(remaining_budget, 0)]
 
-    for i, query_info in enumerate(queries, 1):
+    async def run_query(i: int, query_info: Dict[str, str]) -> List[FactCheckItem]:
         query = query_info.get("q", "")
         reason = query_info.get("reason", "unknown")
-        if not query.strip():
+        async with semaphore:
+            logger.info(f"Executing query {i}/{len(queries)}: [{reason}] '{query}'")
+            if fetcher is not None:
+                items = await fetcher.fetch(query)
+            else:
+                items = await _fetch_query(query, api_key, language)
+        logger.info(f"Query {i} returned {len(items)} items")
+        return items
+    
+    # Issue queries concurrently in priority order (the semaphore wakes
+    # waiters FIFO), but score and merge results strictly in query order so
+    # near-duplicate collapse, the early-stop decision and the final
+    # ranking match sequential execution, and results that arrive after an
+    # early stop are never scored.
+    semaphore = asyncio.Semaphore(max(1, settings.factcheck_query_concurrency))
+    tasks: List[Tuple[int, Dict[str, str], asyncio.Task]] = []
+    for i, query_info in enumerate(queries, 1):
+        if not query_info.get("q", "").strip():
             logger.warning(f"Skipping empty query {i}")
             continue
-        logger.info(f"Executing query {i}/{len(queries)}: [{reason}] '{query}'")
-        try:
-            items = await fetch_claims(
-                query=query,
-                api_key=api_key,
-                language=language,
-                page_size=5
-            )
-            logger.info(f"Query {i} returned {len(items)} items")
-            scored_items = []
-            for item in items:
-                item.matchReason = reason
-                query_text = query_info.get("q", "")
-                
-                score = score_item(
-                    query=query_text,
-                    claim_text=item.claim,
-                    source_domain=source_domain,
-                    published_at=item.publishedAt,
-                    claim_type=claim_type,
-                    targets=claim_targets_dict,
-                    reason=reason
-                )
-                
-                if score < 0:
-                    logger.info(f"Gated out: '{item.claim[:60]}...'")
-                    continue
-                
-                item.similarity = round(score, 3)
-                scored_items.append(item)
-            
-            collected_items.extend(scored_items)
-            collected_items = _deduplicate_items(collected_items)
+        task = asyncio.create_task(run_query(i, query_info))
+        # Results of tasks abandoned after an early stop are never awaited
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        tasks.append((i, query_info, task))
+    
+    # Set when an upstream failure (not a lack of matches) may explain a
+    # poor result, so it is cached only briefly
+    degraded = False
+    try:
+        for i, query_info, task in tasks:
+            reason = query_info.get("reason", "unknown")
+            try:
+                items = await task
+                with stage_seconds.time("score"), span("score", desc=f"q{i} {len(items)}"):
+                    scored_items = _score_items(items, query_info.get("q", ""), reason, source_domain, profile, near_dups)
+            except FactCheckCircuitOpen as e:
+                # Every remaining query would be refused the same way
+                degraded = True
+                logger.warning(f"Query {i} [{reason}] skipped: {str(e)}")
+                break
+            except FactCheckError as e:
+                degraded = True
+                logger.warning(f"Query {i} [{reason}] failed: {str(e)}")
+                continue
+            except Exception as e:
+                logger.error(f"Query {i} [{reason}] failed: {str(e)}")
+                continue
             
-            if len(collected_items) >= 3:
-                avg_score = sum(item.similarity or 0 for item in collected_items) / len(collected_items)
-                if avg_score >= 0.55:
-                    logger.info(f"Early stop: {len(collected_items)} items, avg={avg_score:.3f}")
-                    break
-        except Exception as e:
-            logger.error(f"Query {i} [{reason}] failed: {str(e)}")
-            continue
+            if _merge_items(collected_items, seen_keys, scored_items):
+                factcheck_early_stops.inc("api")
+                break
+    finally:
+        # Cancel whatever is still queued or in flight
+        for _, _, task in tasks:
+            if not task.done():
+                task.cancel()
     
+    none_ttl_s = settings.fact_check_degraded_cache_ttl_s if degraded else None
     if not collected_items:
         logger.info("No items passed gates")
         result = FactCheckResult(status="none", items=[])
-        _cache.set(cache_key, result)
+        await _cache.run(_set_cached, headline, source_domain, effective_max_age, result, ttl_s=none_ttl_s, warmed=warm)
         return result
     
     collected_items = _deduplicate_items(collected_items)
@@ -230,8 +634,59 @@ async def find_best_factchecks(
     
     if not final_items:
         result = FactCheckResult(status="none", items=[])
+        await _cache.run(_set_cached, headline, source_domain, effective_max_age, result, ttl_s=none_ttl_s, warmed=warm)
     else:
         result = FactCheckResult(status="found", items=final_items)
-    
-    _cache.set(cache_key, result)
-    return result
\ No newline at end of file
+        await _cache.run(_set_cached, headline, source_domain, effective_max_age, result, warmed=warm)
+    return result
+
+async def find_best_factchecks_batch(
+    requests: Sequence[Dict],
+    language: str = "en"
+) -> AsyncIterator[Tuple[int, FactCheckResult]]:
+    """
+    Fact-check many headlines, yielding (index, result) as each finishes.
+
+    `requests` are find_best_factchecks keyword arguments (headline,
+    source_domain, summary, max_items, max_age_months). Identical requests
+    run once, and all headlines share one SharedClaimFetcher, so a query
+    planned by several headlines goes upstream once. Each headline keeps
+    its own gating, scoring, early stop and result cache entry, so its
+    result is the one find_best_factchecks would return alone.
+    """
+    fetcher = SharedClaimFetcher(
+        api_key=settings.google_factcheck_api_key or "",
+        language=language,
+        concurrency=settings.factcheck_batch_concurrency,
+    )
+
+    async def run_one(kwargs: Dict) -> FactCheckResult:
+        try:
+            return await find_best_factchecks(**kwargs, language=language, fetcher=fetcher)
+        except Exception as e:
+            logger.error(f"Batch fact-check failed for '{kwargs.get('headline', '')[:60]}': {str(e)}")
+            return FactCheckResult(status="none", items=[])
+
+    indices_by_key: Dict[Tuple, List[int]] = {}
+    for index, kwargs in enumerate(requests):
+        indices_by_key.setdefault(tuple(sorted(kwargs.items())), []).append(index)
+
+    pending: Dict[asyncio.Task, List[int]] = {}
+    for key, indices in indices_by_key.items():
+        pending[asyncio.create_task(run_one(dict(key)))] = indices
+
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                for index in pending.pop(task):
+                    yield index, result
+    finally:
+        for task in pending:
+            task.cancel()
+        fetcher.close()
+        logger.info(
+            f"Fact-check batch: {len(requests)} headlines, "
+            f"{fetcher.requested} API queries requested, {fetcher.executed} distinct"
+        )
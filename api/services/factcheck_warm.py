@@ -0,0 +1,184 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from config import settings
+from providers.registry import news_registry
+from utils.normalize import canonicalize_url
+from . import extract, factcheck_service
+
+logger = logging.getLogger(__name__)
+
+# (headline, source domain)
+TrendingHeadline = Tuple[str, Optional[str]]
+
+
+def _frontend_max_age(headline: str) -> int:
+    # Same default the analyze page sends, so warmed entries share its cache key
+    headline_lower = headline.lower()
+    return 12 if 'court' in headline_lower or 'scotus' in headline_lower else 18
+
+
+def _source_domain(url: Optional[str]) -> Optional[str]:
+    # The analyze page sends the article URL's hostname
+    if not url:
+        return None
+    try:
+        return urlparse(url).hostname
+    except ValueError:
+        return None
+
+
+def load_headlines(path: str) -> List[TrendingHeadline]:
+    """Read "headline" or "headline<TAB>url" lines from a local list."""
+    headlines = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            headline, _, url = line.rstrip("\n").partition("\t")
+            if headline.strip():
+                headlines.append((headline.strip(), _source_domain(url.strip())))
+    return headlines
+
+
+class FactCheckWarmer:
+    """
+    Periodic precomputation of fact-checks for trending headlines.
+
+    Each run takes the current trending headlines (a local list, or the
+    top results of the news providers for a few warm queries), skips the
+    ones already cached, and fact-checks the rest one at a time through a
+    single SharedClaimFetcher, so queries shared by several headlines go
+    upstream once. A daily budget caps the distinct upstream queries
+    started. Results are stored under the same key /factcheck computes
+    for the analyze page (headline as extracted when the article is in
+    the extraction cache, article hostname, default max age) and flagged
+    as warmed, so the cache's warm_hits counts how many were used.
+    """
+
+    def __init__(
+        self,
+        top_n: int = 20,
+        daily_budget: int = 200,
+        queries: Sequence[str] = ("news",),
+        headlines_path: Optional[str] = None,
+    ):
+        self.top_n = top_n
+        self.daily_budget = daily_budget
+        self.queries = [q for q in queries if q.strip()]
+        self.headlines_path = headlines_path
+        self._budget_day = date.today()
+        self._used_today = 0
+        self.runs = 0
+        self.warmed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def _remaining_budget(self) -> int:
+        today = date.today()
+        if today != self._budget_day:
+            self._budget_day = today
+            self._used_today = 0
+        return self.daily_budget - self._used_today
+
+    async def trending_headlines(self) -> List[TrendingHeadline]:
+        if self.headlines_path:
+            try:
+                return load_headlines(self.headlines_path)[:self.top_n]
+            except OSError as e:
+                logger.error(f"Failed to read trending headlines: {str(e)}")
+                return []
+
+        headlines: List[TrendingHeadline] = []
+        seen = set()
+        for query in self.queries:
+            try:
+                result = await news_registry.search(query, page=1, page_size=self.top_n)
+            except Exception as e:
+                logger.warning(f"Trending search for '{query}' failed: {str(e)}")
+                continue
+            for item in result.get("items", []):
+                url = item.get("url")
+                headline = (await extract.cached_headline_async(canonicalize_url(url)) if url else None) or item.get("title")
+                if not headline or headline in seen:
+                    continue
+                seen.add(headline)
+                headlines.append((headline, _source_domain(url)))
+        return headlines[:self.top_n]
+
+    async def run_once(self) -> int:
+        """Warm the current trending headlines; returns how many results were stored."""
+        self.runs += 1
+        budget = self._remaining_budget()
+        if budget <= 0:
+            return 0
+
+        fetcher = factcheck_service.SharedClaimFetcher(
+            api_key=settings.google_factcheck_api_key or "",
+            concurrency=settings.factcheck_query_concurrency,
+            max_queries=budget,
+        )
+        stored = 0
+        try:
+            for headline, source_domain in await self.trending_headlines():
+                max_age_months = _frontend_max_age(headline)
+                if await factcheck_service.is_cached_async(headline, source_domain, max_age_months):
+                    self.skipped += 1
+                    continue
+                if fetcher.executed >= budget:
+                    self.skipped += 1
+                    continue
+                try:
+                    await factcheck_service.find_best_factchecks(
+                        headline=headline,
+                        source_domain=source_domain,
+                        max_age_months=max_age_months,
+                        fetcher=fetcher,
+                        warm=True,
+                    )
+                    self.warmed += 1
+                    stored += 1
+                except Exception as e:
+                    self.failed += 1
+                    logger.warning(f"Warm fact-check failed for '{headline[:60]}': {str(e)}")
+        finally:
+            fetcher.close()
+            self._used_today += fetcher.executed
+
+        stats = self.stats()
+        logger.info(
+            f"Fact-check warming: {stored} headlines warmed with {fetcher.executed} queries; "
+            f"{stats['warm_hits']}/{self.warmed} warmed results used so far"
+        )
+        return stored
+
+    def stats(self) -> Dict[str, float]:
+        warm_hits = factcheck_service._cache.warm_hits
+        return {
+            "runs": self.runs,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "warm_hits": warm_hits,
+            "warm_hit_ratio": warm_hits / self.warmed if self.warmed else 0.0,
+            "budget_remaining": self._remaining_budget(),
+        }
+
+
+factcheck_warmer = FactCheckWarmer(
+    top_n=settings.factcheck_warm_top_n,
+    daily_budget=settings.factcheck_warm_daily_budget,
+    queries=settings.factcheck_warm_queries.split(","),
+    headlines_path=settings.factcheck_warm_headlines_path,
+)
+
+
+async def run_factcheck_warming(interval_s: float) -> None:
+    """Warm trending fact-checks every interval_s seconds, off the request path."""
+    while True:
+        try:
+            await factcheck_warmer.run_once()
+        except Exception as e:
+            logger.error(f"Fact-check warming run failed: {str(e)}")
+        await asyncio.sleep(interval_s)
@@ -0,0 +1,247 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds; from sub-millisecond CPU stages to upstream timeouts
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (suffix, labels, value) samples of one metric family, as produced by collectors
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic count per label combination."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            return [("", self._labels(k), v) for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    """Current value per label combination."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {} if labels else {(): 0.0}
+
+    def set(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    @contextmanager
+    def track(self, *label_values: str) -> Iterator[None]:
+        """Count the enclosed block as in progress."""
+        self.inc(*label_values)
+        try:
+            yield
+        finally:
+            self.dec(*label_values)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            return [("", self._labels(k), v) for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    """
+    Bucketed distribution per label combination.
+
+    Observations land in one (non-cumulative) bucket each; the cumulative
+    `le` counts Prometheus expects are only computed when rendering, so
+    observe() is a bisect and three additions.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        """Observe the wall time of the enclosed block, in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def count(self, *label_values: str) -> int:
+        entry = self._values.get(label_values)
+        return entry[2] if entry else 0
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        with self._lock:
+            entries = [(k, list(v[0]), v[1], v[2]) for k, v in self._values.items()]
+        for label_values, counts, total, count in entries:
+            labels = self._labels(label_values)
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, count))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Metrics of this process, rendered in the Prometheus text format.
+
+    Counters, gauges and histograms are updated on the request path.
+    Components that already keep their own statistics (caches, warmers,
+    quotas, the circuit breaker) are exported through collectors instead:
+    callables run at scrape time that return (name, kind, help, samples).
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        families = [(m.name, m.kind, m.help, m.samples()) for m in self._metrics.values()]
+        for collector in self._collectors:
+            families.extend(collector())
+
+        lines = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def stats_samples(stats: Dict[str, object], labels: Optional[Dict[str, str]] = None,
+                  key_label: str = "stat") -> List[Sample]:
+    """Gauge samples from a component's stats() dict, one per numeric value."""
+    samples = []
+    for key, value in stats.items():
+        if isinstance(value, (int, float)):
+            samples.append(("", {**(labels or {}), key_label: key}, float(value)))
+    return samples
+
+
+metrics = MetricsRegistry()
+
+stage_seconds = metrics.histogram(
+    "thebiaslens_stage_seconds",
+    "Time spent per processing stage",
+    ("stage",),
+)
+factcheck_query_seconds = metrics.histogram(
+    "thebiaslens_factcheck_upstream_query_seconds",
+    "Fact Check API query latency by outcome",
+    ("outcome",),
+)
+http_request_seconds = metrics.histogram(
+    "thebiaslens_http_request_seconds",
+    "HTTP request latency by route and status",
+    ("method", "route", "status"),
+)
+http_in_flight = metrics.gauge(
+    "thebiaslens_http_requests_in_flight",
+    "HTTP requests currently being handled",
+)
+cache_lookups = metrics.counter(
+    "thebiaslens_cache_lookups_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ("cache", "result"),
+)
+factcheck_early_stops = metrics.counter(
+    "thebiaslens_factcheck_early_stops_total",
+    "Fact-check searches stopped early with enough good items, by phase",
+    ("phase",),
+)
@@ -0,0 +1,201 @@
+import logging
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QuotaLimit:
+    rate_per_s: float      # token bucket refill rate
+    burst: int             # token bucket capacity
+    daily_budget: int      # calls per UTC day, 0 = unlimited
+
+
+class QuotaManager:
+    """
+    Token buckets plus daily budgets per upstream key, shared across workers.
+
+    State lives in a small SQLite file so every uvicorn worker on the host
+    draws from the same buckets; each update runs in an IMMEDIATE
+    transaction, which serialises concurrent writers. The file is in WAL
+    mode with synchronous=NORMAL, so commits don't wait for an fsync; the
+    calls still block on a busy writer, so async code runs them through
+    asyncio.to_thread. Callers either take
+    tokens one call at a time (`try_acquire`), reserve a batch up front and
+    hand back what they did not use (`reserve`/`release`), or just look at
+    what is left (`remaining`) to plan less work.
+    """
+
+    def __init__(self, path: str, limits: Dict[str, QuotaLimit]):
+        self.limits = dict(limits)
+        self._lock = threading.Lock()
+        try:
+            self._conn = self._connect(path)
+        except sqlite3.Error as e:
+            logger.error(f"Quota store {path} unavailable ({str(e)}), using per-process quotas")
+            self._conn = self._connect(":memory:")
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS quota ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL,"
+            " day TEXT NOT NULL, used INTEGER NOT NULL)"
+        )
+        return conn
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _update(self, key: str, requested: int, minimum: int) -> int:
+        """
+        Atomically take between `minimum` and `requested` tokens.
+
+        Returns the number granted (0 if fewer than `minimum` are available).
+        A negative `requested` returns tokens instead.
+        """
+        limit = self.limits.get(key)
+        if limit is None:
+            return max(requested, 0)
+
+        now = time.time()
+        today = self._today()
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                row = cur.execute("SELECT tokens, updated, day, used FROM quota WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    tokens, used = float(limit.burst), 0
+                else:
+                    tokens, updated, day, used = row
+                    tokens = min(float(limit.burst), tokens + (now - updated) * limit.rate_per_s)
+                    if day != today:
+                        used = 0
+
+                if requested < 0:
+                    granted = requested
+                    tokens = min(float(limit.burst), tokens - requested)
+                    used = max(0, used + requested)
+                else:
+                    available = int(tokens)
+                    if limit.daily_budget > 0:
+                        available = min(available, limit.daily_budget - used)
+                    granted = min(requested, max(available, 0))
+                    if granted < minimum:
+                        granted = 0
+                    tokens -= granted
+                    used += granted
+
+                cur.execute(
+                    "INSERT OR REPLACE INTO quota (key, tokens, updated, day, used) VALUES (?, ?, ?, ?, ?)",
+                    (key, tokens, now, today, used),
+                )
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+        return granted
+
+    def try_acquire(self, key: str, n: int = 1) -> bool:
+        """Take `n` tokens if all of them are available."""
+        return self._update(key, n, n) == n
+
+    def reserve(self, key: str, n: int) -> int:
+        """Take up to `n` tokens; returns how many were granted."""
+        return self._update(key, n, 1) if n > 0 else 0
+
+    def release(self, key: str, n: int) -> None:
+        """Return unused reserved tokens to the bucket and daily budget."""
+        if n > 0:
+            self._update(key, -n, 0)
+
+    def exhaust(self, key: str) -> None:
+        """Mark today's budget as spent, e.g. after the upstream reports rate limiting."""
+        limit = self.limits.get(key)
+        if limit is None or limit.daily_budget <= 0:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quota (key, tokens, updated, day, used) VALUES (?, 0, ?, ?, ?)",
+                (key, time.time(), self._today(), limit.daily_budget),
+            )
+
+    def _state(self, key: str) -> Optional[Dict[str, float]]:
+        limit = self.limits.get(key)
+        if limit is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT tokens, updated, day, used FROM quota WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            tokens, used = float(limit.burst), 0
+        else:
+            tokens, updated, day, used = row
+            tokens = min(float(limit.burst), tokens + (time.time() - updated) * limit.rate_per_s)
+            if day != self._today():
+                used = 0
+        daily_remaining = limit.daily_budget - used if limit.daily_budget > 0 else None
+        return {"tokens": tokens, "used_today": used, "daily_remaining": daily_remaining}
+
+    def remaining(self, key: str) -> Optional[int]:
+        """Calls left in today's budget (None when the key has no daily limit)."""
+        state = self._state(key)
+        return None if state is None else state["daily_remaining"]
+
+    def retry_after_s(self, key: str) -> int:
+        """Seconds until a call for `key` could be granted again (next UTC day if the budget is spent)."""
+        state = self._state(key)
+        if state is None:
+            return 1
+        if state["daily_remaining"] is not None and state["daily_remaining"] <= 0:
+            now = datetime.now(timezone.utc)
+            midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            return max(1, math.ceil((midnight - now).total_seconds()))
+        rate = self.limits[key].rate_per_s
+        if rate <= 0:
+            return 1
+        return max(1, math.ceil((1.0 - state["tokens"]) / rate))
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Current usage for every configured key, for metrics."""
+        result = {}
+        for key, limit in self.limits.items():
+            state = self._state(key)
+            result[key] = {
+                "daily_budget": limit.daily_budget,
+                "used_today": state["used_today"],
+                "daily_remaining": state["daily_remaining"],
+                "tokens": round(state["tokens"], 3),
+            }
+        return result
+
+
+quota_manager = QuotaManager(
+    settings.quota_db_path or os.path.join(tempfile.gettempdir(), "thebiaslens-quota.sqlite3"),
+    {
+        "newsapi": QuotaLimit(
+            rate_per_s=settings.newsapi_rate_per_s,
+            burst=settings.newsapi_burst,
+            daily_budget=settings.newsapi_daily_budget,
+        ),
+        "factcheck": QuotaLimit(
+            rate_per_s=settings.factcheck_rate_per_s,
+            burst=settings.factcheck_burst,
+            daily_budget=settings.factcheck_daily_budget,
+        ),
+    },
+)
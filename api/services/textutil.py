@@ -1,10 +1,40 @@
+import random
 import re
-from typing import List, Set, Dict
+import zlib
+from array import array
+from bisect import bisect_right
+from functools import cached_property, lru_cache
+from typing import List, Set, Dict, FrozenSet, Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple
 from collections import Counter
 
+from config import settings
+
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_SPACE_RE = re.compile(r'\s+')
+
+
 class TextUtil:
+    """
+    Text normalization, tokenization and similarity helpers.
+
+    normalize_text, tokenize, extract_tokens_set and extract_ngram_set are
+    memoized in bounded LRU caches keyed by (text, min_length or n): one
+    fact-check request looks at the same headline, summary and claims many
+    times. Cached results are immutable (str, tuple, frozenset).
+    `memo_enabled` switches the caches off; `memo_stats()` reports hits and
+    misses.
+
+    The two-text Jaccard helpers compare these memoized frozensets; scoring
+    one query against many candidates goes through a shared TokenVocabulary
+    and bitsets instead (see ClaimProfile).
+    """
     
-    def __init__(self):
+    def __init__(self, memo_size: int = 4096, memo_enabled: bool = True):
+        self.memo_enabled = memo_enabled
+        self._normalize_memo = lru_cache(maxsize=memo_size)(self._normalize)
+        self._tokenize_memo = lru_cache(maxsize=memo_size)(self._tokenize)
+        self._token_set_memo = lru_cache(maxsize=memo_size)(self._token_set)
+        self._ngram_set_memo = lru_cache(maxsize=memo_size)(self._ngram_set)
         self.stop_words = {
             'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
             'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
@@ -17,21 +47,63 @@ class TextUtil:
             'too', 'very', 'what', 'when', 'where', 'which', 'who', 'why'
         }
     
+    def _normalize(self, text: str) -> str:
+        text = text.lower()
+        text = _PUNCT_RE.sub(' ', text)
+        text = _SPACE_RE.sub(' ', text).strip()
+        return text
+    
+    def _tokenize(self, text: str, min_length: int) -> Tuple[str, ...]:
+        tokens = self.normalize_text(text).split()
+        return tuple(t for t in tokens if len(t) >= min_length and t not in self.stop_words)
+    
+    def _token_set(self, text: str, min_length: int) -> FrozenSet[str]:
+        return frozenset(self.tokenize(text, min_length))
+    
+    def _ngram_set(self, text: str, n: int) -> FrozenSet[str]:
+        tokens = self.tokenize(text)
+        if len(tokens) < n:
+            return frozenset(tokens)
+        return frozenset(' '.join(tokens[i:i+n]) for i in range(len(tokens) - n + 1))
+    
     def normalize_text(self, text: str) -> str:
         if not text:
             return ""
-        text = text.lower()
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        return self._normalize_memo(text) if self.memo_enabled else self._normalize(text)
+    
+    def tokenize(self, text: str, min_length: int = 3) -> Tuple[str, ...]:
+        if not text:
+            return ()
+        return self._tokenize_memo(text, min_length) if self.memo_enabled else self._tokenize(text, min_length)
     
-    def tokenize(self, text: str, min_length: int = 3) -> List[str]:
-        normalized = self.normalize_text(text)
-        tokens = normalized.split()
-        return [t for t in tokens if len(t) >= min_length and t not in self.stop_words]
+    def extract_tokens_set(self, text: str, min_length: int = 3) -> FrozenSet[str]:
+        if not text:
+            return frozenset()
+        return self._token_set_memo(text, min_length) if self.memo_enabled else self._token_set(text, min_length)
     
-    def extract_tokens_set(self, text: str, min_length: int = 3) -> Set[str]:
-        return set(self.tokenize(text, min_length))
+    def extract_ngram_set(self, text: str, n: int = 2) -> FrozenSet[str]:
+        if not text:
+            return frozenset()
+        return self._ngram_set_memo(text, n) if self.memo_enabled else self._ngram_set(text, n)
+    
+    def memo_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters and current size of each memo cache."""
+        stats = {}
+        for name, memo in (
+            ("normalize", self._normalize_memo),
+            ("tokenize", self._tokenize_memo),
+            ("token_set", self._token_set_memo),
+            ("ngram_set", self._ngram_set_memo),
+        ):
+            info = memo.cache_info()
+            stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+        return stats
+    
+    def clear_memo(self) -> None:
+        self._normalize_memo.cache_clear()
+        self._tokenize_memo.cache_clear()
+        self._token_set_memo.cache_clear()
+        self._ngram_set_memo.cache_clear()
     
     def jaccard_similarity(self, text1: str, text2: str) -> float:
         tokens1 = self.extract_tokens_set(text1)
@@ -48,19 +120,8 @@ class TextUtil:
         return intersection / union if union > 0 else 0.0
     
     def ngram_jaccard_similarity(self, text1: str, text2: str, n: int = 2) -> float:
-        def get_ngrams(text: str, n: int) -> Set[str]:
-            tokens = self.tokenize(text)
-            if len(tokens) < n:
-                return set(tokens)
-            
-            ngrams = set()
-            for i in range(len(tokens) - n + 1):
-                ngram = ' '.join(tokens[i:i+n])
-                ngrams.add(ngram)
-            return ngrams
-        
-        ngrams1 = get_ngrams(text1, n)
-        ngrams2 = get_ngrams(text2, n)
+        ngrams1 = self.extract_ngram_set(text1, n)
+        ngrams2 = self.extract_ngram_set(text2, n)
         
         if not ngrams1 and not ngrams2:
             return 1.0
@@ -121,4 +182,378 @@ class TextUtil:
         return unique_entities[:10]
 
 
-text_util = TextUtil()
\ No newline at end of file
+text_util = TextUtil(memo_size=settings.textutil_memo_size, memo_enabled=settings.textutil_memo_enabled)
+
+
+# Separator used when scanning a token list as one string; keywords
+# containing it are never matched against tokens
+_TOKEN_SEP = "\x00"
+
+
+class KeywordMatcher:
+    """
+    Compiled multi-pattern substring matcher.
+
+    All keywords are folded into one regex alternation (longest first), so
+    a single scan of the text answers "does any keyword occur" and finds
+    every position where one starts, instead of looping over keywords (and
+    tokens) in Python. Matching is case-sensitive: lowercase both sides
+    when needed.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: FrozenSet[str] = frozenset(k for k in keywords if k)
+        ordered = sorted(self.keywords, key=lambda k: (-len(k), k))
+        alternation = "|".join(re.escape(k) for k in ordered)
+        self._any = re.compile(alternation) if ordered else None
+        # Lookahead finds a (longest) keyword at every start position, overlaps included
+        self._all = re.compile(f"(?=({alternation}))") if ordered else None
+        token_keywords = [k for k in ordered if _TOKEN_SEP not in k]
+        self._token = re.compile("|".join(re.escape(k) for k in token_keywords)) if token_keywords else None
+        # Keywords contained in each keyword, so present() also reports shorter
+        # keywords hidden under a longer match at the same position
+        self._contained: Dict[str, Tuple[str, ...]] = {
+            k: tuple(other for other in self.keywords if other in k) for k in self.keywords
+        }
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def search(self, text: str) -> bool:
+        """True if any keyword is a substring of text (== any(k in text for k in keywords))."""
+        return self._any is not None and self._any.search(text) is not None
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """(start, keyword) for every position where a keyword starts, longest keyword per position."""
+        if self._all is None:
+            return []
+        return [(m.start(), m.group(1)) for m in self._all.finditer(text)]
+
+    def present(self, text: str) -> Set[str]:
+        """The set of keywords occurring anywhere in text."""
+        found: Set[str] = set()
+        for _, keyword in self.find_all(text):
+            found.update(self._contained[keyword])
+        return found
+
+    def token_hits(self, tokens: Sequence[str]) -> List[int]:
+        """Indices of tokens containing any keyword (== [i for i, t in enumerate(tokens) if any(k in t ...)])."""
+        if self._token is None or not tokens:
+            return []
+        joined = _TOKEN_SEP.join(tokens)
+        starts = []
+        offset = 0
+        for token in tokens:
+            starts.append(offset)
+            offset += len(token) + 1
+
+        hits = []
+        pos = 0
+        while True:
+            m = self._token.search(joined, pos)
+            if m is None:
+                break
+            index = bisect_right(starts, m.start()) - 1
+            hits.append(index)
+            if index + 1 >= len(starts):
+                break
+            # Continue with the next token; one hit per token is enough
+            pos = starts[index + 1]
+        return hits
+
+
+# Packed bigram keys are ((first_id + 1) << 32) | second_id, so they never
+# collide with plain token ids (< 2**32), which texts with fewer than two
+# tokens use as their "bigrams"
+_PAIR_SHIFT = 32
+
+
+class EncodedText(NamedTuple):
+    """A text's unique token ids and packed bigram keys, plus their bitsets."""
+    token_ids: array      # sorted unique token ids, array('I')
+    bigram_keys: array    # sorted unique packed bigrams, array('Q')
+    token_bits: int       # one bit per interned token
+    bigram_bits: int      # one bit per interned bigram
+
+
+class TokenVocabulary:
+    """
+    Interns tokens (and packed bigrams) to dense integer ids.
+
+    Texts encoded against the same vocabulary compare as integers: the
+    intersection of two token or bigram sets is one AND plus a popcount of
+    their bitsets, with no strings or sets built per comparison.
+
+    Reference texts (queries) are encoded with grow=True and intern all
+    their tokens; candidates are encoded with grow=False, which only looks
+    tokens up. A candidate's unknown tokens get ids past the end of the
+    vocabulary, so they count towards its sizes but set no bits: the
+    vocabulary (and every bitset) stays as small as the reference texts,
+    however many candidates are scored. Two grow=False encodings are only
+    comparable through what they share with the vocabulary, so compare
+    candidates against reference texts, not with each other.
+    """
+
+    def __init__(self):
+        self._token_ids: Dict[str, int] = {}
+        self._pair_ids: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._token_ids)
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        """Changes whenever a token or bigram is interned."""
+        return len(self._token_ids), len(self._pair_ids)
+
+    def intern(self, token: str) -> int:
+        token_ids = self._token_ids
+        return token_ids.setdefault(token, len(token_ids))
+
+    def encode(self, tokens: Sequence[str], grow: bool = True) -> EncodedText:
+        token_ids = self._token_ids
+        pair_ids = self._pair_ids
+        known = len(token_ids)
+        if grow:
+            ids = [token_ids.setdefault(token, len(token_ids)) for token in tokens]
+            known = len(token_ids)
+        else:
+            unknown: Dict[str, int] = {}
+            get = token_ids.get
+            ids = [get(token) for token in tokens]
+            for i, token_id in enumerate(ids):
+                if token_id is None:
+                    ids[i] = unknown.setdefault(tokens[i], known + len(unknown))
+
+        unique_ids = sorted(set(ids))
+        if len(ids) < 2:
+            # Same convention as TextFeatures.bigrams: short texts use their tokens
+            bigram_keys = unique_ids
+        else:
+            bigram_keys = sorted({((a + 1) << _PAIR_SHIFT) | b for a, b in zip(ids, ids[1:])})
+
+        token_bits = 0
+        for token_id in unique_ids:
+            if token_id >= known:
+                break
+            token_bits |= 1 << token_id
+        bigram_bits = 0
+        if grow:
+            for key in bigram_keys:
+                bigram_bits |= 1 << pair_ids.setdefault(key, len(pair_ids))
+        else:
+            for key in bigram_keys:
+                pair_id = pair_ids.get(key)
+                if pair_id is not None:
+                    bigram_bits |= 1 << pair_id
+        return EncodedText(array('I', unique_ids), array('Q', bigram_keys), token_bits, bigram_bits)
+
+
+def bitset_jaccard(a_bits: int, a_size: int, b_bits: int, b_size: int) -> float:
+    """set_jaccard on bitsets of known sizes (both empty -> 1.0, one empty -> 0.0)."""
+    if not a_size and not b_size:
+        return 1.0
+    if not a_size or not b_size:
+        return 0.0
+    intersection = (a_bits & b_bits).bit_count()
+    return intersection / (a_size + b_size - intersection)
+
+
+class TextFeatures:
+    """
+    Lazily computed, reusable views of one text (tokens, bigrams, entities...).
+
+    Gating and scoring look at the same candidate text many times; wrapping
+    it once means each derived view is computed at most once.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._encoded: Optional[Tuple[TokenVocabulary, bool, Tuple[int, int], EncodedText]] = None
+
+    def encoded(self, vocab: TokenVocabulary, grow: bool = True) -> EncodedText:
+        """
+        Integer encoding of the tokens against `vocab`; see TokenVocabulary.encode.
+
+        Cached until another vocabulary is used or, for grow=False, until
+        the vocabulary has interned new tokens.
+        """
+        version = vocab.version
+        cached = self._encoded
+        if cached is not None and cached[0] is vocab and (cached[1] or (not grow and cached[2] == version)):
+            return cached[3]
+        encoded = vocab.encode(self.tokens, grow=grow)
+        self._encoded = (vocab, grow, vocab.version, encoded)
+        return encoded
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self) -> Tuple[str, ...]:
+        return text_util.tokenize(self.text)
+
+    @cached_property
+    def token_set(self) -> FrozenSet[str]:
+        return text_util.extract_tokens_set(self.text)
+
+    @cached_property
+    def bigrams(self) -> FrozenSet[str]:
+        # Same convention as TextUtil.ngram_jaccard_similarity(n=2)
+        tokens = self.tokens
+        if len(tokens) < 2:
+            return frozenset(tokens)
+        return frozenset(' '.join(tokens[i:i + 2]) for i in range(len(tokens) - 1))
+
+    @cached_property
+    def entities(self) -> List[str]:
+        return text_util.extract_entities(self.text)
+
+    @cached_property
+    def entities_lower(self) -> FrozenSet[str]:
+        return frozenset(ent.lower() for ent in self.entities)
+
+    @cached_property
+    def numbers(self) -> List[Dict[str, str]]:
+        return text_util.extract_numbers_with_units(self.text)
+
+
+def set_jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard of two sets with TextUtil's conventions (both empty -> 1.0)."""
+    if not a and not b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def overlap_coefficient(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Shared elements relative to the smaller set (0.0 if either is empty)."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+# MinHash permutations h(x) = (a*x + b) mod p, seeded so signatures are stable
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_PERM_RNG = random.Random(1)
+_PERMUTATIONS = [
+    (_PERM_RNG.randrange(1, _MERSENNE_PRIME), _PERM_RNG.randrange(0, _MERSENNE_PRIME)) for _ in range(256)
+]
+
+
+@lru_cache(maxsize=65536)
+def _token_minhashes(token: str, num_perm: int) -> Tuple[int, ...]:
+    """The token's value under the first num_perm permutations (cached: vocabularies are small)."""
+    h = zlib.crc32(token.encode("utf-8"))
+    return tuple(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for a, b in _PERMUTATIONS[:num_perm])
+
+
+def _lsh_bands(threshold: float, num_perm: int, recall: float = 0.99) -> int:
+    """
+    Fewest bands (i.e. most rows per band, fewest false candidates) that
+    still make a set at exactly `threshold` similarity a candidate with
+    probability >= recall. Candidates are verified exactly, so missing
+    true duplicates is the costly error.
+    """
+    for rows in range(num_perm, 0, -1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            return bands
+    return num_perm
+
+
+class NearDuplicateIndex:
+    """
+    Near-duplicate detection over token sets with MinHash and LSH banding.
+
+    Each added set gets a MinHash signature split into bands; sets sharing
+    any band land in the same bucket and become candidates, which are then
+    verified with the exact similarity. Checking or adding one set costs
+    O(num_perm) regardless of how many sets are indexed, instead of
+    comparing against every previous set. `metric` is "jaccard" or
+    "overlap" (overlap coefficient); sets count as duplicates when the
+    similarity is above `threshold`. More bands find lower-similarity
+    candidates at the cost of more verifications.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: Optional[int] = None,
+                 metric: str = "jaccard"):
+        if num_perm > len(_PERMUTATIONS):
+            raise ValueError(f"num_perm must be at most {len(_PERMUTATIONS)}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands or _lsh_bands(threshold, num_perm)
+        self.rows = num_perm // self.bands
+        self._similarity = overlap_coefficient if metric == "overlap" else set_jaccard
+        self._sets: List[FrozenSet[str]] = []
+        self._buckets: List[Dict[object, List[int]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def signature(self, tokens: FrozenSet[str]) -> List[int]:
+        num_perm = self.num_perm
+        return list(map(min, zip(*[_token_minhashes(t, num_perm) for t in tokens])))
+
+    def _band_keys(self, signature: List[int]) -> List:
+        rows = self.rows
+        if rows == 1:
+            return signature
+        return [tuple(signature[i * rows:(i + 1) * rows]) for i in range(self.bands)]
+
+    def find(self, tokens: Iterable[str]) -> Optional[int]:
+        """Id of the earliest indexed set similar to `tokens`, or None."""
+        token_set = frozenset(tokens)
+        if not token_set or not self._sets:
+            return None
+        return self._find(token_set, self._band_keys(self.signature(token_set)))
+
+    def find_all(self, tokens: Iterable[str]) -> List[int]:
+        """Ids of all indexed sets similar to `tokens`, oldest first."""
+        token_set = frozenset(tokens)
+        if not token_set or not self._sets:
+            return []
+        return list(self._matches(token_set, self._band_keys(self.signature(token_set))))
+
+    def _matches(self, token_set: FrozenSet[str], band_keys: List) -> Iterator[int]:
+        candidates = set()
+        for bucket, key in zip(self._buckets, band_keys):
+            ids = bucket.get(key)
+            if ids:
+                candidates.update(ids)
+        for doc_id in sorted(candidates):
+            if self._similarity(token_set, self._sets[doc_id]) > self.threshold:
+                yield doc_id
+
+    def _find(self, token_set: FrozenSet[str], band_keys: List) -> Optional[int]:
+        return next(self._matches(token_set, band_keys), None)
+
+    def add(self, tokens: Iterable[str]) -> Optional[int]:
+        """Index a token set unconditionally; returns its id (None for an empty set)."""
+        token_set = frozenset(tokens)
+        if not token_set:
+            return None
+        return self._add(token_set, self._band_keys(self.signature(token_set)))
+
+    def _add(self, token_set: FrozenSet[str], band_keys: List) -> int:
+        doc_id = len(self._sets)
+        self._sets.append(token_set)
+        for bucket, key in zip(self._buckets, band_keys):
+            bucket.setdefault(key, []).append(doc_id)
+        return doc_id
+
+    def add_if_new(self, tokens: Iterable[str]) -> bool:
+        """Index the set unless it near-duplicates an indexed one; True if it was added."""
+        token_set = frozenset(tokens)
+        if not token_set:
+            return True
+        band_keys = self._band_keys(self.signature(token_set))
+        if self._sets and self._find(token_set, band_keys) is not None:
+            return False
+        self._add(token_set, band_keys)
+        return True
@@ -0,0 +1,277 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Set
+
+from config import settings
+from utils.lazy import lazy_import
+
+logger = logging.getLogger(__name__)
+
+# Only needed when exporting to a collector
+httpx = lazy_import("httpx")
+
+SERVICE_NAME = "thebiaslens-api"
+
+# W3C trace context: version-traceid-parentid-flags
+_TRACEPARENT_RE = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# Keeps the Server-Timing header well below common proxy header limits
+MAX_SERVER_TIMING_ENTRIES = 40
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+
+
+def _new_id(n_bytes: int) -> str:
+    return os.urandom(n_bytes).hex()
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error", "kind")
+
+    def __init__(self, name: str, span_id: str, parent_id: Optional[str], attributes: Dict[str, Any],
+                 kind: int = SPAN_KIND_INTERNAL):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.kind = kind
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class Trace:
+    """
+    Spans recorded while handling one request.
+
+    The root span stands for the request itself; spans opened with
+    span() while the trace is current become its descendants, including
+    spans from tasks created inside the request (they inherit the
+    context). A trace is always collected for the Server-Timing header;
+    `sampled` decides whether it is also exported.
+    """
+
+    def __init__(self, name: str, sampled: bool = False, trace_id: Optional[str] = None,
+                 parent_id: Optional[str] = None):
+        self.trace_id = trace_id or _new_id(16)
+        self.sampled = sampled
+        self.root = Span(name, _new_id(8), parent_id, {}, kind=SPAN_KIND_SERVER)
+        self.spans: List[Span] = []
+
+    def finish(self, **attributes: Any) -> None:
+        self.root.end_ns = time.time_ns()
+        self.root.attributes.update(attributes)
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: one entry per span in start order, then the total."""
+        entries = []
+        for span in sorted(self.spans, key=lambda s: s.start_ns)[:MAX_SERVER_TIMING_ENTRIES - 1]:
+            entry = f"{span.name};dur={span.duration_ms:.1f}"
+            desc = span.attributes.get("desc")
+            if desc:
+                entry += f';desc="{_header_text(desc)}"'
+            entries.append(entry)
+        end_ns = self.root.end_ns or time.time_ns()
+        entries.append(f"total;dur={(end_ns - self.root.start_ns) / 1e6:.1f}")
+        return ", ".join(entries)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """The trace as an OTLP/JSON ExportTraceServiceRequest."""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [self._otlp_span(s) for s in [self.root] + self.spans],
+                }],
+            }],
+        }
+
+    def _otlp_span(self, span: Span) -> Dict[str, Any]:
+        otlp = {
+            "traceId": self.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns or span.start_ns),
+            "attributes": _otlp_attributes(span.attributes),
+            # 2 = error, 0 = unset
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+        }
+        if span.parent_id:
+            otlp["parentSpanId"] = span.parent_id
+        return otlp
+
+
+def _header_text(value: Any) -> str:
+    # Quoted-string in a header: latin-1 only, no quotes or backslashes
+    text = str(value)[:80].replace("\\", "").replace('"', "'")
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        result.append({"key": key, "value": typed})
+    return result
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class span:
+    """
+    Record the enclosed block as a span of the current request's trace.
+
+    Outside a traced request this is a no-op costing one context variable
+    lookup, so library code can be instrumented unconditionally. Keyword
+    arguments become span attributes; `desc` is also shown in the
+    Server-Timing header.
+    """
+    __slots__ = ("name", "attributes", "_trace", "_span", "_token")
+
+    def __init__(self, name: str, **attributes: Any):
+        self.name = name
+        self.attributes = attributes
+        self._span = None
+
+    def __enter__(self) -> Optional[Span]:
+        trace = _current_trace.get()
+        if trace is None:
+            return None
+        parent = _current_span.get()
+        self._trace = trace
+        self._span = Span(self.name, _new_id(8), parent.span_id if parent else trace.root.span_id, self.attributes)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        recorded = self._span
+        if recorded is None:
+            return
+        recorded.end_ns = time.time_ns()
+        if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+            recorded.error = f"{exc_type.__name__}: {exc}"
+        self._trace.spans.append(recorded)
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited in a different context than entered (e.g. a generator)
+            _current_span.set(None)
+
+
+def set_attributes(**attributes: Any) -> None:
+    """Add attributes to the innermost open span, if any."""
+    current = _current_span.get()
+    if current is not None and _current_trace.get() is not None:
+        current.attributes.update(attributes)
+
+
+def start_trace(name: str, traceparent: Optional[str] = None, sample_rate: Optional[float] = None) -> Trace:
+    """
+    Begin a trace for the current context (one request).
+
+    An incoming W3C traceparent header continues the caller's trace (its
+    trace id and parent span). Export is always decided by sample_rate,
+    not the caller's sampled flag, so clients cannot force exports.
+    """
+    rate = settings.trace_sample_rate if sample_rate is None else sample_rate
+    trace_id = parent_id = None
+    sampled = rate > 0 and random.random() < rate
+    match = _TRACEPARENT_RE.match((traceparent or "").strip().lower())
+    if match and int(match.group(1), 16) and int(match.group(2), 16):
+        trace_id, parent_id = match.group(1), match.group(2)
+    trace = Trace(name, sampled=sampled, trace_id=trace_id, parent_id=parent_id)
+    _current_trace.set(trace)
+    _current_span.set(None)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def detach() -> None:
+    """Stop recording into an inherited trace (background tasks started from a request)."""
+    _current_trace.set(None)
+    _current_span.set(None)
+
+
+class TraceExporter:
+    """
+    Writes sampled traces as OTLP/JSON.
+
+    To a file, one ExportTraceServiceRequest per line, and/or to an
+    OTLP/HTTP collector (e.g. http://localhost:4318/v1/traces). Collector
+    posts run in the background; a failing collector is logged and
+    otherwise ignored, never slowing the request that produced the trace.
+    """
+
+    def __init__(self, path: Optional[str] = None, url: Optional[str] = None, timeout_s: float = 2.0):
+        self.path = path
+        self.url = url
+        self.timeout_s = timeout_s
+        self._lock = threading.Lock()
+        self._pending: Set[asyncio.Task] = set()
+        self.exported = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path or self.url)
+
+    def export(self, trace: Trace) -> None:
+        if not self.enabled:
+            return
+        payload = trace.to_otlp()
+        if self.path:
+            try:
+                with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+                self.exported += 1
+            except OSError as e:
+                self.failed += 1
+                logger.warning(f"Trace export to {self.path} failed: {str(e)}")
+        if self.url:
+            try:
+                task = asyncio.get_running_loop().create_task(self._post(payload))
+            except RuntimeError:
+                return
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _post(self, payload: Dict[str, Any]) -> None:
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout_s) as client:
+                response = await client.post(self.url, json=payload)
+                response.raise_for_status()
+            self.exported += 1
+        except httpx.HTTPError as e:
+            self.failed += 1
+            logger.warning(f"Trace export to {self.url} failed: {str(e)}")
+
+
+trace_exporter = TraceExporter(path=settings.trace_export_path, url=settings.trace_export_url)
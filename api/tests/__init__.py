@@ -0,0 +1,10 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Keep the quota store of a test run away from the dev server's (and from
+# other runs'): the shared default lives in the system temp directory
+_quota_dir = tempfile.mkdtemp(prefix="thebiaslens-tests-")
+atexit.register(shutil.rmtree, _quota_dir, ignore_errors=True)
+os.environ["QUOTA_DB_PATH"] = os.path.join(_quota_dir, "quota.sqlite3")
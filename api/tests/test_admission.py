@@ -0,0 +1,123 @@
+"""Unit tests for per-endpoint admission control and load shedding."""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from schemas import FactCheckResult
+from services.admission import AdmissionController, Overloaded, admission_shed
+
+
+class TestAdmissionController(unittest.IsolatedAsyncioTestCase):
+    """Test cases for concurrency limits, the bounded queue and queue deadlines."""
+
+    async def test_queue_full_is_shed_and_slots_hand_over(self):
+        """Test that requests beyond the queue are shed and a released slot goes to the oldest waiter."""
+        controller = AdmissionController("test", max_concurrency=1, max_queue=1, queue_timeout_s=5)
+        await controller.acquire()
+        waiting = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        self.assertEqual(controller.queued, 1)
+
+        shed_before = admission_shed.value("test", "queue_full")
+        with self.assertRaises(Overloaded) as raised:
+            await controller.acquire()
+        self.assertEqual(raised.exception.reason, "queue_full")
+        self.assertGreaterEqual(raised.exception.retry_after_s, 1)
+        self.assertEqual(admission_shed.value("test", "queue_full") - shed_before, 1)
+
+        controller.release()
+        await waiting
+        self.assertEqual((controller.in_flight, controller.queued), (1, 0))
+        controller.release()
+        self.assertEqual(controller.in_flight, 0)
+
+    async def test_queue_deadline(self):
+        """Test that a waiter is shed when its queue time runs out, leaving no trace in the queue."""
+        controller = AdmissionController("test", max_concurrency=1, max_queue=5, queue_timeout_s=0.05)
+        await controller.acquire()
+        with self.assertRaises(Overloaded) as raised:
+            await controller.acquire()
+        self.assertEqual(raised.exception.reason, "queue_timeout")
+        self.assertEqual((controller.in_flight, controller.queued), (1, 0))
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        """Test that a client disconnecting while queued frees its place."""
+        controller = AdmissionController("test", max_concurrency=1, max_queue=5, queue_timeout_s=5)
+        await controller.acquire()
+        waiting = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        controller.release()
+        self.assertEqual((controller.in_flight, controller.queued), (0, 0))
+
+    async def test_bypass_takes_no_slot(self):
+        """Test that bypassed requests (cache hits) run even when every slot is busy."""
+        controller = AdmissionController("test", max_concurrency=1, max_queue=0, queue_timeout_s=5)
+        async with controller.admit():
+            async with controller.admit(bypass=True):
+                self.assertEqual(controller.in_flight, 1)
+            with self.assertRaises(Overloaded):
+                async with controller.admit():
+                    pass
+        self.assertEqual((controller.in_flight, controller.bypassed, controller.shed), (0, 1, 1))
+
+    def test_retry_after_grows_with_backlog(self):
+        """Test that Retry-After reflects the service time and queue, within bounds."""
+        controller = AdmissionController("test", max_concurrency=2, max_queue=100, queue_timeout_s=5)
+        controller._service_s = 1.0
+        self.assertEqual(controller.retry_after_s(), 1)
+        controller._waiters.extend(object() for _ in range(9))
+        self.assertEqual(controller.retry_after_s(), 5)
+        controller._service_s = 100.0
+        self.assertEqual(controller.retry_after_s(), 30)
+
+
+class TestAdmissionEndpoints(unittest.TestCase):
+    """Test cases for 503 responses and the endpoints that are never shed."""
+
+    def setUp(self):
+        from fastapi.testclient import TestClient
+        import main
+
+        self.main = main
+        self.client = TestClient(main.app)
+        # A fact-check controller whose only slot is taken and which cannot queue
+        self.busy = AdmissionController("factcheck", max_concurrency=1, max_queue=0, queue_timeout_s=1)
+        self.busy.in_flight = 1
+        patches = [
+            mock.patch.object(main, "factcheck_admission", self.busy),
+            mock.patch.object(main, "find_best_factchecks",
+                              mock.AsyncMock(return_value=FactCheckResult(status="none"))),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_overloaded_endpoint_returns_503_with_retry_after(self):
+        """Test that a shed request fails fast with 503 and a Retry-After header."""
+        with mock.patch.object(self.main.factcheck_service, "is_cached", return_value=False):
+            response = self.client.post("/factcheck", json={"headline": "Senate votes to ban TikTok"})
+        self.assertEqual(response.status_code, 503)
+        self.assertGreaterEqual(int(response.headers["retry-after"]), 1)
+        self.assertIn('thebiaslens_admission_shed_total{endpoint="factcheck",reason="queue_full"}',
+                      self.client.get("/metrics").text)
+
+    def test_cache_hits_and_health_never_shed(self):
+        """Test that cached fact-checks and /health are served while the endpoint is saturated."""
+        with mock.patch.object(self.main.factcheck_service, "is_cached", return_value=True):
+            response = self.client.post("/factcheck", json={"headline": "Senate votes to ban TikTok"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get("/health").status_code, 200)
+        self.assertEqual(self.busy.bypassed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,289 @@
+"""Unit tests for the cache backends and the caches ported onto them."""
+
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from loadtest.redis_stand_in import RedisStandIn
+from providers.factcheck_google import ClaimQueryCache
+from schemas import FactCheckItem, FactCheckResult
+from services import cache_backend, extract
+from services.cache_backend import (
+    FLAG_COMPRESSED, BackendCache, MemoryBackend, RedisBackend, SQLiteBackend, decode_value, encode_value,
+)
+from services.factcheck_service import FactCheckCache
+
+
+def _result(claim: str = "Senate did ban TikTok nationwide") -> FactCheckResult:
+    return FactCheckResult(status="found", items=[
+        FactCheckItem(claim=claim, source="PolitiFact", url="https://fc.example/1", verdict="False",
+                      publishedAt="2024-03-01T00:00:00Z", similarity=0.71),
+    ])
+
+
+class TestValueEncoding(unittest.TestCase):
+    """Test cases for the compact serialized form of shared cache values."""
+
+    def test_round_trip_small_value_uncompressed(self):
+        """Test that small values round-trip and are stored without zlib."""
+        value = ["headline", None, 12, True]
+        data = encode_value(value, compress_min_bytes=512)
+        self.assertFalse(data[0] & FLAG_COMPRESSED)
+        self.assertEqual(decode_value(data), value)
+
+    def test_large_value_compressed(self):
+        """Test that large values are compressed and still round-trip."""
+        value = {"body": "The Senate voted on Tuesday to ban the app. " * 200}
+        data = encode_value(value, compress_min_bytes=512)
+        self.assertTrue(data[0] & FLAG_COMPRESSED)
+        self.assertLess(len(data), len(value["body"]) // 4)
+        self.assertEqual(decode_value(data), value)
+
+    def test_unknown_format_rejected(self):
+        """Test that payloads in an unknown format raise ValueError."""
+        with self.assertRaises(ValueError):
+            decode_value(b"\x7fgarbage")
+
+
+class BackendContract:
+    """Behaviour every backend must share; mixed into one TestCase per backend."""
+
+    def make_backend(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.backend = self.make_backend()
+
+    def value(self, text: str):
+        return text.encode("utf-8") if self.backend.shared else text
+
+    def test_set_get_and_expiry(self):
+        """Test that values are returned until their TTL passes."""
+        self.backend.set("a", self.value("one"), ttl_s=0.2)
+        self.assertEqual(self.backend.get("a"), self.value("one"))
+        self.assertTrue(self.backend.contains("a"))
+        time.sleep(0.3)
+        self.assertIsNone(self.backend.get("a"))
+        self.assertFalse(self.backend.contains("a"))
+
+    def test_delete_reports_existence_once(self):
+        """Test that only the first delete of a key reports it existed."""
+        self.backend.set("a", self.value("one"), ttl_s=60)
+        self.assertTrue(self.backend.delete("a"))
+        self.assertFalse(self.backend.delete("a"))
+
+    def test_clear_prefix_keeps_other_namespaces(self):
+        """Test that clearing one namespace leaves the others alone."""
+        self.backend.set("x:1", self.value("one"), ttl_s=60)
+        self.backend.set("x:2", self.value("two"), ttl_s=60)
+        self.backend.set("y:1", self.value("three"), ttl_s=60)
+        self.backend.clear("x:")
+        self.assertIsNone(self.backend.get("x:1"))
+        self.assertEqual(self.backend.get("y:1"), self.value("three"))
+
+
+class TestMemoryBackend(BackendContract, unittest.TestCase):
+    """Test cases for the per-process backend."""
+
+    def make_backend(self):
+        return MemoryBackend(max_entries=100)
+
+
+class TestSQLiteBackend(BackendContract, unittest.TestCase):
+    """Test cases for the SQLite backend shared by the workers of a host."""
+
+    def make_backend(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "cache.sqlite3")
+        return SQLiteBackend(self.path)
+
+    def test_trim_bounds_entries(self):
+        """Test that periodic trimming drops the oldest rows beyond max_entries."""
+        backend = SQLiteBackend(self.path, max_entries=10, trim_every=5)
+        for i in range(30):
+            backend.set(f"k{i}", b"v", ttl_s=60)
+        self.assertLessEqual(backend.count(), 10)
+        self.assertIsNotNone(backend.get("k29"))
+        self.assertIsNone(backend.get("k0"))
+
+
+class TestRedisBackend(BackendContract, unittest.TestCase):
+    """Test cases for the Redis-protocol backend, against the local stand-in."""
+
+    def make_backend(self):
+        self.server = RedisStandIn(password="secret")
+        self.addCleanup(self.server.close)
+        return RedisBackend(f"redis://:secret@127.0.0.1:{self.server.port}/2")
+
+    def test_outage_behaves_like_empty_cache(self):
+        """Test that an unreachable server yields misses and is skipped while down."""
+        self.backend.set("a", b"one", ttl_s=60)
+        self.server.close()
+        self.assertIsNone(self.backend.get("a"))
+        self.assertFalse(self.backend.contains("a"))
+        self.assertEqual(self.backend.errors, 1)
+        self.assertEqual(self.backend.stats()["available"], 0)
+
+    def test_wrong_password_is_an_error(self):
+        """Test that a rejected AUTH is counted and treated as a miss."""
+        backend = RedisBackend(f"redis://:wrong@127.0.0.1:{self.server.port}/0")
+        self.assertIsNone(backend.get("a"))
+        self.assertGreaterEqual(backend.errors, 1)
+
+
+class TestOffLoopAccess(unittest.IsolatedAsyncioTestCase):
+    """Test cases for reaching blocking backends from async code."""
+
+    async def test_run_uses_worker_thread_only_for_blocking_backends(self):
+        """Test that shared stores are called from a worker thread and in-process ones inline."""
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        loop_thread = threading.get_ident()
+        memory = BackendCache("t", MemoryBackend())
+        sqlite = BackendCache("t", SQLiteBackend(os.path.join(tmpdir.name, "cache.sqlite3")))
+        self.assertEqual(await memory.run(threading.get_ident), loop_thread)
+        self.assertNotEqual(await sqlite.run(threading.get_ident), loop_thread)
+
+    async def test_stalled_redis_does_not_block_event_loop(self):
+        """Test that the loop keeps running while a lookup waits out the server timeout."""
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        self.addCleanup(server.close)
+        cache = BackendCache("t", RedisBackend(f"redis://127.0.0.1:{server.getsockname()[1]}/0", timeout_s=0.5))
+
+        lookup = asyncio.create_task(cache.run(cache.get, "key"))
+        started = time.perf_counter()
+        await asyncio.sleep(0.05)
+        self.assertLess(time.perf_counter() - started, 0.3)
+        self.assertIsNone(await lookup)
+        self.assertEqual(cache.backend.errors, 1)
+
+    def test_pool_serves_concurrent_threads(self):
+        """Test that concurrent commands from several threads each get a connection."""
+        server = RedisStandIn()
+        self.addCleanup(server.close)
+        backend = RedisBackend(server.url)
+        backend.set("a", b"one", ttl_s=60)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(backend.get("a"))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [b"one"] * 8)
+        self.assertEqual(backend.errors, 0)
+        self.assertLessEqual(len(backend._idle), backend.max_idle)
+
+
+class TestSharedCaches(unittest.TestCase):
+    """Test cases for the ported caches on shared backends (one instance per simulated worker)."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "cache.sqlite3")
+        self.server = RedisStandIn()
+        self.addCleanup(self.server.close)
+
+    def _workers(self):
+        yield "sqlite", SQLiteBackend(self.path), SQLiteBackend(self.path)
+        yield "redis", RedisBackend(self.server.url), RedisBackend(self.server.url)
+
+    def test_factcheck_result_visible_to_other_worker(self):
+        """Test that a result cached by one worker is read back intact by another."""
+        for name, backend_a, backend_b in self._workers():
+            with self.subTest(backend=name):
+                worker_a, worker_b = FactCheckCache(backend=backend_a), FactCheckCache(backend=backend_b)
+                worker_a.set("fc:senate tiktok", _result(), ttl_s=60)
+                self.assertEqual(worker_b.get("fc:senate tiktok"), _result())
+                self.assertTrue(worker_b.contains("fc:senate tiktok"))
+
+    def test_warm_hit_counted_once_across_workers(self):
+        """Test that the first read of a warmed entry is counted by exactly one worker."""
+        for name, backend_a, backend_b in self._workers():
+            with self.subTest(backend=name):
+                worker_a, worker_b = FactCheckCache(backend=backend_a), FactCheckCache(backend=backend_b)
+                worker_a.set("fc:warm", _result(), ttl_s=60, warmed=True)
+                worker_b.get("fc:warm")
+                worker_a.get("fc:warm")
+                worker_b.get("fc:warm")
+                self.assertEqual(worker_a.warm_hits + worker_b.warm_hits, 1)
+
+    def test_query_cache_hands_out_copies(self):
+        """Test that shared query-cache hits are fresh, equal FactCheckItems."""
+        for name, backend_a, backend_b in self._workers():
+            with self.subTest(backend=name):
+                items = _result().items
+                key = ClaimQueryCache.make_key("Senate  TikTok", "en", 5)
+                ClaimQueryCache(backend=backend_a).set(key, items)
+                cached = ClaimQueryCache(backend=backend_b).get(key)
+                self.assertEqual(cached, items)
+                cached[0].matchReason = "entity"
+                self.assertIsNone(ClaimQueryCache(backend=backend_b).get(key)[0].matchReason)
+
+    def test_unreadable_entry_is_a_miss(self):
+        """Test that a corrupt shared entry is dropped and reported as a miss."""
+        backend = SQLiteBackend(self.path)
+        cache = FactCheckCache(backend=backend)
+        backend.set("factcheck:bad", b"\x7fgarbage", ttl_s=60)
+        self.assertIsNone(cache.get("bad"))
+        self.assertEqual(cache.stats()["decode_errors"], 1)
+        self.assertFalse(backend.contains("factcheck:bad"))
+
+    def test_extraction_cache_on_shared_backend(self):
+        """Test that extraction results round-trip as tuples through a shared backend."""
+        shared = BackendCache("extract", SQLiteBackend(self.path), from_wire=tuple)
+        with mock.patch.object(extract, "_cache", shared):
+            extract._set_cache("https://news.example/a", "Headline", "Body text", 2, "ok",
+                               "Reporter", None, False, None, warmed=True)
+            self.assertTrue(extract.is_cached("https://news.example/a"))
+            self.assertEqual(extract.cached_headline("https://news.example/a"), "Headline")
+            self.assertEqual(extract._get_from_cache("https://news.example/a"),
+                             ("Headline", "Body text", 2, "ok", "Reporter", None, False, None))
+            self.assertEqual(extract.get_warm_hits(), 1)
+
+
+class TestBackendSelection(unittest.TestCase):
+    """Test cases for choosing the backend from settings."""
+
+    def setUp(self):
+        patcher = mock.patch.object(cache_backend, "_shared_backend", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_memory_gives_private_backends(self):
+        """Test that the default setting keeps every cache in its own process-local store."""
+        with mock.patch.object(cache_backend.settings, "cache_backend", "memory"):
+            self.assertIsNone(cache_backend.shared_backend())
+            self.assertIsNot(cache_backend.cache_backend(), cache_backend.cache_backend())
+
+    def test_sqlite_shared_by_all_caches(self):
+        """Test that a configured SQLite store is one backend shared by every cache."""
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                mock.patch.object(cache_backend.settings, "cache_backend", "sqlite"), \
+                mock.patch.object(cache_backend.settings, "cache_sqlite_path", os.path.join(tmpdir, "c.sqlite3")):
+            backend = cache_backend.shared_backend()
+            self.assertIsInstance(backend, SQLiteBackend)
+            self.assertIs(cache_backend.cache_backend(), backend)
+
+    def test_unusable_store_falls_back_to_memory(self):
+        """Test that a store that cannot be opened falls back to per-process caches."""
+        with mock.patch.object(cache_backend.settings, "cache_backend", "sqlite"), \
+                mock.patch.object(cache_backend.settings, "cache_sqlite_path", "/nonexistent/dir/c.sqlite3"):
+            self.assertIsNone(cache_backend.shared_backend())
+            self.assertIsInstance(cache_backend.cache_backend(), MemoryBackend)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+"""Unit tests for the circuit breaker state machine."""
+
+import os
+import sys
+import unittest
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for closed, open and half-open transitions."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout_s=10, clock=lambda: self.now)
+
+    def _fail(self, times):
+        for _ in range(times):
+            permit = self.breaker.allow()
+            self.assertTrue(permit)
+            self.breaker.record_failure(permit)
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that only consecutive failures open the circuit."""
+        self._fail(2)
+        self.breaker.record_success(self.breaker.allow())
+        self._fail(2)
+        self.assertEqual(self.breaker.state, "closed")
+        self._fail(1)
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.stats()["rejected"], 1)
+
+    def test_half_open_allows_one_probe(self):
+        """Test that after the reset timeout a single probe is let through."""
+        self._fail(3)
+        self.now = 10
+        self.assertEqual(self.breaker.state, "half_open")
+        probe = self.breaker.allow()
+        self.assertTrue(probe)
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_success(probe)
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_late_success_does_not_close_open_circuit(self):
+        """Test that a call started before the circuit opened can't close it by succeeding."""
+        slow = self.breaker.allow()  # still in flight
+        self._fail(3)
+        self.breaker.record_success(slow)
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+
+    def test_late_success_does_not_close_half_open_circuit(self):
+        """Test that only the probe's answer decides a half-open circuit."""
+        slow = self.breaker.allow()
+        late_failure = self.breaker.allow()
+        self._fail(3)
+        self.now = 10
+        probe = self.breaker.allow()
+        self.breaker.record_success(slow)
+        self.breaker.record_failure(late_failure)
+        self.assertEqual(self.breaker.state, "half_open")
+        self.breaker.release(slow)
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_failure(probe)
+        self.assertEqual(self.breaker.state, "open")
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe opens the circuit for another timeout."""
+        self._fail(3)
+        self.now = 10
+        self._fail(1)
+        self.assertEqual(self.breaker.state, "open")
+        self.now = 19
+        self.assertFalse(self.breaker.allow())
+        self.now = 20
+        self.assertTrue(self.breaker.allow())
+
+    def test_released_probe_slot_is_reused(self):
+        """Test that an abandoned probe gives its slot back."""
+        self._fail(3)
+        self.now = 10
+        self.breaker.release(self.breaker.allow())
+        self.assertTrue(self.breaker.allow())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
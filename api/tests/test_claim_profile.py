@@ -0,0 +1,77 @@
+"""Unit tests for the per-request claim profile."""
+
+import os
+import sys
+import unittest
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.claims import claim_miner
+from services.factcheck_query import build_queries
+from services.factcheck_score import score_item
+
+HEADLINE = "Senate passes bill to ban TikTok nationwide"
+SUMMARY = (
+    "The Senate voted on Tuesday to pass legislation that would ban TikTok unless its "
+    "Chinese owner sells the app within a year. President Biden said he will sign the bill."
+)
+
+
+class TestClaimProfile(unittest.TestCase):
+    """Test cases for building and using a ClaimProfile."""
+
+    def setUp(self):
+        self.profile = claim_miner.build_profile(HEADLINE, SUMMARY)
+
+    def test_primary_claim_matches_miner(self):
+        """Test that the profile's primary claim equals a direct classification."""
+        claim_type = claim_miner.classify_claim(HEADLINE)
+        targets = claim_miner.extract_targets(HEADLINE, claim_type)
+        self.assertEqual(self.profile.claim_type, claim_type)
+        self.assertEqual({k: set(v) for k, v in self.profile.targets.items()}, targets)
+        self.assertEqual(self.profile.claims[0].text, HEADLINE)
+
+    def test_targets_are_immutable(self):
+        """Test that the profile's target sets can't be modified."""
+        with self.assertRaises(TypeError):
+            self.profile.targets["actions"] = frozenset()
+        self.assertIsInstance(self.profile.targets["actions"], frozenset)
+
+    def test_query_features_cached_per_profile(self):
+        """Test that query features are computed once per query and not shared between profiles."""
+        features = self.profile.query_features("senate tiktok ban")
+        self.assertIs(self.profile.query_features("senate tiktok ban"), features)
+        other = claim_miner.build_profile(HEADLINE, SUMMARY)
+        self.assertIsNot(other.query_features("senate tiktok ban"), features)
+        self.assertIsNot(other.vocab, self.profile.vocab)
+
+    def test_contains_any_matches_substring_semantics(self):
+        """Test that compiled matchers agree with any(target in text)."""
+        for text in ["the senate bans tiktok", "no match here", "prohibited by congress", ""]:
+            for key, targets in self.profile.targets.items():
+                self.assertEqual(
+                    self.profile.contains_any(key, text),
+                    any(t in text for t in targets),
+                    (key, text),
+                )
+
+    def test_build_queries_reuses_profile(self):
+        """Test that passing a profile gives the same plan as building one internally."""
+        self.assertEqual(
+            build_queries(HEADLINE, None, SUMMARY, profile=self.profile),
+            build_queries(HEADLINE, None, SUMMARY),
+        )
+
+    def test_score_item_with_profile(self):
+        """Test that an on-topic claim passes gates and an off-topic one doesn't."""
+        on_topic = score_item(HEADLINE, "The Senate bill to ban TikTok passed on Tuesday",
+                              None, None, self.profile, "policy_exact")
+        off_topic = score_item(HEADLINE, "Random unrelated claim about sports teams winning",
+                               None, None, self.profile, "policy_exact")
+        self.assertGreater(on_topic, 0.3)
+        self.assertEqual(off_topic, -1.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
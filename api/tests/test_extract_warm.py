@@ -0,0 +1,104 @@
+"""Unit tests for background extraction warming."""
+
+import asyncio
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services import extract
+from services import extract_warm
+from services.admission import AdmissionController
+from services.extract_warm import ExtractionWarmer
+
+
+def _fake_result(url):
+    return ("Headline", "Body text " * 120, 240, "extracted", None, None, False, None)
+
+
+class TestExtractionWarmer(unittest.IsolatedAsyncioTestCase):
+    """Test cases for warming, budgets and warm-hit accounting."""
+
+    def setUp(self):
+        extract._cache.clear()
+        self.calls = []
+
+        async def fake_extract(url):
+            self.calls.append(url)
+            await asyncio.sleep(0)
+            return _fake_result(url)
+
+        patcher = mock.patch.object(extract, "_extract_uncached", side_effect=fake_extract)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _drain(self, warmer):
+        while warmer._workers:
+            await asyncio.gather(*list(warmer._workers))
+
+    async def test_warmed_result_is_cache_hit(self):
+        """Test that a warmed URL is served from cache and counted as a warm hit."""
+        warmer = ExtractionWarmer(concurrency=2, daily_budget=10)
+        hits_before = extract.get_warm_hits()
+
+        accepted = await warmer.enqueue(["https://example.com/a", "https://example.com/b"])
+        await self._drain(warmer)
+        self.assertEqual(accepted, 2)
+        self.assertEqual(warmer.warmed, 2)
+
+        await extract.extract_article("https://example.com/a")
+        await extract.extract_article("https://example.com/a")
+        self.assertEqual(len(self.calls), 2)  # no extra fetch for the user request
+        self.assertEqual(extract.get_warm_hits() - hits_before, 1)
+
+    async def test_daily_budget_limits_warming(self):
+        """Test that no more URLs are warmed than the daily budget allows."""
+        warmer = ExtractionWarmer(concurrency=1, daily_budget=1)
+        accepted = await warmer.enqueue(["https://example.com/c", "https://example.com/d"])
+        await self._drain(warmer)
+        self.assertEqual(accepted, 1)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(warmer.stats()["budget_remaining"], 0)
+
+    async def test_concurrent_requests_share_one_fetch(self):
+        """Test that concurrent extractions of one URL share a single fetch."""
+        await asyncio.gather(
+            extract.extract_article("https://example.com/e"),
+            extract.extract_article("https://example.com/e"),
+        )
+        self.assertEqual(len(self.calls), 1)
+
+    async def test_cancelled_owner_does_not_cancel_joiners(self):
+        """Test that a joined extraction completes and is cached when the request that started it is cancelled."""
+        owner = asyncio.create_task(extract.extract_article("https://example.com/f"))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(extract.extract_article("https://example.com/f"))
+        await asyncio.sleep(0)
+        owner.cancel()
+        self.assertEqual(await joiner, _fake_result("https://example.com/f"))
+        self.assertTrue(owner.cancelled())
+        self.assertTrue(extract.is_cached("https://example.com/f"))
+        self.assertEqual(len(self.calls), 1)
+
+    async def test_warming_yields_to_saturated_admission(self):
+        """Test that warming takes only free analyze slots and skips URLs while requests hold them all."""
+        controller = AdmissionController("analyze", max_concurrency=1, max_queue=4, queue_timeout_s=1)
+        warmer = ExtractionWarmer(concurrency=1, daily_budget=10)
+        with mock.patch.object(extract_warm, "analyze_admission", controller):
+            await controller.acquire()
+            await warmer.enqueue(["https://example.com/g"])
+            await self._drain(warmer)
+            self.assertEqual((warmer.warmed, warmer.skipped), (0, 1))
+
+            controller.release()
+            await warmer.enqueue(["https://example.com/g"])
+            await self._drain(warmer)
+            self.assertEqual(warmer.warmed, 1)
+            self.assertEqual(controller.in_flight, 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
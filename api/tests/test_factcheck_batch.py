@@ -0,0 +1,93 @@
+"""Tests for batch fact-checking with shared upstream queries."""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from schemas import FactCheckItem
+from services import factcheck_service
+
+# Headlines from one search page plan overlapping queries
+PLANS = {
+    "Senate bans TikTok": ["senate tiktok ban", "tiktok", "senate vote"],
+    "TikTok ban passes Senate": ["senate tiktok ban", "tiktok", "TikTok  ban"],
+    "House debates TikTok": ["tiktok", "house tiktok debate"],
+}
+
+
+def _plan(headline, *args, **kwargs):
+    return [{"reason": f"r{i}", "q": q} for i, q in enumerate(PLANS[headline])]
+
+
+class TestFactCheckBatch(unittest.IsolatedAsyncioTestCase):
+    """Test cases for cross-headline query deduplication."""
+
+    def setUp(self):
+        self.fetched = []
+
+        async def fake_fetch(query, **kwargs):
+            self.fetched.append(query)
+            await asyncio.sleep(0.01)
+            return [FactCheckItem(claim=f"{query} claim", source=query, url=f"https://fc.example/{len(query)}")]
+
+        patches = [
+            mock.patch.object(factcheck_service, "fetch_claims", side_effect=fake_fetch),
+            mock.patch.object(factcheck_service, "search_local_claims", return_value=[]),
+            mock.patch.object(factcheck_service, "ingest_factchecks"),
+            mock.patch.object(factcheck_service, "score_items",
+                              side_effect=lambda claim_texts, **kwargs: [0.3] * len(claim_texts)),
+            mock.patch.object(factcheck_service, "build_queries", side_effect=_plan),
+            mock.patch.object(factcheck_service.settings, "fact_check_enabled", True),
+            mock.patch.object(factcheck_service.settings, "google_factcheck_api_key", "test-key"),
+            mock.patch.object(factcheck_service.quota_manager, "remaining", return_value=None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        factcheck_service._cache.clear()
+
+    async def _batch(self, headlines):
+        requests = [{"headline": h, "max_age_months": 9999} for h in headlines]
+        return [r async for r in factcheck_service.find_best_factchecks_batch(requests)]
+
+    async def test_identical_queries_fetched_once(self):
+        """Test that queries shared by several headlines go upstream once."""
+        results = await self._batch(list(PLANS))
+        self.assertEqual(sorted(i for i, _ in results), [0, 1, 2])
+        self.assertEqual(len(self.fetched), 5)
+        self.assertEqual(len({" ".join(q.lower().split()) for q in self.fetched}), 5)
+
+    async def test_results_match_single_requests(self):
+        """Test that each headline gets the result it would get on its own."""
+        batch = dict(await self._batch(list(PLANS)))
+        for index, headline in enumerate(PLANS):
+            factcheck_service._cache.clear()
+            single = await factcheck_service.find_best_factchecks(headline, max_age_months=9999)
+            self.assertEqual(batch[index].model_dump(), single.model_dump(), headline)
+
+    async def test_duplicate_requests_run_once(self):
+        """Test that repeated headlines are answered from one run."""
+        results = await self._batch(["Senate bans TikTok"] * 3)
+        self.assertEqual(sorted(i for i, _ in results), [0, 1, 2])
+        self.assertEqual(len(self.fetched), 3)
+
+    async def test_failed_headline_does_not_stop_batch(self):
+        """Test that one failing headline yields an empty result and the rest still stream."""
+        def plan(headline, *args, **kwargs):
+            if headline == "House debates TikTok":
+                raise RuntimeError("planner failed")
+            return _plan(headline)
+
+        with mock.patch.object(factcheck_service, "build_queries", side_effect=plan):
+            results = dict(await self._batch(list(PLANS)))
+        self.assertEqual(results[2].status, "none")
+        self.assertEqual(results[0].status, "found")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,167 @@
+"""Unit tests for the fact-check result cache and its headline keys."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from schemas import FactCheckItem, FactCheckResult
+from services import cache_backend, factcheck_service
+from services.factcheck_service import FactCheckCache
+
+
+def _result(claim: str = "Claim") -> FactCheckResult:
+    return FactCheckResult(status="found", items=[FactCheckItem(claim=claim)])
+
+
+class TestFactCheckCache(unittest.TestCase):
+    """Test cases for heap-based expiry and LRU bounds."""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(cache_backend.time, "monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_entries_expire(self):
+        """Test that entries are not returned after their TTL."""
+        cache = FactCheckCache()
+        cache.set("a", _result(), ttl_s=10)
+        self.assertIsNotNone(cache.get("a"))
+        self.now += 11
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_clear_expired_only_removes_expired(self):
+        """Test that housekeeping drops expired entries and keeps live ones."""
+        cache = FactCheckCache()
+        cache.set("short", _result(), ttl_s=5)
+        cache.set("long", _result(), ttl_s=500)
+        self.now += 10
+        self.assertEqual(cache.clear_expired(), 1)
+        self.assertIsNotNone(cache.get("long"))
+
+    def test_overwrite_ignores_stale_expiry(self):
+        """Test that a refreshed key isn't dropped by its old heap record."""
+        cache = FactCheckCache()
+        cache.set("a", _result("old"), ttl_s=5)
+        self.now += 3
+        cache.set("a", _result("new"), ttl_s=100)
+        self.now += 5
+        self.assertEqual(cache.clear_expired(), 0)
+        self.assertEqual(cache.get("a").items[0].claim, "new")
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted at max_entries."""
+        cache = FactCheckCache(max_entries=2)
+        cache.set("a", _result(), ttl_s=100)
+        cache.set("b", _result(), ttl_s=100)
+        cache.get("a")
+        cache.set("c", _result(), ttl_s=100)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_eviction_by_bytes(self):
+        """Test that max_bytes bounds the approximate stored size."""
+        size = len(_result().model_dump_json())
+        cache = FactCheckCache(max_bytes=size * 2)
+        for key in ("a", "b", "c"):
+            cache.set(key, _result(), ttl_s=100)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("a"))
+
+
+class TestCanonicalCacheKeys(unittest.TestCase):
+    """Test cases for canonical headline keys and near-identical headline reuse."""
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(factcheck_service, "_cache", FactCheckCache()),
+            mock.patch.object(factcheck_service, "similar_headlines", factcheck_service.SimilarHeadlineIndex(0.8)),
+            mock.patch.object(factcheck_service.settings, "fact_check_canonical_keys", True),
+            mock.patch.object(factcheck_service.settings, "fact_check_similar_threshold", 0.8),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _store(self, headline, domain="example.com"):
+        factcheck_service._set_cached(headline, domain, 18, _result(headline))
+
+    def test_canonical_tokens(self):
+        """Test that case, stopwords, word order and publisher suffixes are ignored."""
+        tokens = factcheck_service.canonical_headline_tokens
+        self.assertEqual(tokens("Senate passes bill to ban TikTok"),
+                         tokens("Senate Passes Bill To Ban TikTok \u2014 Reuters"))
+        self.assertEqual(tokens("TikTok ban bill passes the Senate - AP News"),
+                         tokens("Senate passes bill to ban TikTok"))
+        self.assertEqual(tokens("Ukraine - live"), frozenset({"ukraine", "live"}))
+
+    def test_same_canonical_headline_shares_key(self):
+        """Test that reworded casing and a source suffix hit the same entry."""
+        self._store("Senate passes bill to ban TikTok")
+        result = factcheck_service._get_cached("Senate Passes Bill To Ban TikTok \u2014 Reuters", "example.com", 18)
+        self.assertEqual(result.items[0].claim, "Senate passes bill to ban TikTok")
+        self.assertEqual(factcheck_service.similar_headlines.stats()["canonical_hits"], 1)
+
+    def test_near_identical_headline_reuses_result(self):
+        """Test similarity reuse above the threshold, within the same domain and max age only."""
+        self._store("Senate passes bill to ban TikTok")
+        similar = "Senate passes bill to ban TikTok nationwide"
+        self.assertIsNotNone(factcheck_service._get_cached(similar, "example.com", 18))
+        self.assertIsNone(factcheck_service._get_cached(similar, "other.com", 18))
+        self.assertIsNone(factcheck_service._get_cached(similar, "example.com", 12))
+        self.assertIsNone(factcheck_service._get_cached("House passes bill to ban TikTok", "example.com", 18))
+
+        stats = factcheck_service.similar_headlines.stats()
+        self.assertEqual((stats["lookups"], stats["similar_hits"]), (4, 1))
+        self.assertEqual(stats["reuse_rate"], 0.25)
+
+    def test_expired_entries_are_not_reused(self):
+        """Test that a similar headline whose result left the cache is not matched."""
+        self._store("Senate passes bill to ban TikTok")
+        factcheck_service._cache.clear()
+        self.assertIsNone(factcheck_service._get_cached("Senate passes bill to ban TikTok nationwide", "example.com", 18))
+        self.assertFalse(factcheck_service.is_cached("Senate passes bill to ban TikTok nationwide", "example.com", 18))
+
+    def test_raw_keys_by_default(self):
+        """Test that without canonical keys only the exact headline hits."""
+        with mock.patch.object(factcheck_service.settings, "fact_check_canonical_keys", False):
+            self._store("Senate passes bill to ban TikTok")
+            self.assertIsNone(factcheck_service._get_cached("senate passes bill to ban tiktok", "example.com", 18))
+            self.assertIsNotNone(factcheck_service._get_cached("Senate passes bill to ban TikTok", "example.com", 18))
+
+
+class TestSimilarHeadlineIndex(unittest.TestCase):
+    """Test cases for pruning the similar-headline index."""
+
+    def _add_expired(self, index, count):
+        for i in range(count):
+            index.add(f"key-{i}", frozenset({f"story{i}", "senate", "bill"}), "scope", f"headline {i}",
+                      is_live=lambda key: False)
+
+    def test_expired_keys_are_pruned(self):
+        """Test that indexing many keys that already left the cache keeps the index bounded."""
+        index = factcheck_service.SimilarHeadlineIndex(0.8)
+        self._add_expired(index, 5000)
+        self.assertLessEqual(len(index), factcheck_service.SIMILAR_REBUILD_MIN_ENTRIES)
+
+    def test_bounded_by_max_entries(self):
+        """Test that the index never grows much past the result cache's bound."""
+        index = factcheck_service.SimilarHeadlineIndex(0.8, max_entries=10)
+        self._add_expired(index, 100)
+        self.assertLessEqual(len(index), 11)
+
+        live = factcheck_service.SimilarHeadlineIndex(0.8, max_entries=10)
+        for i in range(100):
+            live.add(f"key-{i}", frozenset({f"story{i}"}), "scope", f"headline {i}", is_live=lambda key: True)
+        self.assertLessEqual(len(live), 11)
+        self.assertEqual(live.headline_for("key-99"), "headline 99")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,177 @@
+"""Tests for the Google Fact Check provider against a local stand-in server."""
+
+import json
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from providers import factcheck_google
+from providers.factcheck_google import (
+    ClaimQueryCache, FactCheckCircuitOpen, FactCheckError, FactCheckUnavailable, fetch_claims,
+)
+from services import tracing
+from services.circuit_breaker import CircuitBreaker
+
+CLAIMS_RESPONSE = {
+    "claims": [
+        {
+            "text": "The senate passed a bill banning TikTok",
+            "claimDate": "2025-03-01T00:00:00Z",
+            "claimReview": [{
+                "publisher": {"name": "PolitiFact"},
+                "url": "https://politifact.example/tiktok",
+                "textualRating": "Mostly True",
+            }],
+        }
+    ]
+}
+
+
+class _ClaimsServer:
+    """Minimal claims:search stand-in that counts requests."""
+
+    def __init__(self):
+        self.requests = 0
+        self.status = 200
+        outer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                outer.requests += 1
+                body = json.dumps(CLAIMS_RESPONSE).encode()
+                self.send_response(outer.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1alpha1/claims:search"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestFetchClaimsQueryCache(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the query-level claim cache."""
+
+    def setUp(self):
+        self.upstream = _ClaimsServer()
+        self.addCleanup(self.upstream.close)
+        self.cache = ClaimQueryCache(ttl_s=60, max_entries=10)
+        patches = [
+            mock.patch.object(factcheck_google.settings, "factcheck_api_base", self.upstream.url),
+            mock.patch.object(factcheck_google, "query_cache", self.cache),
+            mock.patch.object(factcheck_google.quota_manager, "try_acquire", return_value=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def test_identical_queries_hit_upstream_once(self):
+        """Test that normalized-equal queries are served from the cache."""
+        first = await fetch_claims("Senate TikTok ban", api_key="k")
+        second = await fetch_claims("  senate   tiktok BAN ", api_key="k")
+        self.assertEqual(self.upstream.requests, 1)
+        self.assertEqual(first[0].claim, second[0].claim)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    async def test_cached_items_are_copies(self):
+        """Test that annotating returned items doesn't leak into the cache."""
+        items = await fetch_claims("senate tiktok", api_key="k")
+        items[0].similarity = 0.99
+        again = await fetch_claims("senate tiktok", api_key="k")
+        self.assertIsNone(again[0].similarity)
+
+    async def test_key_includes_language_and_page_size(self):
+        """Test that language and page size are part of the cache key."""
+        await fetch_claims("senate tiktok", api_key="k", language="en")
+        await fetch_claims("senate tiktok", api_key="k", language="es")
+        await fetch_claims("senate tiktok", api_key="k", page_size=10)
+        self.assertEqual(self.upstream.requests, 3)
+
+    async def test_query_text_not_in_server_timing(self):
+        """Test that the query is exported with the span but kept out of the Server-Timing header."""
+        trace = tracing.start_trace("factcheck", sample_rate=1.0)
+        await fetch_claims("Senate TikTok ban", api_key="k")
+        trace.finish()
+        self.assertIn("fetch_claims", trace.server_timing())
+        self.assertNotIn("TikTok", trace.server_timing())
+        self.assertIn("Senate TikTok ban", json.dumps(trace.to_otlp()))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used query is evicted past max_entries."""
+        cache = ClaimQueryCache(ttl_s=60, max_entries=2)
+        cache.set(("a", "en", 5), [])
+        cache.set(("b", "en", 5), [])
+        cache.get(("a", "en", 5))
+        cache.set(("c", "en", 5), [])
+        self.assertIsNone(cache.get(("b", "en", 5)))
+        self.assertIsNotNone(cache.get(("a", "en", 5)))
+
+
+class TestFetchClaimsCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+    """Test cases for typed errors and failing fast during outages."""
+
+    def setUp(self):
+        self.upstream = _ClaimsServer()
+        self.addCleanup(self.upstream.close)
+        self.now = 0.0
+        self.breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_s=30, clock=lambda: self.now)
+        patches = [
+            mock.patch.object(factcheck_google.settings, "factcheck_api_base", self.upstream.url),
+            mock.patch.object(factcheck_google, "query_cache", ClaimQueryCache(ttl_s=60, max_entries=0)),
+            mock.patch.object(factcheck_google, "breaker", self.breaker),
+            mock.patch.object(factcheck_google.quota_manager, "try_acquire", return_value=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def test_outage_opens_circuit_and_fails_fast(self):
+        """Test that repeated 5xx answers open the circuit and later queries skip upstream."""
+        self.upstream.status = 503
+        for _ in range(2):
+            with self.assertRaises(FactCheckUnavailable):
+                await fetch_claims("senate tiktok", api_key="k")
+        with self.assertRaises(FactCheckCircuitOpen):
+            await fetch_claims("senate tiktok", api_key="k")
+        self.assertEqual(self.upstream.requests, 2)
+        self.assertEqual(self.breaker.state, "open")
+
+    async def test_recovery_closes_circuit(self):
+        """Test that a successful probe after the reset timeout closes the circuit."""
+        self.upstream.status = 503
+        for _ in range(2):
+            with self.assertRaises(FactCheckUnavailable):
+                await fetch_claims("senate tiktok", api_key="k")
+        self.upstream.status = 200
+        self.now += 31
+        items = await fetch_claims("senate tiktok", api_key="k")
+        self.assertEqual(len(items), 1)
+        self.assertEqual(self.breaker.state, "closed")
+
+    async def test_client_errors_do_not_trip_circuit(self):
+        """Test that 4xx answers raise typed errors but count as the API being up."""
+        self.upstream.status = 400
+        for _ in range(3):
+            with self.assertRaises(FactCheckError) as ctx:
+                await fetch_claims("senate tiktok", api_key="k")
+            self.assertNotIsInstance(ctx.exception, FactCheckCircuitOpen)
+        self.assertEqual(self.breaker.state, "closed")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,156 @@
+"""Tests for the local ClaimReview store and local-first fact-check lookups."""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from schemas import FactCheckItem
+from providers.factcheck_local import ClaimReviewIndex, load_corpus
+from services import factcheck_service
+
+
+def _item(claim, n=0, source="Example Checks"):
+    return FactCheckItem(claim=claim, verdict="False", source=source, url=f"https://fc.example/{n}")
+
+
+class TestClaimReviewIndex(unittest.TestCase):
+    """Test cases for indexing and retrieving fact-checked claims."""
+
+    def setUp(self):
+        self.index = ClaimReviewIndex()
+        self.index.add_many([
+            _item("Senate votes to ban TikTok nationwide", 1),
+            _item("Vaccines cause autism in children", 2),
+            _item("The Senate passed a budget bill", 3),
+        ])
+
+    def test_ranks_best_match_first(self):
+        """Test that the claim sharing the rarest terms ranks first."""
+        results = self.index.search("TikTok ban senate")
+        self.assertEqual(results[0].claim, "Senate votes to ban TikTok nationwide")
+        self.assertEqual(len(results), 2)
+
+    def test_readding_claim_replaces_record(self):
+        """Test that the same claim and URL are stored once with the latest data."""
+        self.index.add(FactCheckItem(claim="vaccines cause autism in children", verdict="True",
+                                     url="https://fc.example/2"))
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.search("autism")[0].verdict, "True")
+
+    def test_results_are_independent_copies(self):
+        """Test that mutating a returned item does not change the store."""
+        self.index.search("autism")[0].similarity = 0.9
+        self.assertIsNone(self.index.search("autism")[0].similarity)
+
+    def test_common_terms_only_rescore_candidates(self):
+        """Test that frequent terms above the scan limit still rank candidates."""
+        index = ClaimReviewIndex(max_postings_scan=3)
+        index.add_many([_item(f"tax claim number {i}", i) for i in range(10)])
+        index.add(_item("tax rebate claim", 99))
+        results = index.search("tax rebate", limit=1)
+        self.assertEqual(results[0].claim, "tax rebate claim")
+
+    def test_ingested_claims_expire(self):
+        """Test that claims added with a TTL stop matching once it passes, while corpus claims stay."""
+        self.index.add(_item("Senate votes to ban TikTok again", 4), ttl_s=0.05)
+        self.assertEqual(len(self.index.search("tiktok")), 2)
+        time.sleep(0.1)
+        self.assertEqual([i.claim for i in self.index.search("tiktok")], ["Senate votes to ban TikTok nationwide"])
+
+    def test_ingested_claims_capped_and_compacted(self):
+        """Test that only the newest max_ingested claims are kept and removed ones are compacted away."""
+        index = ClaimReviewIndex(max_ingested=10)
+        index.add(_item("Permanent corpus claim about tariffs", 0))
+        for n in range(1, 3001):
+            index.add(_item(f"Ingested claim about tariffs number{n}", n), ttl_s=3600)
+        self.assertEqual(len(index), 11)
+        self.assertLess(len(index._records), 3001)
+        self.assertEqual(index.search("number1"), [])
+        self.assertEqual(index.search("number3000")[0].claim, "Ingested claim about tariffs number3000")
+        self.assertEqual(len(index.search("tariffs", limit=20)), 11)
+
+    def test_load_corpus_formats(self):
+        """Test loading Google API responses, ClaimReview JSON-LD and item dicts."""
+        records = [
+            {"claims": [{"text": "Claim from the API", "claimReview": [
+                {"publisher": {"name": "PolitiFact"}, "url": "https://fc.example/a", "textualRating": "False"}]}]},
+            {"@type": "ClaimReview", "claimReviewed": "Claim from JSON-LD", "url": "https://fc.example/b",
+             "author": {"name": "Snopes"}, "reviewRating": {"alternateName": "True"}},
+            {"claim": "Claim from an item dict", "verdict": "Mixed", "url": "https://fc.example/c"},
+            {"unrelated": True},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "claims.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(json.dumps(r) for r in records))
+            items = load_corpus(path)
+
+        self.assertEqual([i.claim for i in items],
+                         ["Claim from the API", "Claim from JSON-LD", "Claim from an item dict"])
+        self.assertEqual(items[1].source, "Snopes")
+
+
+class TestLocalFirstFactChecks(unittest.IsolatedAsyncioTestCase):
+    """Test cases for querying the local store before the API."""
+
+    def setUp(self):
+        self.index = ClaimReviewIndex()
+        self.fetched = []
+
+        async def fake_fetch(query, **kwargs):
+            self.fetched.append(query)
+            return []
+
+        patches = [
+            mock.patch.object(factcheck_service, "claim_index", self.index),
+            mock.patch.object(factcheck_service, "search_local_claims",
+                              side_effect=lambda q, limit: self.index.search(q, limit=limit)),
+            mock.patch.object(factcheck_service, "fetch_claims", side_effect=fake_fetch),
+            mock.patch.object(factcheck_service, "score_items",
+                              side_effect=lambda claim_texts, **kwargs: [0.8] * len(claim_texts)),
+            mock.patch.object(factcheck_service, "build_queries",
+                              return_value=[{"reason": "core_claim", "q": "senate tiktok ban"},
+                                            {"reason": "entities", "q": "tiktok"}]),
+            mock.patch.object(factcheck_service.settings, "fact_check_enabled", True),
+            mock.patch.object(factcheck_service.quota_manager, "remaining", return_value=None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        factcheck_service._cache.clear()
+
+    async def test_local_hits_skip_api(self):
+        """Test that good local matches settle the result without API calls."""
+        self.index.add_many([_item(f"Senate TikTok ban claim {i}", i, source=f"pub{i}") for i in range(3)])
+        with mock.patch.object(factcheck_service.settings, "google_factcheck_api_key", "test-key"):
+            result = await factcheck_service.find_best_factchecks("Senate bans TikTok", max_age_months=9999)
+        self.assertEqual(result.status, "found")
+        self.assertEqual(len(result.items), 3)
+        self.assertEqual(self.fetched, [])
+
+    async def test_api_fills_gaps(self):
+        """Test that the API is still queried when the local store has too little."""
+        self.index.add(_item("Senate TikTok ban claim", 1))
+        with mock.patch.object(factcheck_service.settings, "google_factcheck_api_key", "test-key"):
+            result = await factcheck_service.find_best_factchecks("Senate bans TikTok", max_age_months=9999)
+        self.assertEqual([i.claim for i in result.items], ["Senate TikTok ban claim"])
+        self.assertEqual(self.fetched, ["senate tiktok ban", "tiktok"])
+
+    async def test_works_without_api_key(self):
+        """Test that the local store answers when no API key is configured."""
+        self.index.add(_item("Senate TikTok ban claim", 1))
+        with mock.patch.object(factcheck_service.settings, "google_factcheck_api_key", None):
+            result = await factcheck_service.find_best_factchecks("Senate bans TikTok", max_age_months=9999)
+        self.assertEqual(result.status, "found")
+        self.assertEqual(self.fetched, [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
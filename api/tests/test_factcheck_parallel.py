@@ -0,0 +1,144 @@
+"""Tests for concurrent fact-check query execution."""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from providers.factcheck_google import FactCheckCircuitOpen, FactCheckTimeout
+from schemas import FactCheckItem
+from services import factcheck_service
+
+
+QUERIES = [{"reason": f"r{i}", "q": f"query number {i}"} for i in range(8)]
+
+# Per-query (claim, score); later queries answer faster than earlier ones
+RESULTS = {
+    "query number 0": [("claim a", 0.4)],
+    "query number 1": [("claim b", 0.5), ("claim a", 0.4)],
+    "query number 2": [("claim c", 0.6)],
+    "query number 3": [("claim d", 0.9), ("claim e", 0.8)],
+    "query number 4": [("claim f", 0.95)],
+}
+
+
+class TestParallelFactCheck(unittest.IsolatedAsyncioTestCase):
+    """Test cases for bounded parallelism, in-order merging and early stop."""
+
+    def setUp(self):
+        self.fetched = []
+        self.cancelled = []
+
+        async def fake_fetch(query, **kwargs):
+            try:
+                await asyncio.sleep(0.01 * (10 - int(query.split()[-1])))
+            except asyncio.CancelledError:
+                self.cancelled.append(query)
+                raise
+            self.fetched.append(query)
+            return [FactCheckItem(claim=c, source=c, url=f"https://fc.example/{c.replace(' ', '-')}")
+                    for c, _ in RESULTS.get(query, [])]
+
+        scores = {c: s for items in RESULTS.values() for c, s in items}
+
+        def fake_score(query, claim_texts, **kwargs):
+            return [scores[c] for c in claim_texts]
+
+        patches = [
+            mock.patch.object(factcheck_service, "fetch_claims", side_effect=fake_fetch),
+            mock.patch.object(factcheck_service, "score_items", side_effect=fake_score),
+            mock.patch.object(factcheck_service, "build_queries", return_value=QUERIES),
+            mock.patch.object(factcheck_service, "search_local_claims", return_value=[]),
+            mock.patch.object(factcheck_service, "ingest_factchecks"),
+            mock.patch.object(factcheck_service.settings, "fact_check_enabled", True),
+            mock.patch.object(factcheck_service.settings, "google_factcheck_api_key", "test-key"),
+            mock.patch.object(factcheck_service.quota_manager, "remaining", return_value=None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        factcheck_service._cache.clear()
+
+    async def _run(self, concurrency):
+        factcheck_service._cache.clear()
+        with mock.patch.object(factcheck_service.settings, "factcheck_query_concurrency", concurrency):
+            return await factcheck_service.find_best_factchecks("Some headline about things", max_age_months=9999)
+
+    async def test_parallel_matches_sequential_ranking(self):
+        """Test that parallel execution returns exactly the sequential result."""
+        sequential = await self._run(1)
+        parallel = await self._run(8)
+        self.assertEqual(
+            [(i.claim, i.similarity, i.matchReason) for i in sequential.items],
+            [(i.claim, i.similarity, i.matchReason) for i in parallel.items],
+        )
+        self.assertEqual([i.claim for i in parallel.items], ["claim d", "claim e", "claim c"])
+
+    async def test_early_stop_cancels_outstanding_queries(self):
+        """Test that queries after the early-stop point are cancelled."""
+        await self._run(2)
+        await asyncio.sleep(0)
+        self.assertNotIn("query number 5", self.fetched)
+        self.assertNotIn("query number 7", self.fetched)
+
+    async def test_near_duplicate_claims_are_collapsed(self):
+        """Test that a reworded claim from another publisher is dropped before scoring."""
+        claims = {
+            "query number 0": ["Senate voted to ban TikTok nationwide on Tuesday"],
+            "query number 1": ["The Senate voted to ban TikTok nationwide on Tuesday", "Unrelated claim here"],
+        }
+
+        async def fetch(query, **kwargs):
+            return [FactCheckItem(claim=c, source=f"pub-{n}", url=f"https://fc.example/{query[-1]}{n}")
+                    for n, c in enumerate(claims.get(query, []))]
+
+        scored = []
+
+        def score(query, claim_texts, **kwargs):
+            scored.extend(claim_texts)
+            return [0.4] * len(claim_texts)
+
+        with mock.patch.object(factcheck_service, "fetch_claims", side_effect=fetch), \
+                mock.patch.object(factcheck_service, "score_items", side_effect=score):
+            result = await self._run(4)
+
+        self.assertEqual([i.claim for i in result.items],
+                         ["Senate voted to ban TikTok nationwide on Tuesday", "Unrelated claim here"])
+        self.assertNotIn("The Senate voted to ban TikTok nationwide on Tuesday", scored)
+
+    async def test_outage_result_is_cached_briefly(self):
+        """Test that a "none" caused by upstream failures gets the short TTL."""
+        calls = []
+
+        async def fetch(query, **kwargs):
+            calls.append(query)
+            if len(calls) <= 2:
+                raise FactCheckTimeout("timed out")
+            raise FactCheckCircuitOpen("circuit open")
+
+        with mock.patch.object(factcheck_service, "fetch_claims", side_effect=fetch), \
+                mock.patch.object(factcheck_service._cache, "set") as cache_set:
+            result = await self._run(1)
+
+        self.assertEqual(result.status, "none")
+        self.assertEqual(cache_set.call_args.kwargs["ttl_s"], factcheck_service.settings.fact_check_degraded_cache_ttl_s)
+
+    async def test_genuine_none_keeps_full_ttl(self):
+        """Test that a "none" without upstream failures is cached for the normal TTL."""
+        async def fetch(query, **kwargs):
+            return []
+
+        with mock.patch.object(factcheck_service, "fetch_claims", side_effect=fetch), \
+                mock.patch.object(factcheck_service._cache, "set") as cache_set:
+            result = await self._run(1)
+
+        self.assertEqual(result.status, "none")
+        self.assertIsNone(cache_set.call_args.kwargs["ttl_s"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,83 @@
+"""Tests that query plans are deduplicated exactly."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from loadtest.stand_ins import build_corpus
+from services import factcheck_query
+from services.factcheck_query import build_queries
+
+HEADLINES = [
+    ("Senate passes bill to ban TikTok nationwide", "President Biden said he will sign the bill."),
+    ("Unemployment rate falls to 3.5 percent in March", None),
+    ("Climate change leads to more flooding in coastal cities", None),
+    ("Trump said the election was rigged", "Former President Donald Trump claimed fraud in Georgia."),
+    ("Senate passes bill to ban TikTok nationwide",
+     "The Senate voted on Tuesday to pass legislation that would ban TikTok unless its "
+     "Chinese owner sells the app within a year. President Biden said he will sign the bill."),
+]
+
+
+def _pairwise_dedup(queries):
+    # The original word-overlap loop, kept as the reference
+    valid_queries = []
+    seen_normalized = set()
+    for query_dict in queries:
+        query = query_dict.get("q", "").strip()
+        if not query or len(query) < 6 or len(query.split()) < 2:
+            continue
+        normalized = query.replace('"', '').lower().strip()
+        is_duplicate = False
+        normalized_words = set(normalized.split())
+        for seen in seen_normalized:
+            seen_words = set(seen.split())
+            if len(normalized_words) > 0 and len(seen_words) > 0:
+                overlap = len(normalized_words & seen_words)
+                similarity = overlap / min(len(normalized_words), len(seen_words))
+                if similarity > 0.75:
+                    is_duplicate = True
+                    break
+        if not is_duplicate:
+            valid_queries.append(query_dict)
+            seen_normalized.add(normalized)
+    return valid_queries[:10]
+
+
+class TestQueryDedup(unittest.TestCase):
+    """Test cases for dropping near-duplicate queries from a plan."""
+
+    def _assert_matches_pairwise(self, headline, summary):
+        # Spy on the dedup step to get the plan before it
+        with mock.patch.object(factcheck_query, "dedupe_queries",
+                               side_effect=factcheck_query.dedupe_queries) as spy:
+            result = build_queries(headline, None, summary)
+        raw = spy.call_args.args[0]
+        self.assertEqual(result, _pairwise_dedup(raw), headline)
+
+    def test_matches_pairwise_dedup_on_fixtures(self):
+        """Test that the kept queries equal the original pairwise loop's."""
+        articles, _ = build_corpus(articles=60, claims=10, seed=11)
+        cases = HEADLINES + [(a.title, a.paragraphs[0]) for a in articles]
+        for headline, summary in cases:
+            with self.subTest(headline=headline):
+                self._assert_matches_pairwise(headline, summary)
+
+    def test_overlapping_queries_dropped(self):
+        """Test that a query sharing most words with an earlier one is dropped, quotes ignored."""
+        queries = [
+            {"reason": "policy_exact", "q": '"Senate bans TikTok"'},
+            {"reason": "headline_plain", "q": "senate bans tiktok nationwide"},
+            {"reason": "entity_expanded", "q": "TikTok"},
+            {"reason": "headline_plain", "q": "Senate vote"},
+        ]
+        kept = factcheck_query.dedupe_queries(queries)
+        self.assertEqual([q["q"] for q in kept], ['"Senate bans TikTok"', "Senate vote"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
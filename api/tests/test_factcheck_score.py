@@ -0,0 +1,72 @@
+"""Tests that batch scoring matches per-item scoring exactly."""
+
+import os
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services import factcheck_score
+from services.claims import claim_miner
+from services.factcheck_query import build_queries
+
+HEADLINES = [
+    ("Senate passes bill to ban TikTok nationwide", "President Biden said he will sign the bill."),
+    ("Unemployment rate falls to 3.5 percent in March", None),
+    ("Climate change leads to more flooding in coastal cities", None),
+    ("Trump said the election was rigged", "Former President Donald Trump claimed fraud in Georgia."),
+]
+
+CLAIM_WORDS = (
+    "Senate ban TikTok bill Biden sign unemployment rate 3.5 percent March climate change flooding "
+    "coastal cities Trump said election rigged Georgia fraud the a of vaccines cause autism NASA 2024"
+).split()
+
+
+def _claims(rng, n):
+    claims = [" ".join(rng.sample(CLAIM_WORDS, rng.randint(0, 12))) for _ in range(n)]
+    return claims + ["", "The Senate voted to ban TikTok on Tuesday", "Unemployment fell to 3.5% in March"]
+
+
+class TestBatchScoring(unittest.TestCase):
+    """Test cases comparing score_items with score_item."""
+
+    def _assert_identical(self):
+        rng = random.Random(11)
+        now = datetime.now()
+        for headline, summary in HEADLINES:
+            profile = claim_miner.build_profile(headline, summary)
+            queries = [q["q"] for q in build_queries(headline, None, summary, profile=profile)] + [headline]
+            for query in queries:
+                claims = _claims(rng, 60)
+                dates = [rng.choice([None, now - timedelta(days=40), now - timedelta(days=900)]) for _ in claims]
+                for reason in ("policy_exact", "headline_plain"):
+                    batch = factcheck_score.score_items(query, claims, "example.com", dates, profile, reason)
+                    single = [factcheck_score.score_item(query, c, "example.com", d, profile, reason)
+                              for c, d in zip(claims, dates)]
+                    self.assertEqual(batch, single, query)
+
+    def test_numpy_path_matches_score_item(self):
+        """Test that vectorised overlaps give bit-identical scores."""
+        if factcheck_score.np is None:
+            self.skipTest("numpy not installed")
+        with mock.patch.object(factcheck_score, "BATCH_MIN_ITEMS", 1):
+            self._assert_identical()
+
+    def test_fallback_matches_score_item(self):
+        """Test the pure-Python path used without numpy."""
+        with mock.patch.object(factcheck_score, "np", None):
+            self._assert_identical()
+
+    def test_empty_batch(self):
+        """Test that an empty batch returns no scores."""
+        profile = claim_miner.build_profile(*HEADLINES[0])
+        self.assertEqual(factcheck_score.score_items("q", [], None, [], profile, "policy_exact"), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,109 @@
+"""Unit tests for background fact-check warming of trending headlines."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from schemas import FactCheckItem
+from services import extract, factcheck_service, factcheck_warm
+from services.factcheck_warm import FactCheckWarmer
+
+HEADLINES = [
+    ("Senate bans TikTok nationwide", "https://www.example.com/tiktok"),
+    ("Supreme Court hears TikTok case", "https://news.example.org/court"),
+]
+
+
+class TestFactCheckWarmer(unittest.IsolatedAsyncioTestCase):
+    """Test cases for warming, cache keys, budgets and warm-hit accounting."""
+
+    def setUp(self):
+        self.fetched = []
+
+        async def fake_fetch(query, **kwargs):
+            self.fetched.append(query)
+            return [FactCheckItem(claim=f"{query} claim", source=query, url="https://fc.example/1")]
+
+        def plan(headline, *args, **kwargs):
+            return [{"reason": "core", "q": headline.lower()}, {"reason": "topic", "q": "tiktok"}]
+
+        patches = [
+            mock.patch.object(factcheck_service, "fetch_claims", side_effect=fake_fetch),
+            mock.patch.object(factcheck_service, "search_local_claims", return_value=[]),
+            mock.patch.object(factcheck_service, "ingest_factchecks"),
+            mock.patch.object(factcheck_service, "score_items",
+                              side_effect=lambda claim_texts, **kwargs: [0.4] * len(claim_texts)),
+            mock.patch.object(factcheck_service, "build_queries", side_effect=plan),
+            mock.patch.object(factcheck_service.settings, "fact_check_enabled", True),
+            mock.patch.object(factcheck_service.settings, "google_factcheck_api_key", "test-key"),
+            mock.patch.object(factcheck_service.quota_manager, "remaining", return_value=None),
+            mock.patch.object(factcheck_service, "_cache", factcheck_service.FactCheckCache()),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+        tmp = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8")
+        tmp.write("\n".join(f"{h}\t{u}" for h, u in HEADLINES))
+        tmp.close()
+        self.addCleanup(os.unlink, tmp.name)
+        self.path = tmp.name
+
+    async def test_warmed_result_is_hit_by_factcheck_request(self):
+        """Test that /factcheck's arguments for a warmed headline hit the cache and count once."""
+        warmer = FactCheckWarmer(headlines_path=self.path)
+        self.assertEqual(await warmer.run_once(), 2)
+        fetched = len(self.fetched)
+
+        # What the analyze page sends: article hostname and its default max age
+        for _ in range(2):
+            result = await factcheck_service.find_best_factchecks(
+                "Supreme Court hears TikTok case", source_domain="news.example.org", max_age_months=12
+            )
+            self.assertEqual(result.status, "found")
+        self.assertEqual(len(self.fetched), fetched)
+        self.assertEqual(warmer.stats()["warm_hits"], 1)
+
+    async def test_queries_shared_and_cached_headlines_skipped(self):
+        """Test that shared queries go upstream once and warm headlines are not redone."""
+        warmer = FactCheckWarmer(headlines_path=self.path)
+        await warmer.run_once()
+        self.assertEqual(sorted(self.fetched), sorted(["senate bans tiktok nationwide", "tiktok",
+                                                       "supreme court hears tiktok case"]))
+        await warmer.run_once()
+        self.assertEqual(len(self.fetched), 3)
+        self.assertEqual(warmer.stats()["skipped"], 2)
+
+    async def test_daily_budget_caps_upstream_queries(self):
+        """Test that a run stops starting upstream queries once the budget is spent."""
+        warmer = FactCheckWarmer(headlines_path=self.path, daily_budget=2)
+        await warmer.run_once()
+        self.assertEqual(len(self.fetched), 2)
+        self.assertEqual(warmer.stats()["budget_remaining"], 0)
+        self.assertEqual(await warmer.run_once(), 0)
+
+    async def test_trending_from_news_search_prefers_extracted_headline(self):
+        """Test that trending headlines use the extracted headline when the article is cached."""
+        items = [{"url": u, "title": f"{h} - Example News"} for h, u in HEADLINES]
+        extract._cache.clear()
+        self.addCleanup(extract._cache.clear)
+        extract._set_cache(extract.canonicalize_url(HEADLINES[0][1]), HEADLINES[0][0],
+                           "body", 1, "extracted", None, None, False, None)
+
+        warmer = FactCheckWarmer(queries=["tiktok"])
+        with mock.patch.object(factcheck_warm.news_registry, "search",
+                               return_value={"items": items, "nextCursor": None}):
+            headlines = await warmer.trending_headlines()
+        self.assertEqual(headlines, [
+            ("Senate bans TikTok nationwide", "www.example.com"),
+            ("Supreme Court hears TikTok case - Example News", "news.example.org"),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,79 @@
+"""Unit tests for the load-testing stand-ins and report helpers."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from loadtest.run_load import LoadStats, percentile
+from loadtest.stand_ins import build_corpus, render_article
+from providers.factcheck_google import parse_claims
+from services import extract
+
+
+class TestStandIns(unittest.TestCase):
+    """Test cases for the synthetic corpus the stand-ins serve."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.articles, cls.claims = build_corpus(articles=20, claims=50)
+
+    def test_corpus_is_repeatable(self):
+        """Test that the same seed gives the same corpus."""
+        articles, claims = build_corpus(articles=20, claims=50)
+        self.assertEqual([a.url for a in articles], [a.url for a in self.articles])
+        self.assertEqual([c["text"] for c in claims], [c["text"] for c in self.claims])
+
+    def test_rendered_article_extracts(self):
+        """Test that extraction finds the headline and body through the page clutter."""
+        article = next(a for a in self.articles if not a.paywalled)
+        headline, body, word_count = extract.extract_text(render_article(article), article.url)
+        self.assertEqual(headline, article.title)
+        self.assertIn(article.paragraphs[0], body)
+        self.assertNotIn("Advertisement", body)
+        self.assertGreater(word_count, 50)
+
+    def test_claims_parse_like_the_real_api(self):
+        """Test that stand-in claims parse into fact-check items."""
+        items = parse_claims({"claims": self.claims[:5]})
+        self.assertEqual(len(items), 5)
+        self.assertTrue(all(item.url and item.claim for item in items))
+
+    def test_fetch_origin_rewrites_article_urls(self):
+        """Test that EXTRACT_FETCH_ORIGIN sends article fetches to the publisher stand-in."""
+        with mock.patch.object(extract.settings, "extract_fetch_origin", "http://127.0.0.1:9102/"):
+            self.assertEqual(extract._fetch_url("https://www.bbc.com/news/1?x=2"),
+                             "http://127.0.0.1:9102/www.bbc.com/news/1?x=2")
+        with mock.patch.object(extract.settings, "extract_fetch_origin", None):
+            self.assertEqual(extract._fetch_url("https://www.bbc.com/news/1"), "https://www.bbc.com/news/1")
+
+
+class TestLoadStats(unittest.TestCase):
+    """Test cases for percentile and report helpers."""
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles."""
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([3.0], 95), 3.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_report_counts_errors_per_endpoint(self):
+        """Test that the report has a row per endpoint plus an overall row."""
+        stats = LoadStats()
+        stats.record("GET /search", 0.010, ok=True)
+        stats.record("GET /search", 0.030, ok=False)
+        stats.record("POST /factcheck", 0.020, ok=True)
+        report = stats.report(elapsed_s=2.0)
+        self.assertEqual(report["GET /search"]["errors"], 1)
+        self.assertEqual(report["all"]["requests"], 3)
+        self.assertAlmostEqual(report["all"]["rps"], 1.5)
+        self.assertAlmostEqual(report["all"]["p50_ms"], 20.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,111 @@
+"""Unit tests for the local article search index."""
+
+import unittest
+import sys
+import os
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from providers.local_index import ArticleIndex
+
+
+def _article(n: int, title: str, source: str = "Reuters") -> dict:
+    return {
+        "url": f"https://example.com/article-{n}",
+        "source": source,
+        "publishedAt": "2025-09-20T10:00:00Z",
+        "title": title,
+    }
+
+
+class TestArticleIndex(unittest.TestCase):
+    """Test cases for BM25 ranking, prefix matching and paging."""
+
+    def setUp(self):
+        self.index = ArticleIndex()
+        self.index.add_many([
+            _article(1, "Senate passes climate bill after long debate"),
+            _article(2, "Climate summit opens in Geneva"),
+            _article(3, "Stock markets rally on tech earnings", source="Bloomberg"),
+            _article(4, "Climate climate climate: why the word is everywhere"),
+        ])
+
+    def test_ranks_matching_articles(self):
+        """Test that only matching articles are returned, best match first."""
+        items, total = self.index.search("climate bill")
+        self.assertEqual(total, 3)
+        self.assertEqual(items[0]["url"], "https://example.com/article-1")
+
+    def test_prefix_matches_last_term(self):
+        """Test that the last query term is expanded as a prefix."""
+        items, total = self.index.search("earn")
+        self.assertEqual(total, 1)
+        self.assertEqual(items[0]["title"], "Stock markets rally on tech earnings")
+
+    def test_matches_source(self):
+        """Test that the source name is searchable like the title."""
+        items, _ = self.index.search("bloomberg")
+        self.assertEqual([i["url"] for i in items], ["https://example.com/article-3"])
+
+    def test_pagination(self):
+        """Test that offset/limit paging walks the full result list without overlap."""
+        first, total = self.index.search("climate", offset=0, limit=2)
+        second, _ = self.index.search("climate", offset=2, limit=2)
+        self.assertEqual(total, 3)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        urls = {i["url"] for i in first} | {i["url"] for i in second}
+        self.assertEqual(len(urls), 3)
+
+    def test_incremental_update_replaces_article(self):
+        """Test that re-adding an article by URL replaces its indexed terms."""
+        self.index.add(_article(2, "Geneva talks end without agreement"))
+        items, _ = self.index.search("summit")
+        self.assertEqual(items, [])
+        items, _ = self.index.search("agreement")
+        self.assertEqual(items[0]["url"], "https://example.com/article-2")
+        self.assertEqual(len(self.index), 4)
+
+    def test_body_terms_are_searchable(self):
+        """Test that an extracted body makes its terms findable."""
+        self.index.update_body("https://example.com/article-3", "Semiconductor makers led the gains.")
+        items, _ = self.index.search("semiconductor")
+        self.assertEqual(items[0]["url"], "https://example.com/article-3")
+
+    def test_internal_fields_not_returned(self):
+        """Test that index bookkeeping fields never leak into results."""
+        items, _ = self.index.search("geneva")
+        self.assertFalse(any(k.startswith("_") for k in items[0]))
+
+
+class TestArticleIndexBounds(unittest.TestCase):
+    """Test cases for the document cap and the per-query postings budget."""
+
+    def test_oldest_articles_evicted_beyond_max_docs(self):
+        """Test that a full index drops its oldest articles and their terms."""
+        index = ArticleIndex(max_docs=3)
+        index.add_many(_article(n, f"Story number{n} about elections") for n in range(2000))
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.search("number0"), ([], 0))
+        items, total = index.search("elections")
+        self.assertEqual(total, 3)
+        self.assertEqual(items[0]["url"], "https://example.com/article-1999")
+        # Evicted URLs can be indexed again after the ids were compacted
+        index.add(_article(5, "Runoff vote scheduled"))
+        self.assertEqual(index.search("runoff")[0][0]["url"], "https://example.com/article-5")
+
+    def test_postings_budget_bounds_common_terms(self):
+        """Test that a common term only scores the most recent articles and rare terms still rank first."""
+        index = ArticleIndex(max_postings_scan=10)
+        index.add_many(_article(n, f"Election update {n}") for n in range(100))
+        index.add(_article(100, "Election recount ordered in Georgia"))
+        items, total = index.search("election", limit=20)
+        self.assertEqual(total, 10)
+        self.assertTrue(all(int(i["url"].rsplit("-", 1)[1]) >= 91 for i in items))
+        items, _ = index.search("georgia election")
+        self.assertEqual(items[0]["url"], "https://example.com/article-100")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,97 @@
+"""Unit tests for the Prometheus metrics registry and its instrumentation."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from schemas import FactCheckItem
+from services import factcheck_service
+from services.metrics import MetricsRegistry, cache_lookups, stage_seconds, stats_samples
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for counters, gauges, histograms and text rendering."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_histogram_renders_cumulative_buckets(self):
+        """Test that buckets are cumulative, inclusive and end with +Inf, sum and count."""
+        histogram = self.registry.histogram("t_seconds", "Test", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "fetch")
+        lines = self.registry.render().splitlines()
+        self.assertIn("# TYPE t_seconds histogram", lines)
+        self.assertIn('t_seconds_bucket{stage="fetch",le="0.1"} 2', lines)
+        self.assertIn('t_seconds_bucket{stage="fetch",le="1"} 3', lines)
+        self.assertIn('t_seconds_bucket{stage="fetch",le="+Inf"} 4', lines)
+        self.assertIn('t_seconds_sum{stage="fetch"} 3.65', lines)
+        self.assertIn('t_seconds_count{stage="fetch"} 4', lines)
+
+    def test_counter_and_gauge(self):
+        """Test counters per label set and a gauge tracking a block in progress."""
+        counter = self.registry.counter("t_lookups_total", "Test", ("cache", "result"))
+        gauge = self.registry.gauge("t_in_flight", "Test")
+        counter.inc("a", "hit")
+        counter.inc("a", "hit")
+        counter.inc("a", "miss")
+        with gauge.track():
+            self.assertIn("t_in_flight 1", self.registry.render())
+        text = self.registry.render()
+        self.assertIn('t_lookups_total{cache="a",result="hit"} 2', text)
+        self.assertIn('t_lookups_total{cache="a",result="miss"} 1', text)
+        self.assertIn("t_in_flight 0", text)
+
+    def test_collectors_and_label_escaping(self):
+        """Test that collector families are rendered and label values escaped."""
+        stats = {"hits": 3, "hit_rate": 0.75, "state": "closed"}
+        self.registry.register_collector(
+            lambda: [("t_cache", "gauge", "Test", stats_samples(stats, {"name": 'q"1'}))]
+        )
+        text = self.registry.render()
+        self.assertIn('t_cache{name="q\\"1",stat="hits"} 3', text)
+        self.assertIn('t_cache{name="q\\"1",stat="hit_rate"} 0.75', text)
+        self.assertNotIn("closed", text)
+
+
+class TestFactCheckInstrumentation(unittest.IsolatedAsyncioTestCase):
+    """Test cases for stage timings and cache counters recorded by find_best_factchecks."""
+
+    async def test_stages_and_cache_lookups_recorded(self):
+        """Test that a miss then a hit are counted and planning and scoring are timed."""
+        async def fake_fetch(query, **kwargs):
+            return [FactCheckItem(claim=f"{query} claim", url="https://fc.example/1")]
+
+        patches = [
+            mock.patch.object(factcheck_service, "fetch_claims", side_effect=fake_fetch),
+            mock.patch.object(factcheck_service, "search_local_claims", return_value=[]),
+            mock.patch.object(factcheck_service, "ingest_factchecks"),
+            mock.patch.object(factcheck_service.settings, "fact_check_enabled", True),
+            mock.patch.object(factcheck_service.settings, "google_factcheck_api_key", "test-key"),
+            mock.patch.object(factcheck_service.quota_manager, "remaining", return_value=None),
+            mock.patch.object(factcheck_service, "_cache", factcheck_service.FactCheckCache()),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+        misses = cache_lookups.value("factcheck_result", "miss")
+        hits = cache_lookups.value("factcheck_result", "hit")
+        planned = stage_seconds.count("build_queries")
+        scored = stage_seconds.count("score")
+
+        for _ in range(2):
+            await factcheck_service.find_best_factchecks("Senate votes to ban TikTok nationwide")
+
+        self.assertEqual(cache_lookups.value("factcheck_result", "miss"), misses + 1)
+        self.assertEqual(cache_lookups.value("factcheck_result", "hit"), hits + 1)
+        self.assertEqual(stage_seconds.count("build_queries"), planned + 1)
+        self.assertGreater(stage_seconds.count("score"), scored)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,130 @@
+"""Tests for multi-provider news search against local stand-in servers."""
+
+import json
+import threading
+import time
+import unittest
+import sys
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import HTTPException
+
+from providers.registry import HttpNewsProvider, NewsProviderRegistry
+
+
+def _start_news_server(articles, delay_s=0.0, status=200, headers=None):
+    """Serve a NewsAPI-style /everything endpoint on a free local port."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay_s)
+            body = json.dumps({
+                "status": "ok",
+                "totalResults": len(articles),
+                "articles": articles,
+            }).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _articles(*urls):
+    return [{"url": u, "source": {"name": "Example"}, "publishedAt": "", "title": u} for u in urls]
+
+
+class TestNewsProviderRegistry(unittest.IsolatedAsyncioTestCase):
+    """Test cases for hedging, fallback and result merging."""
+
+    def setUp(self):
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def _provider(self, name, articles, **kwargs):
+        server, base_url = _start_news_server(articles, **kwargs)
+        self.servers.append(server)
+        return HttpNewsProvider(name, base_url)
+
+    async def test_merges_and_dedupes_by_canonical_url(self):
+        """Test that results from all providers are merged without duplicates."""
+        a = self._provider("a", _articles("https://example.com/1", "https://example.com/2"))
+        b = self._provider("b", _articles("http://example.com/2?utm_source=x", "https://example.com/3"))
+        registry = NewsProviderRegistry([a, b], hedge_after_ms=0, merge_grace_ms=1000)
+
+        result = await registry.search("news", page=1, page_size=10)
+        urls = [item["url"] for item in result["items"]]
+        self.assertEqual(urls, ["https://example.com/1", "https://example.com/2", "https://example.com/3"])
+
+    async def test_slow_primary_is_hedged(self):
+        """Test that a slow primary degrades coverage instead of latency."""
+        slow = self._provider("slow", _articles("https://example.com/slow"), delay_s=2.0)
+        fast = self._provider("fast", _articles("https://example.com/fast"))
+        registry = NewsProviderRegistry([slow, fast], hedge_after_ms=50, merge_grace_ms=50, deadline_ms=1500)
+
+        started = time.monotonic()
+        result = await registry.search("news", page=1, page_size=10)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual([item["url"] for item in result["items"]], ["https://example.com/fast"])
+
+    async def test_failing_primary_falls_back_immediately(self):
+        """Test that an erroring provider triggers the next one without waiting."""
+        broken = self._provider("broken", [], status=500)
+        backup = self._provider("backup", _articles("https://example.com/backup"))
+        registry = NewsProviderRegistry([broken, backup], hedge_after_ms=5000, deadline_ms=3000)
+
+        started = time.monotonic()
+        result = await registry.search("news", page=1, page_size=10)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(len(result["items"]), 1)
+
+    async def test_all_failing_raises_bad_gateway(self):
+        """Test that a 502 is raised when no provider produced results."""
+        broken = self._provider("broken", [], status=503)
+        registry = NewsProviderRegistry([broken])
+        with self.assertRaises(HTTPException) as ctx:
+            await registry.search("news", page=1, page_size=10)
+        self.assertEqual(ctx.exception.status_code, 502)
+
+    async def test_all_rate_limited_keeps_503_and_retry_after(self):
+        """Test that a search fails with 503 and the earliest Retry-After when every provider is out of quota."""
+        a = self._provider("a", [], status=429, headers={"Retry-After": "120"})
+        b = self._provider("b", [], status=429, headers={"Retry-After": "30"})
+        registry = NewsProviderRegistry([a, b], hedge_after_ms=0)
+        with self.assertRaises(HTTPException) as ctx:
+            await registry.search("news", page=1, page_size=10)
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(ctx.exception.headers["Retry-After"], "30")
+
+    async def test_rate_limited_and_broken_is_bad_gateway(self):
+        """Test that a mix of quota and other failures is still reported as 502."""
+        limited = self._provider("limited", [], status=429)
+        broken = self._provider("broken", [], status=500)
+        registry = NewsProviderRegistry([limited, broken], hedge_after_ms=0)
+        with self.assertRaises(HTTPException) as ctx:
+            await registry.search("news", page=1, page_size=10)
+        self.assertEqual(ctx.exception.status_code, 502)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
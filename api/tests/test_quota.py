@@ -0,0 +1,79 @@
+"""Unit tests for the upstream quota manager."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.quota import QuotaLimit, QuotaManager
+
+
+class TestQuotaManager(unittest.TestCase):
+    """Test cases for token buckets, daily budgets and reservations."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "quota.sqlite3")
+        self.limits = {"api": QuotaLimit(rate_per_s=0.0, burst=5, daily_budget=8)}
+
+    def test_bucket_limits_burst(self):
+        """Test that no more than the bucket capacity can be taken at once."""
+        quota = QuotaManager(self.path, self.limits)
+        granted = sum(quota.try_acquire("api") for _ in range(10))
+        self.assertEqual(granted, 5)
+
+    def test_daily_budget_caps_refills(self):
+        """Test that the daily budget applies even when the bucket refills."""
+        limits = {"api": QuotaLimit(rate_per_s=1e6, burst=5, daily_budget=8)}
+        quota = QuotaManager(self.path, limits)
+        granted = sum(quota.try_acquire("api") for _ in range(20))
+        self.assertEqual(granted, 8)
+        self.assertEqual(quota.remaining("api"), 0)
+
+    def test_reserve_and_release(self):
+        """Test that a partial reservation is granted and unused tokens come back."""
+        quota = QuotaManager(self.path, self.limits)
+        self.assertEqual(quota.reserve("api", 10), 5)
+        self.assertEqual(quota.remaining("api"), 3)
+        quota.release("api", 2)
+        self.assertEqual(quota.remaining("api"), 5)
+        self.assertTrue(quota.try_acquire("api", 2))
+
+    def test_state_is_shared_between_instances(self):
+        """Test that two managers on the same file (e.g. two workers) share buckets."""
+        worker_a = QuotaManager(self.path, self.limits)
+        worker_b = QuotaManager(self.path, self.limits)
+        self.assertEqual(worker_a.reserve("api", 4), 4)
+        self.assertEqual(worker_b.reserve("api", 4), 1)
+
+    def test_exhaust_and_unknown_keys(self):
+        """Test that exhaust() blocks further calls and unknown keys are unlimited."""
+        quota = QuotaManager(self.path, self.limits)
+        quota.exhaust("api")
+        self.assertFalse(quota.try_acquire("api"))
+        self.assertTrue(quota.try_acquire("other", 100))
+        self.assertIsNone(quota.remaining("other"))
+        self.assertEqual(quota.snapshot()["api"]["daily_remaining"], 0)
+
+    def test_store_uses_wal(self):
+        """Test that the shared store runs in WAL mode without an fsync per commit."""
+        quota = QuotaManager(self.path, self.limits)
+        self.assertEqual(quota._conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(quota._conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+
+    def test_retry_after(self):
+        """Test that Retry-After follows the bucket refill, or the next UTC day once the budget is spent."""
+        quota = QuotaManager(self.path, {"api": QuotaLimit(rate_per_s=0.5, burst=1, daily_budget=3)})
+        self.assertTrue(quota.try_acquire("api"))
+        self.assertEqual(quota.retry_after_s("api"), 2)
+        quota.exhaust("api")
+        self.assertGreater(quota.retry_after_s("api"), 0)
+        self.assertLessEqual(quota.retry_after_s("api"), 86400)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+"""Startup-time budget and lazy loading of heavy dependencies."""
+
+import os
+import subprocess
+import sys
+import unittest
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import lazy
+from utils.lazy import LazyModule, is_available, lazy_import, prewarm
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Cold `import main` budget in ms; wall-clock time depends on the machine,
+# so the budget is only checked when set (e.g. STARTUP_BUDGET_MS=600)
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "0"))
+
+HEAVY_MODULES = ("trafilatura", "lxml", "aiohttp", "httpx", "requests", "numpy", "dateparser")
+
+
+def _import_main() -> str:
+    statement = (
+        "import sys, time; started = time.perf_counter(); import main; "
+        "elapsed = time.perf_counter() - started; "
+        f"print(elapsed, ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", statement], cwd=API_DIR,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for the cold-start import cost."""
+
+    def test_import_main_loads_no_heavy_modules(self):
+        """Test that importing the app leaves every heavy dependency unimported."""
+        run = _import_main().split(" ")
+        loaded = run[1] if len(run) > 1 else ""
+        self.assertEqual(loaded, "", f"imported at startup: {loaded}")
+
+    @unittest.skipUnless(STARTUP_BUDGET_MS, "set STARTUP_BUDGET_MS to check the import time")
+    def test_import_main_within_budget(self):
+        """Test that a cold import of the app stays under the configured budget (best of three)."""
+        elapsed_ms = min(float(_import_main().split(" ")[0]) for _ in range(3)) * 1e3
+        self.assertLess(elapsed_ms, STARTUP_BUDGET_MS,
+                        f"import main took {elapsed_ms:.0f} ms (budget {STARTUP_BUDGET_MS:.0f} ms); "
+                        f"see benchmarks/import_time.py")
+
+
+class TestLazyModule(unittest.TestCase):
+    """Test cases for lazily imported modules and prewarming."""
+
+    def setUp(self):
+        self.name = "colorsys"
+        sys.modules.pop(self.name, None)
+        lazy._lazy_modules.pop(self.name, None)
+        self.addCleanup(lazy._lazy_modules.pop, self.name, None)
+
+    def test_imported_on_first_attribute_access(self):
+        """Test that the module loads on first use and is shared per name."""
+        module = lazy_import(self.name)
+        self.assertIs(lazy_import(self.name), module)
+        self.assertFalse(module.loaded)
+        self.assertNotIn(self.name, sys.modules)
+
+        self.assertEqual(module.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertTrue(module.loaded)
+        self.assertIn(self.name, sys.modules)
+        self.assertGreaterEqual(module.load_s, 0.0)
+
+    def test_prewarm_loads_registered_modules_once(self):
+        """Test that prewarm imports pending modules and skips loaded ones."""
+        lazy_import(self.name)
+        self.assertIn(self.name, prewarm([self.name]))
+        self.assertEqual(prewarm([self.name]), {})
+        self.assertTrue(lazy.lazy_modules()[self.name]["loaded"])
+
+    def test_missing_module(self):
+        """Test availability checks and the error for a module that is not installed."""
+        self.assertFalse(is_available("no_such_module_xyz"))
+        self.assertTrue(is_available(self.name))
+        with self.assertRaises(ImportError):
+            LazyModule("no_such_module_xyz").anything
+        self.assertEqual(prewarm(["no_such_module_xyz"]), {})
+        lazy._lazy_modules.pop("no_such_module_xyz", None)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
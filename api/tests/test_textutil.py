@@ -0,0 +1,231 @@
+"""Unit tests for token memoization and interning, the keyword matcher and the near-duplicate index."""
+
+import os
+import random
+import sys
+import unittest
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.textutil import (
+    KeywordMatcher, NearDuplicateIndex, TextFeatures, TextUtil, TokenVocabulary, bitset_jaccard, set_jaccard,
+    text_util,
+)
+from services.claims import claim_miner
+from services.factcheck_filters import ACTION_SYNONYMS, POLICY_VERBS, gate_policy
+
+KEYWORDS = ['ban', 'bank', 'an', 'pass', 'passes', 'tik', 'tiktok', 'senate', 'bill', 'nationwide', 'wide']
+TEXTS = [
+    "Senate passes bill to ban TikTok nationwide",
+    "the bank announced a nationwide ban",
+    "an",
+    "",
+    "nothing relevant here",
+    "bankbanbank tiktoktik passpasses",
+]
+
+
+def _random_texts(n, seed=7):
+    rng = random.Random(seed)
+    words = KEYWORDS + ['the', 'a', 'vote', 'x', 'ba', 'ank', 'sen', 'ate']
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(0, 12))) for _ in range(n)]
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Test cases comparing KeywordMatcher with naive substring loops."""
+
+    def setUp(self):
+        self.matcher = KeywordMatcher(KEYWORDS)
+        self.texts = [t.lower() for t in TEXTS] + _random_texts(300)
+
+    def test_search_matches_any_substring(self):
+        """Test that search() equals any(k in text) for every text."""
+        for text in self.texts:
+            self.assertEqual(self.matcher.search(text), any(k in text for k in KEYWORDS), text)
+
+    def test_present_reports_overlapping_keywords(self):
+        """Test that present() finds keywords hidden inside longer matches."""
+        for text in self.texts:
+            self.assertEqual(self.matcher.present(text), {k for k in KEYWORDS if k in text}, text)
+
+    def test_token_hits_matches_token_loop(self):
+        """Test that token_hits() equals the per-token any() loop."""
+        for text in self.texts:
+            tokens = text_util.tokenize(text)
+            expected = [i for i, t in enumerate(tokens) if any(k in t for k in KEYWORDS)]
+            self.assertEqual(self.matcher.token_hits(tokens), expected, text)
+
+    def test_empty_matcher(self):
+        """Test that a matcher without keywords never matches."""
+        matcher = KeywordMatcher([])
+        self.assertFalse(matcher)
+        self.assertFalse(matcher.search("anything"))
+        self.assertEqual(matcher.present("anything"), set())
+        self.assertEqual(matcher.token_hits(["anything"]), [])
+
+
+class TestGatePolicyEquivalence(unittest.TestCase):
+    """Test that the compiled policy gate decides like the original loops."""
+
+    @staticmethod
+    def _naive_gate(text, actions, objects):
+        claim = TextFeatures(text)
+        text_lower = claim.lower
+        synonyms = {syn for action in actions for syn in ACTION_SYNONYMS.get(action, [])}
+        action_positions = [
+            i for i, token in enumerate(claim.tokens)
+            if any(a in token for a in actions)
+            or any(s in token for s in synonyms)
+            or any(v in token for v in POLICY_VERBS)
+        ]
+        object_positions = [i for i, token in enumerate(claim.tokens) if any(o in token for o in objects)]
+        if not object_positions:
+            for obj in objects:
+                if obj in text_lower:
+                    object_positions.append(len(text_lower[:text_lower.find(obj)].split()))
+        return any(abs(a - o) <= 8 for a in action_positions for o in object_positions)
+
+    def test_decisions_match(self):
+        """Test gate decisions over a mix of on-topic and off-topic claims."""
+        profile = claim_miner.build_profile("President Biden bans crypto mining operations in Texas")
+        self.assertEqual(profile.claim_type, "policy")
+        actions = profile.targets["actions"]
+        objects = profile.targets["objects"]
+
+        claims = [
+            "Biden administration prohibits cryptocurrency mining facilities",
+            "Texas power plants halt crypto operations after ban",
+            "The president said mining is a key industry",
+            "New rules require banks to report crypto holdings",
+            "Weather forecast for Texas this weekend",
+            "A ban was announced on something unrelated, and mining was mentioned much later in a long sentence here",
+        ]
+        for text in claims:
+            self.assertEqual(gate_policy(TextFeatures(text), profile), self._naive_gate(text, actions, objects), text)
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Test cases for MinHash/LSH near-duplicate detection."""
+
+    @staticmethod
+    def _naive_dedup(word_lists, threshold):
+        kept = []
+        for words in word_lists:
+            words = set(words)
+            if not any(len(words & k) / min(len(words), len(k)) > threshold for k in kept):
+                kept.append(words)
+        return kept
+
+    def test_finds_near_duplicate_claims(self):
+        """Test that reworded copies of a claim are found and unrelated ones are not."""
+        index = NearDuplicateIndex(threshold=0.7)
+        first = index.add("the senate voted to ban tiktok nationwide on tuesday".split())
+        index.add("vaccines cause autism in children".split())
+        self.assertEqual(index.find("the senate voted to ban tiktok nationwide on wednesday".split()), first)
+        self.assertIsNone(index.find("the senate voted on a budget".split()))
+        self.assertIsNone(index.find([]))
+
+    def test_add_if_new_keeps_first_occurrence(self):
+        """Test that only the first of several duplicates is added."""
+        index = NearDuplicateIndex(threshold=0.5)
+        added = [index.add_if_new(words.split()) for words in ["a b c d", "a b c e", "x y z", "a b c d"]]
+        self.assertEqual(added, [True, False, True, False])
+        self.assertEqual(len(index), 2)
+
+    def test_overlap_dedup_matches_pairwise_loop(self):
+        """Test query-style dedup (overlap coefficient) against the pairwise loop."""
+        rng = random.Random(3)
+        vocab = [f"w{i}" for i in range(30)]
+        for _ in range(300):
+            word_lists = [rng.sample(vocab, rng.randint(2, 6)) for _ in range(rng.randint(5, 25))]
+            index = NearDuplicateIndex(threshold=0.75, num_perm=32, bands=32, metric="overlap")
+            kept = [set(words) for words in word_lists if index.add_if_new(words)]
+            self.assertEqual(kept, self._naive_dedup(word_lists, 0.75))
+
+
+class TestTokenMemo(unittest.TestCase):
+    """Test cases for memoized normalization and tokenization."""
+
+    def test_memoized_results_match_and_are_immutable(self):
+        """Test that cached and uncached tokenization agree and return immutable values."""
+        cached = TextUtil(memo_size=16)
+        uncached = TextUtil(memo_enabled=False)
+        for text in TEXTS + ["Senate passes bill to ban TikTok nationwide"]:
+            self.assertEqual(cached.tokenize(text), uncached.tokenize(text))
+            self.assertEqual(cached.tokenize(text, min_length=1), uncached.tokenize(text, min_length=1))
+            self.assertEqual(cached.extract_tokens_set(text), uncached.extract_tokens_set(text))
+        self.assertIsInstance(cached.tokenize("Senate passes bill"), tuple)
+        self.assertIsInstance(cached.extract_tokens_set("Senate passes bill"), frozenset)
+
+    def test_hit_miss_counters_and_switch(self):
+        """Test that repeated calls hit the memo and a disabled memo is bypassed."""
+        util = TextUtil(memo_size=16)
+        util.tokenize("Senate passes bill")
+        util.tokenize("Senate passes bill")
+        util.tokenize("Senate passes bill", min_length=2)
+        stats = util.memo_stats()["tokenize"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+        util.memo_enabled = False
+        util.tokenize("Senate passes bill")
+        self.assertEqual(util.memo_stats()["tokenize"]["hits"], 1)
+
+    def test_memo_is_bounded(self):
+        """Test that the memo never holds more than its configured size."""
+        util = TextUtil(memo_size=8)
+        for i in range(100):
+            util.tokenize(f"text number {i}")
+        self.assertEqual(util.memo_stats()["tokenize"]["size"], 8)
+
+
+class TestTokenVocabulary(unittest.TestCase):
+    """Test cases for integer token interning and bitset similarity."""
+
+    def test_bitset_jaccard_matches_string_sets(self):
+        """Test that bitset scores equal set_jaccard on bigram and token sets, short texts included."""
+        texts = [t.lower() for t in TEXTS] + _random_texts(300, seed=5) + ["ban", "ban ban", "tiktok ban"]
+        for query_text in texts[:20]:
+            vocab = TokenVocabulary()
+            query = TextFeatures(query_text)
+            q = query.encoded(vocab)
+            for text in texts:
+                claim = TextFeatures(text)
+                c = claim.encoded(vocab, grow=False)
+                self.assertEqual(
+                    bitset_jaccard(q.bigram_bits, len(q.bigram_keys), c.bigram_bits, len(c.bigram_keys)),
+                    set_jaccard(query.bigrams, claim.bigrams), (query_text, text),
+                )
+                self.assertEqual(
+                    bitset_jaccard(q.token_bits, len(q.token_ids), c.token_bits, len(c.token_ids)),
+                    set_jaccard(query.token_set, claim.token_set), (query_text, text),
+                )
+
+    def test_text_util_similarities_unchanged(self):
+        """Test that TextUtil's Jaccard helpers equal their string-set definitions."""
+        for text1, text2 in zip(_random_texts(200, seed=1), _random_texts(200, seed=2)):
+            f1, f2 = TextFeatures(text1), TextFeatures(text2)
+            self.assertEqual(text_util.jaccard_similarity(text1, text2), set_jaccard(f1.token_set, f2.token_set))
+            self.assertEqual(text_util.ngram_jaccard_similarity(text1, text2), set_jaccard(f1.bigrams, f2.bigrams))
+
+    def test_candidates_do_not_grow_vocabulary(self):
+        """Test that lookups leave the vocabulary alone and packed bigrams never equal token ids."""
+        vocab = TokenVocabulary()
+        q = vocab.encode(["senate", "ban", "tiktok"])
+        c = vocab.encode(["ban", "tiktok", "unknown", "words", "unknown"], grow=False)
+        self.assertEqual(len(vocab), 3)
+        self.assertEqual(len(c.token_ids), 4)
+        self.assertEqual((q.bigram_bits & c.bigram_bits).bit_count(), 1)
+        self.assertFalse(set(q.token_ids) & set(q.bigram_keys))
+
+    def test_cached_encoding_follows_vocabulary(self):
+        """Test that a cached candidate encoding is refreshed after the vocabulary grows."""
+        vocab = TokenVocabulary()
+        claim = TextFeatures("senate bans tiktok")
+        self.assertEqual(claim.encoded(vocab, grow=False).token_bits, 0)
+        vocab.encode(["tiktok"])
+        self.assertEqual(claim.encoded(vocab, grow=False).token_bits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
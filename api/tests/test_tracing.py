@@ -0,0 +1,145 @@
+"""Unit tests for per-request tracing, Server-Timing and OTLP/JSON export."""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add the api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services import tracing
+from services.tracing import TraceExporter, set_attributes, span, start_trace
+
+
+class TestTracing(unittest.IsolatedAsyncioTestCase):
+    """Test cases for span recording, context propagation and the header."""
+
+    def setUp(self):
+        self.addCleanup(tracing.detach)
+
+    async def test_spans_nest_and_fill_server_timing(self):
+        """Test that nested spans link to their parents and are listed in start order."""
+        trace = start_trace("GET /analyze/url", sample_rate=0)
+        with span("extract_article", desc="www.example.com"):
+            set_attributes(cache="miss")
+            with span("fetch"):
+                pass
+        with span("summarize"):
+            pass
+        trace.finish()
+
+        outer, fetch, summarize = sorted(trace.spans, key=lambda s: s.start_ns)
+        self.assertEqual(outer.parent_id, trace.root.span_id)
+        self.assertEqual(fetch.parent_id, outer.span_id)
+        self.assertEqual(outer.attributes["cache"], "miss")
+        header = trace.server_timing()
+        self.assertRegex(header, r'^extract_article;dur=[\d.]+;desc="www.example.com", fetch;dur=[\d.]+, '
+                                 r'summarize;dur=[\d.]+, total;dur=[\d.]+$')
+
+    async def test_spans_from_tasks_join_the_trace(self):
+        """Test that tasks created in a request record into its trace, unless detached."""
+        trace = start_trace("POST /factcheck", sample_rate=0)
+
+        async def query(n):
+            with span("fetch_claims", desc=f"q{n}"):
+                await asyncio.sleep(0)
+
+        async def background():
+            tracing.detach()
+            with span("warm"):
+                pass
+
+        with span("queries"):
+            await asyncio.gather(query(1), query(2))
+        await asyncio.create_task(background())
+
+        names = [s.name for s in trace.spans]
+        self.assertEqual(sorted(names), ["fetch_claims", "fetch_claims", "queries"])
+        parent = next(s for s in trace.spans if s.name == "queries")
+        self.assertTrue(all(s.parent_id == parent.span_id for s in trace.spans if s.name == "fetch_claims"))
+
+    def test_no_trace_is_a_no_op(self):
+        """Test that spans outside a traced request record nothing."""
+        tracing.detach()
+        with span("score") as recorded:
+            set_attributes(ignored=True)
+        self.assertIsNone(recorded)
+
+    def test_traceparent_continues_caller_trace(self):
+        """Test that a valid W3C traceparent sets the trace id and parent span."""
+        header = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+        trace = start_trace("GET /health", traceparent=header, sample_rate=0)
+        self.assertEqual(trace.trace_id, "4bf92f3577b34da6a3ce929d0e0e4736")
+        self.assertEqual(trace.root.parent_id, "00f067aa0ba902b7")
+        self.assertFalse(trace.sampled)
+        self.assertNotEqual(start_trace("x", traceparent="garbage", sample_rate=0).trace_id, trace.trace_id)
+        self.assertTrue(start_trace("x", sample_rate=1).sampled)
+
+    def test_error_and_header_escaping(self):
+        """Test that failed spans carry an error status and descriptions are header-safe."""
+        trace = start_trace("POST /factcheck", sample_rate=0)
+        with self.assertRaises(ValueError):
+            with span("fetch_claims", desc='"senate" ban – tiktok'):
+                raise ValueError("bad json")
+        trace.finish()
+        self.assertIn('desc="\'senate\' ban ? tiktok"', trace.server_timing())
+        otlp_span = trace.to_otlp()["resourceSpans"][0]["scopeSpans"][0]["spans"][1]
+        self.assertEqual(otlp_span["status"], {"code": 2, "message": "ValueError: bad json"})
+
+
+class TestTraceExport(unittest.TestCase):
+    """Test cases for the OTLP/JSON file export and the request middleware."""
+
+    def setUp(self):
+        self.addCleanup(tracing.detach)
+        tmp = tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False)
+        tmp.close()
+        self.addCleanup(os.unlink, tmp.name)
+        self.path = tmp.name
+
+    def _exported(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_exporter_writes_otlp_json_lines(self):
+        """Test that each exported trace is one ExportTraceServiceRequest line."""
+        trace = start_trace("GET /search", sample_rate=1)
+        with span("search", desc="tiktok", results=10, partial=False):
+            pass
+        trace.finish(**{"http.status_code": 200})
+        TraceExporter(path=self.path).export(trace)
+
+        (request,) = self._exported()
+        resource_spans = request["resourceSpans"][0]
+        self.assertEqual(resource_spans["resource"]["attributes"][0]["value"], {"stringValue": "thebiaslens-api"})
+        root, child = resource_spans["scopeSpans"][0]["spans"]
+        self.assertEqual(root["kind"], tracing.SPAN_KIND_SERVER)
+        self.assertEqual(child["parentSpanId"], root["spanId"])
+        self.assertEqual(child["traceId"], trace.trace_id)
+        self.assertIn({"key": "results", "value": {"intValue": "10"}}, child["attributes"])
+        self.assertIn({"key": "partial", "value": {"boolValue": False}}, child["attributes"])
+        self.assertLessEqual(int(root["startTimeUnixNano"]), int(child["startTimeUnixNano"]))
+
+    def test_middleware_sets_header_and_exports_sampled_requests(self):
+        """Test that responses carry Server-Timing and sampled requests are exported."""
+        from fastapi.testclient import TestClient
+        import main
+
+        client = TestClient(main.app)
+        with mock.patch.object(main.trace_exporter, "path", self.path), \
+                mock.patch.object(tracing.settings, "trace_sample_rate", 1.0):
+            response = client.post("/summarize", json={"text": "The Senate voted on Tuesday. " * 20})
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response.headers["server-timing"], r"^summarize;dur=[\d.]+, total;dur=[\d.]+$")
+
+        (request,) = self._exported()
+        names = [s["name"] for s in request["resourceSpans"][0]["scopeSpans"][0]["spans"]]
+        self.assertEqual(names, ["POST /summarize", "summarize"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
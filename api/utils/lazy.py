@@ -0,0 +1,94 @@
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_lazy_modules: Dict[str, "LazyModule"] = {}
+_registry_lock = threading.Lock()
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first attribute access.
+
+    Heavy dependencies (trafilatura and its date parsers, aiohttp, httpx,
+    requests, numpy) cost most of the API's cold start but are only needed
+    once a request actually fetches or parses something. Call sites keep
+    the usual `module.attr` form; the real import happens the first time an
+    attribute is read, or ahead of time through prewarm().
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["load_s"] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        module = self._module
+        if module is None:
+            started = time.perf_counter()
+            module = importlib.import_module(self._name)
+            self.__dict__["load_s"] = time.perf_counter() - started
+            self.__dict__["_module"] = module
+            logger.info(f"Loaded {self._name} in {self.load_s * 1e3:.0f} ms")
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Shared lazy stand-in for `name` (one per module name)."""
+    with _registry_lock:
+        module = _lazy_modules.get(name)
+        if module is None:
+            module = _lazy_modules[name] = LazyModule(name)
+        return module
+
+
+def is_available(name: str) -> bool:
+    """True if `name` can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def prewarm(names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Import lazily registered modules now; returns seconds spent per module.
+
+    For deployments that would rather pay the import cost before the first
+    request (see settings.prewarm_imports) than during it.
+    """
+    timings = {}
+    for name in list(names) if names is not None else list(_lazy_modules):
+        module = lazy_import(name)
+        if module.loaded:
+            continue
+        try:
+            module.load()
+            timings[name] = module.load_s
+        except ImportError as e:
+            logger.warning(f"Prewarm of {name} failed: {str(e)}")
+    return timings
+
+
+def lazy_modules() -> Dict[str, Dict[str, object]]:
+    """Registered lazy modules, whether they are loaded and how long the import took."""
+    return {
+        name: {"loaded": module.loaded, "load_ms": round(module.load_s * 1e3, 1) if module.loaded else None}
+        for name, module in _lazy_modules.items()
+    }